@@ -0,0 +1,29 @@
+"""company cik
+
+Revision ID: 2c9e1f7d4b86
+Revises: 6f08c3b1ae52
+Create Date: 2026-10-17 21:02:11.508194
+
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2c9e1f7d4b86"
+down_revision: str | None = "6f08c3b1ae52"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("businesses", sa.Column("cik", sa.String(length=10), nullable=True))
+    op.create_unique_constraint("businesses_cik_key", "businesses", ["cik"])
+
+
+def downgrade() -> None:
+    op.drop_constraint("businesses_cik_key", "businesses", type_="unique")
+    op.drop_column("businesses", "cik")
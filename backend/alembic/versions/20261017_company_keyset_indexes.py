@@ -0,0 +1,33 @@
+"""company keyset indexes
+
+Revision ID: 5e2b87c0f61a
+Revises: a94f0d6e13b7
+Create Date: 2026-10-17 14:03:51.772905
+
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e2b87c0f61a"
+down_revision: str | None = "a94f0d6e13b7"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # (sort key, id) composites so keyset seeks are a single index range scan
+    live = sa.text("deleted_at IS NULL")
+    op.create_index("ix_businesses_ticker_live", "businesses", ["ticker", "id"], postgresql_where=live)
+    op.create_index("ix_businesses_created_at_live", "businesses", ["created_at", "id"], postgresql_where=live)
+    op.create_index("ix_businesses_updated_at_live", "businesses", ["updated_at", "id"], postgresql_where=live)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_businesses_updated_at_live", table_name="businesses")
+    op.drop_index("ix_businesses_created_at_live", table_name="businesses")
+    op.drop_index("ix_businesses_ticker_live", table_name="businesses")
@@ -0,0 +1,68 @@
+"""company metrics
+
+Revision ID: d3a6f5c29e84
+Revises: 5e2b87c0f61a
+Create Date: 2026-10-17 16:25:10.384102
+
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d3a6f5c29e84"
+down_revision: str | None = "5e2b87c0f61a"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_INDEXED_COLUMNS = [
+    "ltm_revenue",
+    "ltm_revenue_growth",
+    "equity_value",
+    "enterprise_value",
+    "multiple_ev_to_revenue",
+    "multiple_ev_to_ebitda",
+    "price_to_earnings",
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "company_metrics",
+        sa.Column("company_id", sa.Integer(), nullable=False),
+        sa.Column("ltm_revenue", sa.Float(), nullable=True),
+        sa.Column("ltm_revenue_growth", sa.Float(), nullable=True),
+        sa.Column("ltm_net_income", sa.Float(), nullable=True),
+        sa.Column("ltm_ebitda", sa.Float(), nullable=True),
+        sa.Column("share_price", sa.Float(), nullable=True),
+        sa.Column("shares_outstanding", sa.Float(), nullable=True),
+        sa.Column("equity_value", sa.Float(), nullable=True),
+        sa.Column("cash", sa.Float(), nullable=True),
+        sa.Column("debt", sa.Float(), nullable=True),
+        sa.Column("enterprise_value", sa.Float(), nullable=True),
+        sa.Column("multiple_ev_to_revenue", sa.Float(), nullable=True),
+        sa.Column("multiple_ev_to_ebitda", sa.Float(), nullable=True),
+        sa.Column("price_to_earnings", sa.Float(), nullable=True),
+        sa.Column("median_fund_investment_percentage_change", sa.Float(), nullable=True),
+        sa.Column("computed_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["company_id"], ["businesses.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("company_id"),
+    )
+    op.create_index(op.f("ix_company_metrics_deleted_at"), "company_metrics", ["deleted_at"], unique=False)
+    for column in _INDEXED_COLUMNS:
+        op.create_index(op.f(f"ix_company_metrics_{column}"), "company_metrics", [column], unique=False)
+
+
+def downgrade() -> None:
+    for column in reversed(_INDEXED_COLUMNS):
+        op.drop_index(op.f(f"ix_company_metrics_{column}"), table_name="company_metrics")
+    op.drop_index(op.f("ix_company_metrics_deleted_at"), table_name="company_metrics")
+    op.drop_table("company_metrics")
@@ -0,0 +1,64 @@
+"""company search indexes
+
+Revision ID: 7c1e4b9a2d30
+Revises: 32d504ccf228
+Create Date: 2026-10-17 09:12:04.518211
+
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c1e4b9a2d30"
+down_revision: str | None = "32d504ccf228"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # TimestampMixin columns were never migrated for businesses; search filters and returns them.
+    op.add_column(
+        "businesses",
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.add_column(
+        "businesses",
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.add_column("businesses", sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("businesses", sa.Column("sub_industry", sa.String(length=100), nullable=True))
+    op.create_index(op.f("ix_businesses_deleted_at"), "businesses", ["deleted_at"], unique=False)
+
+    live = sa.text("deleted_at IS NULL")
+    op.create_index("ix_businesses_sector_live", "businesses", ["sector", "id"], postgresql_where=live)
+    op.create_index("ix_businesses_sub_industry_live", "businesses", ["sub_industry", "id"], postgresql_where=live)
+    op.create_index("ix_businesses_name_live", "businesses", ["name", "id"], postgresql_where=live)
+    op.create_index(
+        "ix_businesses_name_lower_prefix",
+        "businesses",
+        [sa.text("lower(name) varchar_pattern_ops")],
+        postgresql_where=live,
+    )
+    op.create_index(
+        "ix_businesses_ticker_prefix",
+        "businesses",
+        [sa.text("ticker varchar_pattern_ops")],
+        postgresql_where=live,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_businesses_ticker_prefix", table_name="businesses")
+    op.drop_index("ix_businesses_name_lower_prefix", table_name="businesses")
+    op.drop_index("ix_businesses_name_live", table_name="businesses")
+    op.drop_index("ix_businesses_sub_industry_live", table_name="businesses")
+    op.drop_index("ix_businesses_sector_live", table_name="businesses")
+    op.drop_index(op.f("ix_businesses_deleted_at"), table_name="businesses")
+    op.drop_column("businesses", "sub_industry")
+    op.drop_column("businesses", "deleted_at")
+    op.drop_column("businesses", "updated_at")
+    op.drop_column("businesses", "created_at")
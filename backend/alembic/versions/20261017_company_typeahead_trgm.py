@@ -0,0 +1,37 @@
+"""company typeahead trgm
+
+Revision ID: a94f0d6e13b7
+Revises: 7c1e4b9a2d30
+Create Date: 2026-10-17 11:40:27.093416
+
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a94f0d6e13b7"
+down_revision: str | None = "7c1e4b9a2d30"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_businesses_name_trgm",
+        "businesses",
+        [sa.text("lower(name) gin_trgm_ops")],
+        postgresql_using="gin",
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
+    op.create_index("ix_businesses_updated_at", "businesses", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_businesses_updated_at", table_name="businesses")
+    op.drop_index("ix_businesses_name_trgm", table_name="businesses")
+    # pg_trgm is left installed; other objects may depend on it.
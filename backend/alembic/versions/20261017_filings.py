@@ -0,0 +1,53 @@
+"""filings
+
+Revision ID: 6f08c3b1ae52
+Revises: 0b7d29e4c5f1
+Create Date: 2026-10-17 20:15:48.664730
+
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6f08c3b1ae52"
+down_revision: str | None = "0b7d29e4c5f1"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "filings",
+        sa.Column("cik", sa.String(length=10), nullable=False),
+        sa.Column("company_id", sa.Integer(), nullable=False),
+        sa.Column("type", sa.String(length=8), nullable=False),
+        sa.Column("period_end", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("filing_date", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("revenue", sa.Float(), nullable=True),
+        sa.Column("net_income", sa.Float(), nullable=True),
+        sa.Column("ebitda", sa.Float(), nullable=True),
+        sa.Column("shares_outstanding", sa.Float(), nullable=True),
+        sa.Column("cash", sa.Float(), nullable=True),
+        sa.Column("debt", sa.Float(), nullable=True),
+        sa.Column("document_url", sa.Text(), nullable=True),
+        sa.Column("source", sa.String(length=16), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["company_id"], ["businesses.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("cik", "type", "period_end", name="uq_filings_cik_type_period_end"),
+    )
+    op.create_index("ix_filings_company_id_period_end", "filings", ["company_id", "period_end"], unique=False)
+    op.create_index(op.f("ix_filings_deleted_at"), "filings", ["deleted_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_filings_deleted_at"), table_name="filings")
+    op.drop_index("ix_filings_company_id_period_end", table_name="filings")
+    op.drop_table("filings")
@@ -0,0 +1,42 @@
+"""sector comparables
+
+Revision ID: 0b7d29e4c5f1
+Revises: d3a6f5c29e84
+Create Date: 2026-10-17 18:47:33.201957
+
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0b7d29e4c5f1"
+down_revision: str | None = "d3a6f5c29e84"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sector_comparables",
+        sa.Column("sector", sa.String(length=100), nullable=False),
+        sa.Column("peer_count", sa.Integer(), nullable=False),
+        sa.Column("median_ev_to_revenue", sa.Float(), nullable=True),
+        sa.Column("median_ev_to_ebitda", sa.Float(), nullable=True),
+        sa.Column("median_pe_ratio", sa.Float(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("sector"),
+    )
+    op.create_index(op.f("ix_sector_comparables_deleted_at"), "sector_comparables", ["deleted_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_sector_comparables_deleted_at"), table_name="sector_comparables")
+    op.drop_table("sector_comparables")
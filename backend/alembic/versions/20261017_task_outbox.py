@@ -0,0 +1,58 @@
+"""task outbox
+
+Revision ID: 4b7e2a91c0d5
+Revises: 8a4d6c2e9f13
+Create Date: 2026-10-17 22:31:04.518230
+
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4b7e2a91c0d5"
+down_revision: str | None = "8a4d6c2e9f13"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_outbox",
+        sa.Column("task_name", sa.Text(), nullable=False),
+        sa.Column("queue", sa.Text(), nullable=False),
+        sa.Column(
+            "kwargs",
+            postgresql.JSONB(astext_type=sa.Text()),
+            server_default=sa.text("'{}'::jsonb"),
+            nullable=False,
+        ),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_task_outbox_deleted_at"), "task_outbox", ["deleted_at"], unique=False)
+    op.create_index(op.f("ix_task_outbox_sent_at"), "task_outbox", ["sent_at"], unique=False)
+    op.create_index(
+        "ix_task_outbox_pending",
+        "task_outbox",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("sent_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_outbox_pending", table_name="task_outbox", postgresql_where=sa.text("sent_at IS NULL"))
+    op.drop_index(op.f("ix_task_outbox_sent_at"), table_name="task_outbox")
+    op.drop_index(op.f("ix_task_outbox_deleted_at"), table_name="task_outbox")
+    op.drop_table("task_outbox")
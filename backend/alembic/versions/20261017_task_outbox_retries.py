@@ -0,0 +1,49 @@
+"""task outbox retries
+
+Revision ID: 3f8a1c6e2b94
+Revises: e6c3f08a5d17
+Create Date: 2026-10-17 23:58:42.107315
+
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f8a1c6e2b94"
+down_revision: str | None = "e6c3f08a5d17"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("task_outbox", sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("task_outbox", sa.Column("dead_at", sa.DateTime(timezone=True), nullable=True))
+    op.drop_index("ix_task_outbox_pending", table_name="task_outbox", postgresql_where=sa.text("sent_at IS NULL"))
+    op.create_index(
+        "ix_task_outbox_pending",
+        "task_outbox",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("sent_at IS NULL AND dead_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_task_outbox_pending",
+        table_name="task_outbox",
+        postgresql_where=sa.text("sent_at IS NULL AND dead_at IS NULL"),
+    )
+    op.create_index(
+        "ix_task_outbox_pending",
+        "task_outbox",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("sent_at IS NULL"),
+    )
+    op.drop_column("task_outbox", "dead_at")
+    op.drop_column("task_outbox", "next_attempt_at")
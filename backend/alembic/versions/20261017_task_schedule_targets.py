@@ -0,0 +1,42 @@
+"""task schedule targets
+
+Revision ID: e6c3f08a5d17
+Revises: 9d51e3a07b2c
+Create Date: 2026-10-17 23:40:19.336871
+
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e6c3f08a5d17"
+down_revision: str | None = "9d51e3a07b2c"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Existing rows had no target; they load as unknown tasks and are skipped.
+    op.add_column("task_schedules", sa.Column("task_name", sa.Text(), server_default="", nullable=False))
+    op.alter_column("task_schedules", "task_name", server_default=None)
+    op.add_column(
+        "task_schedules",
+        sa.Column(
+            "kwargs",
+            postgresql.JSONB(astext_type=sa.Text()),
+            server_default=sa.text("'{}'::jsonb"),
+            nullable=False,
+        ),
+    )
+    op.add_column("task_schedules", sa.Column("enabled", sa.Boolean(), server_default=sa.true(), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column("task_schedules", "enabled")
+    op.drop_column("task_schedules", "kwargs")
+    op.drop_column("task_schedules", "task_name")
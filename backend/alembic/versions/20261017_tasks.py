@@ -0,0 +1,62 @@
+"""tasks
+
+Revision ID: 8a4d6c2e9f13
+Revises: 2c9e1f7d4b86
+Create Date: 2026-10-17 21:48:36.120457
+
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8a4d6c2e9f13"
+down_revision: str | None = "2c9e1f7d4b86"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_schedules",
+        sa.Column("cron", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_task_schedules_deleted_at"), "task_schedules", ["deleted_at"], unique=False)
+    op.create_table(
+        "tasks",
+        sa.Column("job_key", sa.Text(), nullable=False),
+        sa.Column("queue", sa.Text(), nullable=False),
+        sa.Column("task_name", sa.Text(), nullable=False),
+        sa.Column("status", sa.Text(), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("total_items", sa.Integer(), nullable=True),
+        sa.Column("completed_items", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("failed_items", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_tasks_deleted_at"), "tasks", ["deleted_at"], unique=False)
+    op.create_index(op.f("ix_tasks_job_key"), "tasks", ["job_key"], unique=True)
+    op.create_index(op.f("ix_tasks_task_name"), "tasks", ["task_name"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_tasks_task_name"), table_name="tasks")
+    op.drop_index(op.f("ix_tasks_job_key"), table_name="tasks")
+    op.drop_index(op.f("ix_tasks_deleted_at"), table_name="tasks")
+    op.drop_table("tasks")
+    op.drop_index(op.f("ix_task_schedules_deleted_at"), table_name="task_schedules")
+    op.drop_table("task_schedules")
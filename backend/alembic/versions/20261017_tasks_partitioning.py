@@ -0,0 +1,130 @@
+"""tasks partitioning
+
+Revision ID: 9d51e3a07b2c
+Revises: 4b7e2a91c0d5
+Create Date: 2026-10-17 23:12:47.902114
+
+"""
+
+from typing import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9d51e3a07b2c"
+down_revision: str | None = "4b7e2a91c0d5"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Matches TASK_HISTORY_PREMAKE_DAYS; the maintain_task_partitions task keeps the window rolling.
+PREMAKE_DAYS = 7
+
+_COLUMNS = (
+    "id, created_at, job_key, queue, task_name, status, started_at, completed_at, error, "
+    "total_items, completed_items, failed_items, updated_at, deleted_at"
+)
+
+
+def upgrade() -> None:
+    op.drop_index("ix_tasks_task_name", table_name="tasks")
+    op.drop_index("ix_tasks_job_key", table_name="tasks")
+    op.drop_index("ix_tasks_deleted_at", table_name="tasks")
+    op.execute("ALTER TABLE tasks RENAME TO tasks_unpartitioned")
+    op.execute("ALTER TABLE tasks_unpartitioned RENAME CONSTRAINT tasks_pkey TO tasks_unpartitioned_pkey")
+
+    op.execute(
+        """
+        CREATE TABLE tasks (
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            job_key TEXT NOT NULL,
+            queue TEXT NOT NULL,
+            task_name TEXT NOT NULL,
+            status TEXT NOT NULL,
+            started_at TIMESTAMP WITH TIME ZONE,
+            completed_at TIMESTAMP WITH TIME ZONE,
+            error TEXT,
+            total_items INTEGER,
+            completed_items INTEGER DEFAULT '0' NOT NULL,
+            failed_items INTEGER DEFAULT '0' NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            deleted_at TIMESTAMP WITH TIME ZONE,
+            id INTEGER DEFAULT nextval('tasks_id_seq') NOT NULL,
+            CONSTRAINT tasks_pkey PRIMARY KEY (id, created_at),
+            CONSTRAINT uq_tasks_job_key_created_at UNIQUE (job_key, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("ALTER SEQUENCE tasks_id_seq OWNED BY tasks.id")
+    op.create_index("ix_tasks_deleted_at", "tasks", ["deleted_at"], unique=False)
+    op.create_index("ix_tasks_job_key", "tasks", ["job_key"], unique=False)
+    op.create_index("ix_tasks_task_name", "tasks", ["task_name"], unique=False)
+
+    op.execute("CREATE TABLE tasks_default PARTITION OF tasks DEFAULT")
+    # One partition per UTC day from the oldest existing row through the premake window.
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            day date;
+        BEGIN
+            FOR day IN
+                SELECT generate_series(
+                    LEAST(
+                        (SELECT min(created_at AT TIME ZONE 'UTC')::date FROM tasks_unpartitioned),
+                        (now() AT TIME ZONE 'UTC')::date
+                    ),
+                    (now() AT TIME ZONE 'UTC')::date + {PREMAKE_DAYS},
+                    interval '1 day'
+                )::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF tasks FOR VALUES FROM (%L) TO (%L)',
+                    'tasks_p' || to_char(day, 'YYYYMMDD'),
+                    day::timestamp AT TIME ZONE 'UTC',
+                    (day + 1)::timestamp AT TIME ZONE 'UTC'
+                );
+            END LOOP;
+        END $$
+        """
+    )
+    op.execute(f"INSERT INTO tasks ({_COLUMNS}) SELECT {_COLUMNS} FROM tasks_unpartitioned")
+    op.execute("DROP TABLE tasks_unpartitioned")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE tasks RENAME TO tasks_partitioned")
+    op.execute("ALTER TABLE tasks_partitioned RENAME CONSTRAINT tasks_pkey TO tasks_partitioned_pkey")
+    op.drop_index("ix_tasks_task_name", table_name="tasks_partitioned")
+    op.drop_index("ix_tasks_job_key", table_name="tasks_partitioned")
+    op.drop_index("ix_tasks_deleted_at", table_name="tasks_partitioned")
+    op.execute(
+        """
+        CREATE TABLE tasks (
+            job_key TEXT NOT NULL,
+            queue TEXT NOT NULL,
+            task_name TEXT NOT NULL,
+            status TEXT NOT NULL,
+            started_at TIMESTAMP WITH TIME ZONE,
+            completed_at TIMESTAMP WITH TIME ZONE,
+            error TEXT,
+            total_items INTEGER,
+            completed_items INTEGER DEFAULT '0' NOT NULL,
+            failed_items INTEGER DEFAULT '0' NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            deleted_at TIMESTAMP WITH TIME ZONE,
+            id INTEGER DEFAULT nextval('tasks_id_seq') NOT NULL,
+            CONSTRAINT tasks_pkey PRIMARY KEY (id)
+        )
+        """
+    )
+    op.execute("ALTER SEQUENCE tasks_id_seq OWNED BY tasks.id")
+    # job_key was unique before partitioning; keep the latest run of any reused key.
+    op.execute(
+        f"INSERT INTO tasks ({_COLUMNS}) "
+        f"SELECT DISTINCT ON (job_key) {_COLUMNS} FROM tasks_partitioned ORDER BY job_key, created_at DESC"
+    )
+    op.execute("DROP TABLE tasks_partitioned")
+    op.create_index("ix_tasks_deleted_at", "tasks", ["deleted_at"], unique=False)
+    op.create_index("ix_tasks_job_key", "tasks", ["job_key"], unique=True)
+    op.create_index("ix_tasks_task_name", "tasks", ["task_name"], unique=False)
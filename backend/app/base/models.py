@@ -4,7 +4,10 @@ from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
 class BaseDBModel(DeclarativeBase):
-    """Declarative base — provides id, registry helpers, and instance utilities."""
+    """Declarative base — provides id and registry helpers.
+
+    Convert instances to schemas with ``app.utils.converters.model_converter``.
+    """
 
     _model_registry: set[type["BaseDBModel"]] = set()
 
@@ -18,6 +21,3 @@ class BaseDBModel(DeclarativeBase):
         return cls._model_registry
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-
-    def to_dict(self) -> dict[str, Any]:
-        return {col.name: getattr(self, col.name) for col in self.__table__.columns}
@@ -0,0 +1,56 @@
+"""Response cache for company detail pages.
+
+Entries are the msgspec-encoded ``CompanySchema`` body per ticker. Tasks that
+change a company's filings, metrics or its sector's comparables invalidate the
+affected tickers once their transaction commits, so a reader can never cache a
+page rebuilt from data that is then rolled back.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+
+import msgspec
+from sqlalchemy import event, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.company.models import Company
+from app.company.services import get_company_detail
+from app.config import config
+from app.utils.cache import TwoTierCache
+
+company_detail_cache = TwoTierCache("company-detail", redis_url=config.REDIS_URL)
+
+
+async def get_company_detail_json(session: AsyncSession, ticker: str) -> bytes:
+    async def load() -> bytes:
+        return msgspec.json.encode(await get_company_detail(session, ticker))
+
+    return await company_detail_cache.get_or_load(ticker, load)
+
+
+async def invalidate_company_details_on_commit(
+    session: AsyncSession,
+    company_ids: Iterable[int] = (),
+    sectors: Iterable[str] = (),
+) -> None:
+    """Invalidate the given companies, and every company in ``sectors``, when ``session`` commits."""
+    conditions = []
+    if ids := list(company_ids):
+        conditions.append(Company.id.in_(ids))
+    if sectors := list(sectors):
+        conditions.append(Company.sector.in_(sectors))
+    if not conditions:
+        return
+    tickers = list(await session.scalars(select(Company.ticker).where(or_(*conditions))))
+    _on_commit(session, lambda: company_detail_cache.invalidate(tickers))
+
+
+def clear_company_details_on_commit(session: AsyncSession) -> None:
+    _on_commit(session, company_detail_cache.clear)
+
+
+def _on_commit(session: AsyncSession, action: Callable[[], Awaitable[None]]) -> None:
+    def _listener(_session: object) -> None:
+        asyncio.ensure_future(action())
+
+    event.listen(session.sync_session, "after_commit", _listener, once=True)
@@ -0,0 +1,95 @@
+"""Peer-group comparables: per-sector medians recomputed in SQL.
+
+When company multiples change, the medians of the affected sectors are
+recomputed with ``percentile_cont(0.5)`` over ``company_metrics`` inside the
+caller's transaction and upserted into ``sector_comparables``, which the detail
+page reads with a single lookup. The rows therefore commit or roll back with
+the metrics they were computed from.
+
+Each recompute takes a transaction-scoped advisory lock per sector (in sorted
+order, so concurrent writers cannot deadlock). A second writer for the same
+sector waits for the first to commit, then recomputes from a snapshot that
+includes the first writer's metrics, so the last write always reflects both.
+"""
+
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.company.models import Company, CompanyMetrics, SectorComparables
+
+# company_metrics column → sector_comparables column
+MULTIPLES: dict[str, str] = {
+    "multiple_ev_to_revenue": "median_ev_to_revenue",
+    "multiple_ev_to_ebitda": "median_ev_to_ebitda",
+    "price_to_earnings": "median_pe_ratio",
+}
+
+
+async def _lock_sectors(session: AsyncSession, sectors: Iterable[str]) -> None:
+    for sector in sorted(sectors):
+        await session.execute(
+            select(func.pg_advisory_xact_lock(func.hashtextextended(f"sector_comparables:{sector}", 0)))
+        )
+
+
+async def persist_sector_comparables(session: AsyncSession, sectors: Iterable[str] | None = None) -> set[str]:
+    """Recompute and upsert the medians of ``sectors`` (every sector when ``None``).
+
+    Sectors left with no live peers lose their row. Returns the sectors written or removed.
+    """
+    sectors = None if sectors is None else set(sectors)
+    if sectors is not None and not sectors:
+        return set()
+    if sectors is not None:
+        await _lock_sectors(session, sectors)
+
+    medians = select(
+        Company.sector,
+        func.count().label("peer_count"),
+        *(
+            func.percentile_cont(0.5).within_group(getattr(CompanyMetrics, field)).label(column)
+            for field, column in MULTIPLES.items()
+        ),
+    ).join(Company, Company.id == CompanyMetrics.company_id)
+    medians = medians.where(Company.deleted_at.is_(None), Company.sector.is_not(None)).group_by(Company.sector)
+    if sectors is not None:
+        medians = medians.where(Company.sector.in_(sectors))
+
+    stmt = insert(SectorComparables).from_select(["sector", "peer_count", *MULTIPLES.values()], medians)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SectorComparables.sector],
+        set_={
+            "peer_count": stmt.excluded.peer_count,
+            **{column: stmt.excluded[column] for column in MULTIPLES.values()},
+            "updated_at": func.now(),
+        },
+    ).returning(SectorComparables.sector)
+    written = set((await session.execute(stmt)).scalars())
+
+    stale = delete(SectorComparables).where(SectorComparables.sector.not_in(written))
+    if sectors is not None:
+        stale = stale.where(SectorComparables.sector.in_(sectors))
+    removed = set((await session.execute(stale.returning(SectorComparables.sector))).scalars())
+    return written | removed
+
+
+async def update_comparables(session: AsyncSession, metrics_rows: Sequence[dict[str, Any]]) -> set[str]:
+    """Recompute the sectors of companies whose company_metrics rows were just written."""
+    if not metrics_rows:
+        return set()
+    ids = [row["company_id"] for row in metrics_rows]
+    result = await session.execute(
+        select(Company.sector).where(Company.id.in_(ids), Company.sector.is_not(None)).distinct()
+    )
+    return await persist_sector_comparables(session, result.scalars())
+
+
+async def rebuild_comparables(session: AsyncSession) -> set[str]:
+    """Recompute every sector from scratch (after a full metrics recompute)."""
+    sectors = (await session.execute(select(Company.sector).where(Company.sector.is_not(None)).distinct())).scalars()
+    await _lock_sectors(session, set(sectors))
+    return await persist_sector_comparables(session)
@@ -0,0 +1,254 @@
+"""Streaming reader for SEC EDGAR ``companyfacts`` archives.
+
+The bulk archive (``companyfacts.zip``) holds one ``CIK##########.json`` per
+registrant, each carrying every XBRL fact the company has ever reported. Large
+filers run to tens of megabytes, almost all of it concepts we never read, so
+files are tokenised incrementally by ijson's C parser and only facts under the
+prefixes of ``CONCEPTS`` are built into Python objects, one at a time. Events
+for every other concept are discarded as they stream past; they are still
+parsed, but never allocated as dicts and lists.
+
+Facts are regrouped by accession number (one 10-K or 10-Q document) into
+``filings`` rows. A filing's ``period_end`` is the latest period end among
+its duration facts; comparative prior-period figures in the same document are
+ignored, since they are already covered by the earlier filing. Amendments
+(``10-K/A``, ``10-Q/A``) fill in or correct the original filing's row.
+"""
+
+import os
+import re
+import zipfile
+from collections import defaultdict
+from collections.abc import Callable, Collection, Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime
+from pathlib import Path
+from typing import IO, Any
+
+import ijson
+
+_CHUNK_SIZE = 1 << 16
+_FILE_NAME = re.compile(r"CIK(\d{10})\.json$")
+
+FORMS = ("10-K", "10-Q")
+
+# Days covered by a discrete period on each form; YTD and other spans are skipped.
+_DURATION_DAYS = {"10-K": (340, 380), "10-Q": (80, 100)}
+
+
+@dataclass(frozen=True, slots=True)
+class Concept:
+    taxonomy: str
+    name: str
+    unit: str = "USD"
+
+
+# Target field → XBRL concepts in order of preference. Filers have moved between
+# revenue tags over the years, so the first one present in a filing wins.
+DURATION_CONCEPTS: dict[str, tuple[Concept, ...]] = {
+    "revenue": (
+        Concept("us-gaap", "Revenues"),
+        Concept("us-gaap", "RevenueFromContractWithCustomerExcludingAssessedTax"),
+        Concept("us-gaap", "RevenueFromContractWithCustomerIncludingAssessedTax"),
+        Concept("us-gaap", "SalesRevenueNet"),
+    ),
+    "net_income": (
+        Concept("us-gaap", "NetIncomeLoss"),
+        Concept("us-gaap", "ProfitLoss"),
+    ),
+    # EBITDA is not a GAAP concept; it is operating income plus D&A.
+    "operating_income": (Concept("us-gaap", "OperatingIncomeLoss"),),
+    "depreciation_amortization": (
+        Concept("us-gaap", "DepreciationDepletionAndAmortization"),
+        Concept("us-gaap", "DepreciationAndAmortization"),
+    ),
+}
+INSTANT_CONCEPTS: dict[str, tuple[Concept, ...]] = {
+    "cash": (
+        Concept("us-gaap", "CashAndCashEquivalentsAtCarryingValue"),
+        Concept("us-gaap", "CashCashEquivalentsRestrictedCashAndRestrictedCashEquivalents"),
+        Concept("us-gaap", "Cash"),
+    ),
+    "debt": (
+        Concept("us-gaap", "LongTermDebt"),
+        Concept("us-gaap", "LongTermDebtNoncurrent"),
+        Concept("us-gaap", "DebtInstrumentCarryingAmount"),
+    ),
+    "shares_outstanding": (Concept("us-gaap", "CommonStockSharesOutstanding", "shares"),),
+}
+# Cover-page share count: dated as of the cover, not the period end, so matched on the filing alone.
+COVER_SHARES = Concept("dei", "EntityCommonStockSharesOutstanding", "shares")
+
+CONCEPTS: frozenset[Concept] = frozenset(
+    {COVER_SHARES}
+    | {concept for concepts in DURATION_CONCEPTS.values() for concept in concepts}
+    | {concept for concepts in INSTANT_CONCEPTS.values() for concept in concepts}
+)
+# ijson prefix of one fact of each concept in the concept's unit.
+_FACT_PREFIXES: dict[str, Concept] = {
+    f"facts.{concept.taxonomy}.{concept.name}.units.{concept.unit}.item": concept for concept in CONCEPTS
+}
+_WANTED_FORMS = frozenset({*FORMS, *(f"{form}/A" for form in FORMS)})
+
+type Fact = dict[str, Any]
+type Opener = Callable[[], IO[bytes]]
+
+
+def iter_companyfacts_sources(
+    path: str | os.PathLike[str], ciks: Collection[int] | None = None
+) -> Iterator[tuple[int, Opener]]:
+    """Yield ``(cik, opener)`` for every companyfacts file under ``path``.
+
+    ``path`` may be a single JSON file, a zip archive, or a directory of
+    either. When ``ciks`` is given, other registrants are skipped without being
+    opened. Openers stay valid until the iterator is exhausted.
+    """
+    path = Path(path)
+    if path.is_dir():
+        for entry in sorted(path.iterdir()):
+            yield from iter_companyfacts_sources(entry, ciks)
+    elif zipfile.is_zipfile(path):
+        yield from _iter_zip(path, ciks)
+    elif (cik := _cik_from_name(path.name)) is not None and (ciks is None or cik in ciks):
+        yield cik, lambda: path.open("rb")
+
+
+def _iter_zip(path: Path, ciks: Collection[int] | None) -> Iterator[tuple[int, Opener]]:
+    with zipfile.ZipFile(path) as archive:
+        for name in archive.namelist():
+            cik = _cik_from_name(name)
+            if cik is None or (ciks is not None and cik not in ciks):
+                continue
+            yield cik, lambda name=name: archive.open(name)
+
+
+def _cik_from_name(name: str) -> int | None:
+    match = _FILE_NAME.search(name)
+    return int(match.group(1)) if match else None
+
+
+def read_companyfacts(fp: IO[bytes]) -> dict[Concept, list[Fact]]:
+    """Stream one companyfacts document, keeping only 10-K/10-Q facts of the concepts we map."""
+    facts: dict[Concept, list[Fact]] = defaultdict(list)
+    events: list[tuple[str, str, Any]] = ijson.sendable_list()
+    parser = ijson.parse_coro(events, use_float=True)
+    # (prefix, concept, builder) of the fact being built. Facts are flat, so the end_map at its prefix closes it.
+    building: tuple[str, Concept, Any] | None = None
+
+    def drain() -> None:
+        nonlocal building
+        for prefix, event, value in events:
+            if building is None:
+                if event == "start_map" and prefix in _FACT_PREFIXES:
+                    building = (prefix, _FACT_PREFIXES[prefix], ijson.ObjectBuilder())
+                    building[2].event(event, value)
+                continue
+            fact_prefix, concept, builder = building
+            builder.event(event, value)
+            if event == "end_map" and prefix == fact_prefix:
+                if builder.value.get("form") in _WANTED_FORMS:
+                    facts[concept].append(builder.value)
+                building = None
+        events.clear()
+
+    while chunk := fp.read(_CHUNK_SIZE):
+        parser.send(chunk)
+        drain()
+    parser.close()
+    drain()
+    return facts
+
+
+@dataclass(slots=True)
+class _Draft:
+    form: str
+    filed: str
+    accn: str
+    period_end: str | None = None
+    values: dict[str, float] = field(default_factory=dict)
+
+
+def facts_to_filings(cik: int, facts: dict[Concept, list[Fact]]) -> list[dict[str, Any]]:
+    """Group a company's facts into one ``filings`` row per (form, period end)."""
+    drafts: dict[str, _Draft] = {}
+
+    # Pass 1: each document's own period is the latest discrete period it reports.
+    for concepts in DURATION_CONCEPTS.values():
+        for concept in concepts:
+            for fact in facts.get(concept, ()):
+                draft = drafts.get(fact["accn"])
+                if draft is None:
+                    form = fact["form"].removesuffix("/A")
+                    draft = drafts[fact["accn"]] = _Draft(form=form, filed=fact["filed"], accn=fact["accn"])
+                if _is_discrete(fact, draft.form) and (draft.period_end is None or fact["end"] > draft.period_end):
+                    draft.period_end = fact["end"]
+
+    # Pass 2: pick each field's value at that period. Preferred concepts are applied last so they win.
+    for name, concepts in (*DURATION_CONCEPTS.items(), *INSTANT_CONCEPTS.items()):
+        duration = name in DURATION_CONCEPTS
+        for concept in reversed(concepts):
+            for fact in facts.get(concept, ()):
+                draft = drafts.get(fact["accn"])
+                if draft is None or fact["end"] != draft.period_end:
+                    continue
+                if duration and not _is_discrete(fact, draft.form):
+                    continue
+                draft.values[name] = fact["val"]
+    for fact in facts.get(COVER_SHARES, ()):
+        draft = drafts.get(fact["accn"])
+        if draft is not None:
+            draft.values["shares_outstanding"] = fact["val"]
+
+    # Amendments overlay the original filing of the same period; the original keeps its date and URL.
+    rows: dict[tuple[str, str], dict[str, Any]] = {}
+    for draft in sorted(drafts.values(), key=lambda draft: draft.filed):
+        if draft.period_end is None or not draft.values:
+            continue
+        values = dict(draft.values)
+        operating_income = values.pop("operating_income", None)
+        depreciation = values.pop("depreciation_amortization", None)
+        if operating_income is not None and depreciation is not None:
+            values["ebitda"] = operating_income + depreciation
+
+        key = (draft.form, draft.period_end)
+        if key in rows:
+            rows[key].update(values)
+            continue
+        rows[key] = {
+            "cik": f"{cik:010d}",
+            "type": draft.form,
+            "period_end": _to_datetime(draft.period_end),
+            "filing_date": _to_datetime(draft.filed),
+            "revenue": None,
+            "net_income": None,
+            "ebitda": None,
+            "shares_outstanding": None,
+            "cash": None,
+            "debt": None,
+            **values,
+            "document_url": _document_url(cik, draft.accn),
+            "source": "EDGAR",
+        }
+    return list(rows.values())
+
+
+def load_company_filings(cik: int, opener: Opener) -> list[dict[str, Any]]:
+    """Read one companyfacts file and return its ``filings`` rows (without ``company_id``)."""
+    with opener() as fp:
+        return facts_to_filings(cik, read_companyfacts(fp))
+
+
+def _is_discrete(fact: Fact, form: str) -> bool:
+    start = fact.get("start")
+    if start is None:
+        return False
+    low, high = _DURATION_DAYS[form]
+    return low <= (date.fromisoformat(fact["end"]) - date.fromisoformat(start)).days <= high
+
+
+def _to_datetime(value: str) -> datetime:
+    return datetime.combine(date.fromisoformat(value), datetime.min.time(), tzinfo=UTC)
+
+
+def _document_url(cik: int, accn: str) -> str:
+    return f"https://www.sec.gov/Archives/edgar/data/{cik}/{accn.replace('-', '')}/{accn}-index.htm"
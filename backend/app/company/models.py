@@ -1,4 +1,6 @@
-from sqlalchemy import String, Text
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, Text, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.base.mixins import TimestampMixin
@@ -17,4 +19,122 @@ class Company(TimestampMixin, BaseDBModel):
     )
     description: Mapped[str] = mapped_column(Text, nullable=True)
     sector: Mapped[str] = mapped_column(String(100), nullable=True)
+    sub_industry: Mapped[str] = mapped_column(String(100), nullable=True)
     exchange: Mapped[str] = mapped_column(String(50), nullable=True)
+    cik: Mapped[str] = mapped_column(String(10), unique=True, nullable=True)
+
+
+class Filing(TimestampMixin, BaseDBModel):
+    """One 10-K or 10-Q financial snapshot. Mirrors ``FilingSchema``."""
+
+    __tablename__ = "filings"
+    __table_args__ = (
+        UniqueConstraint("cik", "type", "period_end", name="uq_filings_cik_type_period_end"),
+        Index("ix_filings_company_id_period_end", "company_id", "period_end"),
+    )
+
+    cik: Mapped[str] = mapped_column(String(10))
+    company_id: Mapped[int] = mapped_column(ForeignKey("businesses.id", ondelete="CASCADE"))
+    type: Mapped[str] = mapped_column(String(8))
+    period_end: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    filing_date: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+    # Income statement
+    revenue: Mapped[float | None] = mapped_column(Float)
+    net_income: Mapped[float | None] = mapped_column(Float)
+    ebitda: Mapped[float | None] = mapped_column(Float)
+    shares_outstanding: Mapped[float | None] = mapped_column(Float)
+
+    # Balance sheet
+    cash: Mapped[float | None] = mapped_column(Float)
+    debt: Mapped[float | None] = mapped_column(Float)
+
+    # Metadata
+    document_url: Mapped[str | None] = mapped_column(Text)
+    source: Mapped[str | None] = mapped_column(String(16))
+
+
+class CompanyMetrics(TimestampMixin, BaseDBModel):
+    """Denormalized per-company stats (one row per company) for screener filtering and sorting.
+
+    Columns mirror ``CompanyStatsSchema``. Rows are rewritten by the
+    ``refresh_company_metrics`` task, never per request.
+    """
+
+    __tablename__ = "company_metrics"
+
+    company_id: Mapped[int] = mapped_column(ForeignKey("businesses.id", ondelete="CASCADE"), unique=True)
+
+    ltm_revenue: Mapped[float | None] = mapped_column(Float, index=True)
+    ltm_revenue_growth: Mapped[float | None] = mapped_column(Float, index=True)
+    ltm_net_income: Mapped[float | None] = mapped_column(Float)
+    ltm_ebitda: Mapped[float | None] = mapped_column(Float)
+
+    share_price: Mapped[float | None] = mapped_column(Float)
+    shares_outstanding: Mapped[float | None] = mapped_column(Float)
+    equity_value: Mapped[float | None] = mapped_column(Float, index=True)
+    cash: Mapped[float | None] = mapped_column(Float)
+    debt: Mapped[float | None] = mapped_column(Float)
+    enterprise_value: Mapped[float | None] = mapped_column(Float, index=True)
+
+    multiple_ev_to_revenue: Mapped[float | None] = mapped_column(Float, index=True)
+    multiple_ev_to_ebitda: Mapped[float | None] = mapped_column(Float, index=True)
+    price_to_earnings: Mapped[float | None] = mapped_column(Float, index=True)
+
+    median_fund_investment_percentage_change: Mapped[float | None] = mapped_column(Float)
+
+    computed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class SectorComparables(TimestampMixin, BaseDBModel):
+    """Snapshot of peer-group median multiples, one row per ``Company.sector``.
+
+    Recomputed in SQL for the affected sectors whenever company multiples
+    change, so the detail page reads comparables with a single lookup.
+    """
+
+    __tablename__ = "sector_comparables"
+
+    sector: Mapped[str] = mapped_column(String(100), unique=True)
+    peer_count: Mapped[int] = mapped_column(Integer, default=0)
+    median_ev_to_revenue: Mapped[float | None] = mapped_column(Float)
+    median_ev_to_ebitda: Mapped[float | None] = mapped_column(Float)
+    median_pe_ratio: Mapped[float | None] = mapped_column(Float)
+
+
+# ─── Search indexes ───────────────────────────────────────────────────────────
+# Partial on live rows so they match the `deleted_at IS NULL` predicate every
+# search query carries. The trailing id makes them usable for id-tiebroken sorts.
+
+_live = Company.deleted_at.is_(None)
+
+Index("ix_businesses_sector_live", Company.sector, Company.id, postgresql_where=_live)
+Index("ix_businesses_sub_industry_live", Company.sub_industry, Company.id, postgresql_where=_live)
+Index("ix_businesses_name_live", Company.name, Company.id, postgresql_where=_live)
+Index("ix_businesses_ticker_live", Company.ticker, Company.id, postgresql_where=_live)
+Index("ix_businesses_created_at_live", Company.created_at, Company.id, postgresql_where=_live)
+Index("ix_businesses_updated_at_live", Company.updated_at, Company.id, postgresql_where=_live)
+
+# Typeahead sync reads rows changed since its watermark.
+Index("ix_businesses_updated_at", Company.updated_at)
+
+# LIKE 'abc%' can only use a btree under a non-C collation with the pattern opclass.
+Index(
+    "ix_businesses_name_lower_prefix",
+    func.lower(Company.name).label("name_lower"),
+    postgresql_ops={"name_lower": "varchar_pattern_ops"},
+    postgresql_where=_live,
+)
+Index(
+    "ix_businesses_name_trgm",
+    func.lower(Company.name).label("name_lower"),
+    postgresql_using="gin",
+    postgresql_ops={"name_lower": "gin_trgm_ops"},
+    postgresql_where=_live,
+)
+Index(
+    "ix_businesses_ticker_prefix",
+    Company.ticker,
+    postgresql_ops={"ticker": "varchar_pattern_ops"},
+    postgresql_where=_live,
+)
@@ -1,8 +1,69 @@
 # services/company_service.py
-from sqlalchemy import select
+from collections.abc import Sequence
+from typing import Any
+
+from litestar.exceptions import ValidationException
+from sqlalchemy import Date, Select, cast, func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.company.models import Company, CompanyMetrics, Filing
+from app.company.schemas import CompanySearchResultSchema, CompanySearchSchema, FilingSchema, Pagination
+from app.company.stats import FilingArrays
+from app.utils.converters import row_converter
+from app.utils.pagination import SortKey, decode_cursor, encode_cursor, keyset_predicate
+
+DEFAULT_SEARCH_LIMIT = 50
+MAX_SEARCH_LIMIT = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# pg_trgm indexes three-character grams; shorter substring patterns would scan the whole GIN index.
+TRIGRAM_MIN_LENGTH = 3
+
+type SearchField = ColumnElement[Any] | InstrumentedAttribute[Any]
+
+# Public field name (as used by the frontend in sorting / numericRanges) → column.
+SORTABLE_FIELDS: dict[str, SearchField] = {
+    "name": Company.name,
+    "ticker": Company.ticker,
+    "industry": Company.sector,
+    "created_at": Company.created_at,
+    "updated_at": Company.updated_at,
+}
+RANGE_FIELDS: dict[str, SearchField] = {
+    field: getattr(CompanyMetrics, field)
+    for field in (
+        "ltm_revenue",
+        "ltm_revenue_growth",
+        "ltm_net_income",
+        "ltm_ebitda",
+        "share_price",
+        "shares_outstanding",
+        "equity_value",
+        "cash",
+        "debt",
+        "enterprise_value",
+        "multiple_ev_to_revenue",
+        "multiple_ev_to_ebitda",
+        "price_to_earnings",
+    )
+}
+SORTABLE_FIELDS.update(RANGE_FIELDS)
 
-from app.company.models import Company
+
+# Filing columns exposed by the columnar accessor, in FilingArrays field order.
+FILING_COLUMNS = (
+    "company_id",
+    "period_end",
+    "type",
+    "revenue",
+    "net_income",
+    "ebitda",
+    "shares_outstanding",
+    "cash",
+    "debt",
+)
 
 
 async def get_company_by_ticker(ticker: str, session: AsyncSession) -> Company:
@@ -13,3 +74,178 @@ async def get_company_by_ticker(ticker: str, session: AsyncSession) -> Company:
         raise ValueError(f"Company with ticker '{ticker}' not found.")
 
     return company
+
+
+async def get_ingestable_company_ids(session: AsyncSession, tickers: Sequence[str] | None = None) -> list[int]:
+    """Ids of live companies with a CIK (optionally limited to ``tickers``), in id order."""
+    stmt = select(Company.id).where(Company.cik.is_not(None), Company.deleted_at.is_(None)).order_by(Company.id)
+    if tickers is not None:
+        stmt = stmt.where(Company.ticker.in_(tickers))
+    return list((await session.scalars(stmt)).all())
+
+
+async def get_filing_columns(session: AsyncSession, company_ids: Sequence[int] | None = None) -> dict[str, list[Any]]:
+    """Fetch filings as column lists sorted by (company_id, period_end), in one round-trip.
+
+    Each column is aggregated server-side with ``array_agg``, so the result is a
+    single row of arrays rather than one row (or ORM object) per filing.
+    ``period_end`` comes back as dates.
+    """
+    order = (Filing.company_id, Filing.period_end)
+    columns = {name: getattr(Filing, name) for name in FILING_COLUMNS}
+    columns["period_end"] = cast(Filing.period_end, Date)
+    stmt = select(
+        *(func.array_agg(aggregate_order_by(column, *order)).label(name) for name, column in columns.items())
+    ).where(Filing.deleted_at.is_(None))
+    if company_ids is not None:
+        stmt = stmt.where(Filing.company_id.in_(company_ids))
+    row = (await session.execute(stmt)).one()
+    return {name: value or [] for name, value in row._mapping.items()}
+
+
+async def load_filing_arrays(session: AsyncSession, company_ids: Sequence[int] | None = None) -> FilingArrays:
+    """Full financial history of the given companies (or all of them) as contiguous NumPy arrays."""
+    return FilingArrays.from_columns(await get_filing_columns(session, company_ids))
+
+
+_FILING_COLUMNS = (
+    Filing.id,
+    Filing.cik,
+    Filing.company_id,
+    Filing.type,
+    Filing.period_end,
+    Filing.filing_date,
+    Filing.revenue,
+    Filing.net_income,
+    Filing.ebitda,
+    Filing.shares_outstanding,
+    Filing.cash,
+    Filing.debt,
+    Filing.document_url,
+    Filing.source,
+    Filing.created_at,
+    Filing.updated_at,
+)
+_to_filing = row_converter(
+    [column.key for column in _FILING_COLUMNS], FilingSchema, convert={"id": str, "company_id": str}
+)
+
+
+async def get_company_filings(session: AsyncSession, company_id: int) -> list[FilingSchema]:
+    """A company's filings, newest first, built straight from rows."""
+    result = await session.execute(
+        select(*_FILING_COLUMNS)
+        .where(Filing.company_id == company_id, Filing.deleted_at.is_(None))
+        .order_by(Filing.period_end.desc())
+    )
+    return _to_filing.many(result)
+
+
+_SEARCH_COLUMNS = (
+    Company.id,
+    Company.name,
+    Company.ticker,
+    Company.sector,
+    Company.created_at,
+    Company.updated_at,
+    CompanyMetrics.equity_value,
+    CompanyMetrics.ltm_revenue,
+    CompanyMetrics.multiple_ev_to_revenue,
+)
+_to_search_result = row_converter(
+    [column.key for column in _SEARCH_COLUMNS],
+    CompanySearchResultSchema,
+    rename={"industry": "sector"},
+    convert={"id": str},
+)
+
+
+def build_search_query(data: CompanySearchSchema) -> tuple[Select, list[SortKey], int]:
+    """Translate a search request into a single column-only SELECT.
+
+    Reads ``businesses`` left-joined 1:1 to ``company_metrics``, so metric
+    filters and sorts are index range scans on the metrics table.
+
+    Returns the statement (fetching ``limit + 1`` rows), its sort keys and the page size.
+    """
+    stmt = (
+        select(*_SEARCH_COLUMNS)
+        .outerjoin(CompanyMetrics, CompanyMetrics.company_id == Company.id)
+        .where(Company.deleted_at.is_(None))
+    )
+
+    if data.search and (term := data.search.strip()):
+        name_pattern = prefix_pattern(term.lower())
+        if len(term) >= TRIGRAM_MIN_LENGTH:
+            # Substring match on name is served by the pg_trgm GIN index
+            name_pattern = f"%{name_pattern}"
+        # Shorter terms have no trigram to look up, so they stay prefix matches on ix_businesses_name_lower_prefix
+        stmt = stmt.where(
+            Company.ticker.like(prefix_pattern(term.upper()), escape="\\")
+            | func.lower(Company.name).like(name_pattern, escape="\\")
+        )
+
+    if filters := data.filters:
+        if filters.industries:
+            stmt = stmt.where(Company.sector.in_(filters.industries))
+        if filters.subIndustries:
+            stmt = stmt.where(Company.sub_industry.in_(filters.subIndustries))
+        for field, bounds in (filters.numericRanges or {}).items():
+            column = _resolve_field(RANGE_FIELDS, field, "numericRanges")
+            if bounds.min is not None:
+                stmt = stmt.where(column >= bounds.min)
+            if bounds.max is not None:
+                stmt = stmt.where(column <= bounds.max)
+
+    keys = _sort_keys(data)
+    pagination = data.pagination or Pagination()
+    limit = min(max(pagination.limit or DEFAULT_SEARCH_LIMIT, 1), MAX_SEARCH_LIMIT)
+
+    if pagination.cursor:
+        stmt = stmt.where(keyset_predicate(keys, decode_cursor(pagination.cursor, keys)))
+    elif pagination.offset:
+        stmt = stmt.offset(max(pagination.offset, 0))
+
+    # One extra row tells us whether another page exists without a COUNT.
+    return stmt.order_by(*(key.order_by() for key in keys)).limit(limit + 1), keys, limit
+
+
+async def search_companies(
+    data: CompanySearchSchema, session: AsyncSession
+) -> tuple[list[CompanySearchResultSchema], str | None]:
+    """Run a search and return one page of results plus the cursor for the next page, if any."""
+    stmt, keys, limit = build_search_query(data)
+    rows = (await session.execute(stmt)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]._mapping
+        next_cursor = encode_cursor(keys, [last[key.column] for key in keys])
+
+    results = _to_search_result.many(rows)
+    return results, next_cursor
+
+
+def _sort_keys(data: CompanySearchSchema) -> list[SortKey]:
+    keys = [
+        SortKey(_resolve_field(SORTABLE_FIELDS, criterion.field, "sorting"), criterion.direction)
+        for criterion in data.sorting or []
+    ]
+    # id tiebreak keeps pages stable when sort keys collide. It follows the leading
+    # direction so single-key sorts map onto one (column, id) index in either direction.
+    keys.append(SortKey(Company.id, keys[0].direction if keys else "asc"))
+    return keys
+
+
+def _resolve_field(fields: dict[str, SearchField], field: str, source: str) -> SearchField:
+    column = fields.get(field)
+    if column is None:
+        raise ValidationException(f"Unsupported {source} field '{field}'. Expected one of: {', '.join(fields)}")
+    return column
+
+
+def prefix_pattern(value: str) -> str:
+    # Built in Python rather than `:param || '%'` so the planner sees a constant prefix.
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
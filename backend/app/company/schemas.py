@@ -97,6 +97,8 @@ class CompanySearchFilters(Struct, kw_only=True):
 class Pagination(Struct, kw_only=True):
     offset: int | None = None
     limit: int | None = None
+    # Opaque token from the previous page's X-Next-Cursor header; takes precedence over offset
+    cursor: str | None = None
 
 
 class CompanySearchSchema(Struct, kw_only=True):
@@ -116,3 +118,10 @@ class CompanySearchResultSchema(Struct, kw_only=True):
     multiple_ev_to_revenue: float | None = None
     created_at: datetime
     updated_at: datetime
+
+
+class CompanyTypeaheadResultSchema(Struct, kw_only=True):
+    id: str
+    name: str
+    ticker: str
+    industry: str | None = None
@@ -0,0 +1,233 @@
+import asyncio
+import os
+from collections.abc import Sequence
+from itertools import batched
+from typing import Any
+
+import numpy as np
+from litestar.exceptions import NotFoundException
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.company.edgar import iter_companyfacts_sources, load_company_filings
+from app.company.models import Company, CompanyMetrics, Filing, SectorComparables
+from app.company.queries import get_company_filings, load_filing_arrays
+from app.company.schemas import CompanyComparablesSchema, CompanySchema, CompanyStatsSchema
+from app.company.stats import FilingArrays, compute_ltm, compute_valuation, to_float_array, to_rows
+from app.utils.converters import row_converter
+
+# asyncpg caps a statement at 32767 bind parameters.
+_MAX_BIND_PARAMS = 32767
+
+# Filing rows buffered before an upsert; bounds ingest memory independent of archive size.
+FILING_BATCH_SIZE = 5000
+
+# Inputs the refresh reads back; everything else on the row is derived from these.
+_INPUT_FIELDS = (
+    "ltm_revenue",
+    "ltm_revenue_growth",
+    "ltm_net_income",
+    "ltm_ebitda",
+    "share_price",
+    "shares_outstanding",
+    "cash",
+    "debt",
+)
+_FILING_DERIVED_FIELDS = (
+    "ltm_revenue",
+    "ltm_revenue_growth",
+    "ltm_net_income",
+    "ltm_ebitda",
+    "shares_outstanding",
+    "cash",
+    "debt",
+)
+_STATS_FIELDS = tuple(CompanyStatsSchema.__struct_fields__)
+_COMPARABLES_FIELDS = tuple(CompanyComparablesSchema.__struct_fields__)
+
+
+async def upsert_company_metrics(session: AsyncSession, rows: Sequence[dict[str, Any]]) -> None:
+    """Insert or overwrite metrics rows keyed by company_id, in as few statements as the bind limit allows."""
+    if not rows:
+        return
+    batch_size = _MAX_BIND_PARAMS // len(rows[0])
+    for batch in batched(rows, batch_size):
+        stmt = insert(CompanyMetrics).values(list(batch))
+        updated = {key: stmt.excluded[key] for key in batch[0] if key != "company_id"}
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CompanyMetrics.company_id],
+            set_={**updated, "computed_at": func.now(), "updated_at": func.now()},
+        )
+        await session.execute(stmt)
+
+
+async def upsert_filings(session: AsyncSession, rows: Sequence[dict[str, Any]]) -> None:
+    """Insert or overwrite filings keyed by (cik, type, period_end); later figures replace earlier ones."""
+    if not rows:
+        return
+    batch_size = _MAX_BIND_PARAMS // len(rows[0])
+    for batch in batched(rows, batch_size):
+        stmt = insert(Filing).values(list(batch))
+        updated = {key: stmt.excluded[key] for key in batch[0] if key not in ("cik", "type", "period_end")}
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_filings_cik_type_period_end",
+            set_={**updated, "updated_at": func.now()},
+        )
+        await session.execute(stmt)
+
+
+async def ingest_companyfacts(
+    session: AsyncSession,
+    source: str | os.PathLike[str],
+    company_ids: Sequence[int],
+) -> set[int]:
+    """Load EDGAR companyfacts for ``company_ids`` (those with a CIK) into filings, in the caller's transaction.
+
+    Files are parsed one at a time in a worker thread, overlapping with the
+    upsert of the previous batch. Returns the ids of companies that received
+    filings. The whole universe is ingested through ``ingest_company_batch``,
+    which commits chunk by chunk instead of holding one transaction open.
+    """
+    stmt = select(Company.cik, Company.id).where(
+        Company.id.in_(company_ids), Company.cik.is_not(None), Company.deleted_at.is_(None)
+    )
+    company_by_cik = {int(cik): company_id for cik, company_id in await session.execute(stmt)}
+    if not company_by_cik:
+        return set()
+
+    ingested: set[int] = set()
+    batch: list[dict[str, Any]] = []
+
+    async def collect(cik: int, parsing: asyncio.Future[list[dict[str, Any]]]) -> None:
+        rows = await parsing
+        if not rows:
+            return
+        company_id = company_by_cik[cik]
+        ingested.add(company_id)
+        batch.extend({**row, "company_id": company_id} for row in rows)
+        if len(batch) >= FILING_BATCH_SIZE:
+            await upsert_filings(session, batch)
+            batch.clear()
+
+    pending: tuple[int, asyncio.Future[list[dict[str, Any]]]] | None = None
+    for cik, opener in iter_companyfacts_sources(source, company_by_cik.keys()):
+        parsing = asyncio.ensure_future(asyncio.to_thread(load_company_filings, cik, opener))
+        if pending is not None:
+            await collect(*pending)
+        pending = (cik, parsing)
+    if pending is not None:
+        await collect(*pending)
+    await upsert_filings(session, batch)
+    return ingested
+
+
+async def _load_metric_inputs(
+    session: AsyncSession, company_ids: Sequence[int] | None = None
+) -> dict[int, dict[str, Any]]:
+    columns = [getattr(CompanyMetrics, field) for field in _INPUT_FIELDS]
+    stmt = select(CompanyMetrics.company_id, *columns)
+    if company_ids is not None:
+        stmt = stmt.where(CompanyMetrics.company_id.in_(company_ids))
+    return {row.company_id: row._asdict() for row in await session.execute(stmt)}
+
+
+async def refresh_company_metrics(session: AsyncSession, company_ids: Sequence[int]) -> list[dict[str, Any]]:
+    """Recompute the metrics rows of the given companies from their filings and current price.
+
+    Companies without a row get one, so they show up (with empty metrics) in
+    metric-sorted screener results. Returns the rows written.
+    """
+    if not company_ids:
+        return []
+    ids = list(dict.fromkeys(company_ids))
+    filings = await load_filing_arrays(session, ids)
+    existing = await _load_metric_inputs(session, ids)
+    return await _compute_and_upsert(session, ids, filings, existing)
+
+
+async def recompute_company_metrics(session: AsyncSession, filings: FilingArrays) -> list[dict[str, Any]]:
+    """Rebuild metrics for every company in one vectorized pass over the whole filings universe.
+
+    Returns the rows written.
+    """
+    existing = await _load_metric_inputs(session)
+    ids = list(existing.keys() | set(filings.company_id.tolist()))
+    return await _compute_and_upsert(session, ids, filings, existing)
+
+
+async def _compute_and_upsert(
+    session: AsyncSession,
+    company_ids: Sequence[int],
+    filings: FilingArrays,
+    existing: dict[int, dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Overlay filing-derived LTM figures on existing inputs, derive valuations and upsert.
+
+    Share prices are never derived from filings, so they always come from the
+    existing rows. Companies without filings keep their stored inputs.
+    """
+    ids = np.unique(np.asarray(company_ids, dtype=np.int64))
+    inputs = {
+        field: to_float_array([existing.get(cid, {}).get(field) for cid in ids.tolist()]) for field in _INPUT_FIELDS
+    }
+
+    ltm = compute_ltm(filings)
+    slots = np.searchsorted(ids, ltm.company_id)
+    for field in _FILING_DERIVED_FIELDS:
+        inputs[field][slots] = getattr(ltm, field)
+
+    valuation = compute_valuation(
+        share_price=inputs["share_price"],
+        shares_outstanding=inputs["shares_outstanding"],
+        cash=inputs["cash"],
+        debt=inputs["debt"],
+        ltm_revenue=inputs["ltm_revenue"],
+        ltm_ebitda=inputs["ltm_ebitda"],
+        ltm_net_income=inputs["ltm_net_income"],
+    )
+    rows = to_rows(ids, {**inputs, **valuation})
+    await upsert_company_metrics(session, rows)
+    return rows
+
+
+async def get_company_detail(session: AsyncSession, ticker: str) -> CompanySchema:
+    stats_columns = [getattr(CompanyMetrics, field) for field in _STATS_FIELDS]
+    comparables_columns = [getattr(SectorComparables, field) for field in _COMPARABLES_FIELDS]
+    result = await session.execute(
+        select(
+            Company,
+            CompanyMetrics.company_id.label("has_metrics"),
+            SectorComparables.sector.label("has_comparables"),
+            *stats_columns,
+            *comparables_columns,
+        )
+        .outerjoin(CompanyMetrics, CompanyMetrics.company_id == Company.id)
+        .outerjoin(SectorComparables, SectorComparables.sector == Company.sector)
+        .where(Company.ticker == ticker, Company.deleted_at.is_(None))
+    )
+    row = result.first()
+    if row is None:
+        raise NotFoundException(f"Company with ticker '{ticker}' not found.")
+
+    company: Company = row.Company
+    filings = await get_company_filings(session, company.id)
+    stats = None
+    if row.has_metrics is not None:
+        stats = row_converter(result.keys(), CompanyStatsSchema)(row)
+    comparables = None
+    if row.has_comparables is not None:
+        comparables = row_converter(result.keys(), CompanyComparablesSchema)(row)
+
+    return CompanySchema(
+        id=str(company.id),
+        name=company.name,
+        ticker=company.ticker,
+        industry=company.sector,
+        filings=filings,
+        latest_filing=filings[0] if filings else None,
+        stats=stats,
+        comparables=comparables,
+        created_at=company.created_at,
+        updated_at=company.updated_at,
+    )
@@ -0,0 +1,260 @@
+"""Vectorized LTM and valuation-multiple engine.
+
+Works on whole-universe column arrays instead of per-company Python loops:
+filings for every company are laid out as parallel NumPy arrays sorted by
+``(company_id, period_end)``, and every step below is a handful of array ops
+over all of them at once. Missing values are NaN throughout and become ``None``
+only when rows are handed back to the database layer.
+
+LTM construction:
+    1. 10-Q rows are discrete quarters. Each 10-K anchors a fiscal year, and its
+       implied fourth quarter is ``annual - (Q1 + Q2 + Q3)`` when the three
+       10-Qs inside that year are all present.
+    2. LTM at a quarter is the sum of it and the three before it, provided all
+       four belong to the same company and span roughly one year.
+    3. A company's LTM is taken at its latest quarter; when that is not
+       computable it falls back to its latest 10-K figure.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+
+# Fiscal quarters are ~91 days apart; allow slack for 52/53-week calendars.
+_FISCAL_YEAR_DAYS = 372
+_FISCAL_YEAR_QUARTERS_WINDOW_DAYS = 330  # Q1 of a fiscal year ends ~273 days before the 10-K
+_THREE_QUARTERS_MAX_DAYS = 290
+_PRIOR_YEAR_RANGE_DAYS = (330, 400)
+
+LTM_FIELDS = ("revenue", "net_income", "ebitda")
+POINT_IN_TIME_FIELDS = ("shares_outstanding", "cash", "debt")
+
+
+@dataclass(frozen=True, slots=True)
+class FilingArrays:
+    """Column-oriented filings for many companies, sorted by ``(company_id, period_end)``."""
+
+    company_id: IntArray
+    period_end: npt.NDArray[np.datetime64]  # datetime64[D]
+    is_annual: npt.NDArray[np.bool_]
+    revenue: FloatArray
+    net_income: FloatArray
+    ebitda: FloatArray
+    shares_outstanding: FloatArray
+    cash: FloatArray
+    debt: FloatArray
+
+    def __len__(self) -> int:
+        return len(self.company_id)
+
+    @classmethod
+    def from_columns(cls, columns: dict[str, list[Any]]) -> "FilingArrays":
+        """Build sorted arrays from plain column lists (``None`` → NaN)."""
+        company_id = np.asarray(columns["company_id"], dtype=np.int64)
+        period_end = np.asarray(columns["period_end"], dtype="datetime64[D]")
+        order = np.lexsort((period_end, company_id))
+        floats = {
+            field: np.asarray([np.nan if value is None else value for value in columns[field]], dtype=np.float64)[order]
+            for field in (*LTM_FIELDS, *POINT_IN_TIME_FIELDS)
+        }
+        return cls(
+            company_id=company_id[order],
+            period_end=period_end[order],
+            is_annual=(np.asarray(columns["type"]) == "10-K")[order],
+            **floats,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CompanyStatsArrays:
+    """Per-company results, aligned on ascending ``company_id``."""
+
+    company_id: IntArray
+    ltm_revenue: FloatArray
+    ltm_revenue_growth: FloatArray
+    ltm_net_income: FloatArray
+    ltm_ebitda: FloatArray
+    shares_outstanding: FloatArray
+    cash: FloatArray
+    debt: FloatArray
+
+
+def _group_last(group: IntArray) -> npt.NDArray[np.bool_]:
+    """Mask of the last element of each run in a sorted group array."""
+    if len(group) == 0:
+        return np.zeros(0, dtype=bool)
+    return np.r_[group[1:] != group[:-1], True]
+
+
+def _days(dates: npt.NDArray[np.datetime64]) -> IntArray:
+    return dates.astype("datetime64[D]").astype(np.int64)
+
+
+def _window_sum(values: FloatArray, lo: IntArray, hi: IntArray) -> tuple[FloatArray, IntArray]:
+    """Sum and valid-count of ``values[lo:hi]`` for each pair, via prefix sums (NaN-aware)."""
+    valid = ~np.isnan(values)
+    value_cs = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    count_cs = np.concatenate(([0], np.cumsum(valid)))
+    return value_cs[hi] - value_cs[lo], count_cs[hi] - count_cs[lo]
+
+
+def _quarterly_series(filings: FilingArrays) -> tuple[IntArray, IntArray, dict[str, FloatArray]]:
+    """Merge 10-Q quarters with 10-K-implied fourth quarters into one sorted series."""
+    quarter = ~filings.is_annual
+    q_company = filings.company_id[quarter]
+    q_days = _days(filings.period_end[quarter])
+    a_company = filings.company_id[filings.is_annual]
+    a_days = _days(filings.period_end[filings.is_annual])
+
+    # Composite (company, day) keys make "10-Qs of this company inside this fiscal year"
+    # a pair of binary searches over the sorted quarter array.
+    span = int(max(q_days.max(initial=0), a_days.max(initial=0))) + _FISCAL_YEAR_DAYS + 1
+    q_key = q_company * span + q_days
+    a_key = a_company * span + a_days
+    lo = np.searchsorted(q_key, a_key - _FISCAL_YEAR_QUARTERS_WINDOW_DAYS, side="left")
+    hi = np.searchsorted(q_key, a_key, side="left")
+    has_three = (hi - lo) == 3
+
+    values: dict[str, FloatArray] = {}
+    for field in LTM_FIELDS:
+        q_values = getattr(filings, field)[quarter]
+        annual = getattr(filings, field)[filings.is_annual]
+        q_sum, q_count = _window_sum(q_values, lo, hi)
+        implied_q4 = np.where(has_three & (q_count == 3), annual - q_sum, np.nan)
+        values[field] = np.concatenate((q_values, implied_q4))
+
+    company = np.concatenate((q_company, a_company))
+    days = np.concatenate((q_days, a_days))
+    order = np.lexsort((days, company))
+    return company[order], days[order], {field: series[order] for field, series in values.items()}
+
+
+def compute_ltm(filings: FilingArrays) -> CompanyStatsArrays:
+    """Compute trailing-twelve-month figures and latest balance-sheet values for every company."""
+    companies = np.unique(filings.company_id)
+    company, days, quarterly = _quarterly_series(filings)
+
+    # Trailing four-quarter windows ending at each quarter
+    n = len(company)
+    end = np.arange(1, n + 1)
+    start = np.maximum(end - 4, 0)
+    window_ok = (end - start == 4) & (company == company[start])
+    window_ok &= (days - days[start]) <= _THREE_QUARTERS_MAX_DAYS
+
+    ltm_by_quarter: dict[str, FloatArray] = {}
+    for field, series in quarterly.items():
+        total, count = _window_sum(series, start, end)
+        ltm_by_quarter[field] = np.where(window_ok & (count == 4), total, np.nan)
+
+    # Latest quarter per company, and the quarter four back for year-over-year growth
+    last_q = np.flatnonzero(_group_last(company))
+    prior_q = last_q - 4
+    prior_ok = prior_q >= 0
+    prior_q = prior_q.clip(min=0)
+    gap = days[last_q] - days[prior_q]
+    prior_ok &= (company[prior_q] == company[last_q]) & (gap >= _PRIOR_YEAR_RANGE_DAYS[0])
+    prior_ok &= gap <= _PRIOR_YEAR_RANGE_DAYS[1]
+    q_slot = np.searchsorted(companies, company[last_q])
+
+    # Annual fallbacks: latest 10-K and the one before it
+    a_mask = filings.is_annual
+    a_company = filings.company_id[a_mask]
+    last_a = np.flatnonzero(_group_last(a_company))
+    prior_a = last_a - 1
+    prior_a_ok = (prior_a >= 0) & (a_company[prior_a.clip(min=0)] == a_company[last_a])
+    a_slot = np.searchsorted(companies, a_company[last_a])
+
+    out: dict[str, FloatArray] = {}
+    prior: dict[str, FloatArray] = {}
+    for field in LTM_FIELDS:
+        annual = getattr(filings, field)[a_mask]
+        current = np.full(len(companies), np.nan)
+        previous = np.full(len(companies), np.nan)
+        current[a_slot] = annual[last_a]
+        previous[a_slot] = np.where(prior_a_ok, annual[prior_a.clip(min=0)], np.nan)
+
+        ltm_last = ltm_by_quarter[field][last_q]
+        ltm_prior = np.where(prior_ok, ltm_by_quarter[field][prior_q], np.nan)
+        has_quarterly = ~np.isnan(ltm_last)
+        current[q_slot[has_quarterly]] = ltm_last[has_quarterly]
+        previous[q_slot[has_quarterly]] = ltm_prior[has_quarterly]
+        out[field] = current
+        prior[field] = previous
+
+    point_in_time: dict[str, FloatArray] = {}
+    for field in POINT_IN_TIME_FIELDS:
+        values = getattr(filings, field)
+        valid = np.flatnonzero(~np.isnan(values))
+        last_valid = valid[_group_last(filings.company_id[valid])]
+        latest = np.full(len(companies), np.nan)
+        latest[np.searchsorted(companies, filings.company_id[last_valid])] = values[last_valid]
+        point_in_time[field] = latest
+
+    return CompanyStatsArrays(
+        company_id=companies,
+        ltm_revenue=out["revenue"],
+        ltm_revenue_growth=growth_pct(out["revenue"], prior["revenue"]),
+        ltm_net_income=out["net_income"],
+        ltm_ebitda=out["ebitda"],
+        **point_in_time,
+    )
+
+
+def safe_divide(numerator: FloatArray, denominator: FloatArray) -> FloatArray:
+    """Elementwise ratio that is NaN wherever either side is missing or the denominator is not positive.
+
+    Multiples on a zero or negative base are meaningless for screening.
+    """
+    ok = ~np.isnan(numerator) & (denominator > 0)
+    return np.divide(numerator, denominator, out=np.full(numerator.shape, np.nan), where=ok)
+
+
+def growth_pct(current: FloatArray, previous: FloatArray) -> FloatArray:
+    return (safe_divide(current, previous) - 1.0) * 100.0
+
+
+def compute_valuation(
+    share_price: FloatArray,
+    shares_outstanding: FloatArray,
+    cash: FloatArray,
+    debt: FloatArray,
+    ltm_revenue: FloatArray,
+    ltm_ebitda: FloatArray,
+    ltm_net_income: FloatArray,
+) -> dict[str, FloatArray]:
+    """Equity value, enterprise value and multiples. Missing cash/debt count as zero in EV."""
+    equity_value = share_price * shares_outstanding
+    enterprise_value = equity_value + np.nan_to_num(debt) - np.nan_to_num(cash)
+    eps = safe_divide(ltm_net_income, shares_outstanding)
+    return {
+        "equity_value": equity_value,
+        "enterprise_value": enterprise_value,
+        "multiple_ev_to_revenue": safe_divide(enterprise_value, ltm_revenue),
+        "multiple_ev_to_ebitda": safe_divide(enterprise_value, ltm_ebitda),
+        "price_to_earnings": safe_divide(share_price, eps),
+    }
+
+
+def to_float_array(values: list[float | None]) -> FloatArray:
+    return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+
+def to_rows(company_id: IntArray, columns: dict[str, FloatArray]) -> list[dict[str, Any]]:
+    """Transpose per-company arrays into upsert rows, turning NaN back into ``None``."""
+    as_lists = {field: _nan_to_none(values) for field, values in columns.items()}
+    fields = list(as_lists)
+    return [
+        {"company_id": cid, **dict(zip(fields, row, strict=True))}
+        for cid, *row in zip(company_id.tolist(), *as_lists.values(), strict=True)
+    ]
+
+
+def _nan_to_none(values: FloatArray) -> list[float | None]:
+    objects = values.astype(object)
+    objects[np.isnan(values)] = None
+    return objects.tolist()
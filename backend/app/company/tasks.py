@@ -1,15 +1,127 @@
 import asyncio
+from itertools import batched
 
-from app.queue.enums import TaskName
-from app.queue.registry import task
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.company.cache import clear_company_details_on_commit, invalidate_company_details_on_commit
+from app.company.comparables import rebuild_comparables, update_comparables
+from app.company.queries import get_company_by_ticker, get_ingestable_company_ids, load_filing_arrays
+from app.company.services import (
+    ingest_companyfacts,
+    recompute_company_metrics as recompute_metrics,
+    refresh_company_metrics as refresh_metrics,
+)
+from app.config import config
+from app.queue.enums import QueueName, TaskName
+from app.queue.progress import advance_task_progress, record_task_failure, set_task_total
+from app.queue.registry import scheduled_task, task
+from app.queue.throttle import RateLimit
+from app.queue.transactions import enqueue_from_worker, task_transaction, with_transaction
 from app.queue.types import AppContext
 
+# A chunk covers many companies, well past SAQ's 10 s default job timeout.
+INGEST_CHUNK_TIMEOUT_S = 600
+
+
+@task(
+    TaskName.INGEST_COMPANY_DATA,
+    queue=QueueName.INTERACTIVE,
+    coalesce_s=60,
+    rate_limit=RateLimit(per_second=5, burst=20),
+)
+@with_transaction
+async def ingest_company_data(
+    ctx: AppContext,
+    *,
+    ticker: str,
+    source: str | None = None,
+    transaction: AsyncSession,
+) -> int:
+    """Ingest EDGAR companyfacts for one company and refresh its metrics in the same transaction.
+
+    ``source`` overrides the configured archive path. Returns 1 if the company
+    received filings, else 0. The whole universe goes through
+    ``ingest_company_batch`` on the ingestion queue instead, whose chunks fit
+    its timeout where one interactive job could not.
+    """
+    company = await get_company_by_ticker(ticker, transaction)
+    ingested = await _ingest_and_refresh(transaction, [company.id], source)
+    return len(ingested)
+
+
+@task(TaskName.INGEST_COMPANY_BATCH, queue=QueueName.INGESTION)
+async def ingest_company_batch(
+    ctx: AppContext,
+    *,
+    tickers: list[str] | None = None,
+    chunk_size: int | None = None,
+) -> int:
+    """Fan ingestion of ``tickers`` (or every company with a CIK) out to chunked child jobs.
+
+    Each child ingests a whole chunk in one transaction and one archive pass,
+    so per-job overhead is paid once per chunk rather than once per company,
+    and chunks run in parallel up to the worker's concurrency. Progress is
+    tracked on this job's ``tasks`` row. Returns the number of child jobs.
+    """
+    job = ctx.get("job")
+    if job is None:
+        raise RuntimeError("ingest_company_batch must run as a queued job to track its progress")
+    async with task_transaction(ctx["db_sessionmaker"]) as session:
+        company_ids = await get_ingestable_company_ids(session, tickers)
+        await set_task_total(session, job, len(company_ids))
+
+    # Enqueued only after the total is committed, so children never advance an unset counter.
+    chunks = list(batched(company_ids, chunk_size or config.INGEST_CHUNK_SIZE))
+    await asyncio.gather(
+        *(
+            enqueue_from_worker(ctx, TaskName.INGEST_COMPANY_CHUNK, company_ids=list(chunk), parent_key=job.key)
+            for chunk in chunks
+        )
+    )
+    return len(chunks)
+
+
+@task(TaskName.INGEST_COMPANY_CHUNK, queue=QueueName.INGESTION, timeout=INGEST_CHUNK_TIMEOUT_S)
+async def ingest_company_chunk(ctx: AppContext, *, company_ids: list[int], parent_key: str | None = None) -> int:
+    """Ingest one chunk of a batch and advance the parent's progress in the same transaction."""
+    try:
+        async with task_transaction(ctx["db_sessionmaker"]) as session:
+            ingested = await _ingest_and_refresh(session, company_ids)
+            if parent_key is not None:
+                await advance_task_progress(session, parent_key, completed=len(company_ids))
+    except Exception:
+        if parent_key is not None:
+            await record_task_failure(ctx["db_sessionmaker"], parent_key, len(company_ids))
+        raise
+    return len(ingested)
+
+
+async def _ingest_and_refresh(session: AsyncSession, company_ids: list[int], source: str | None = None) -> set[int]:
+    """Ingest filings, then refresh the ingested companies' metrics and their sectors' comparables."""
+    ingested = await ingest_companyfacts(session, source or config.EDGAR_COMPANYFACTS_PATH, company_ids)
+    rows = await refresh_metrics(session, list(ingested))
+    sectors = await update_comparables(session, rows)
+    await invalidate_company_details_on_commit(session, ingested, sectors)
+    return ingested
+
+
+@task(TaskName.REFRESH_COMPANY_METRICS, queue=QueueName.INTERACTIVE, coalesce_s=10)
+@with_transaction
+async def refresh_company_metrics(ctx: AppContext, *, company_ids: list[int], transaction: AsyncSession) -> int:
+    """Recompute company_metrics rows for companies whose filings or price changed."""
+    rows = await refresh_metrics(transaction, company_ids)
+    sectors = await update_comparables(transaction, rows)
+    await invalidate_company_details_on_commit(transaction, company_ids, sectors)
+    return len(rows)
+
 
-@task(TaskName.INGEST_COMPANY_DATA)
-async def ingest_company_data(ctx: AppContext, *, ticker: str) -> str:
-    """Fetch and ingest data for a given company ticker."""
-    print(f"Starting data ingestion for ticker: {ticker}")
-    await asyncio.sleep(5)
-    message = f"Successfully ingested data for {ticker}"
-    print(message)
-    return message
+@scheduled_task("H 4 * * *")
+@task(TaskName.RECOMPUTE_COMPANY_METRICS, queue=QueueName.INGESTION)
+@with_transaction
+async def recompute_company_metrics(ctx: AppContext, *, transaction: AsyncSession) -> int:
+    """Nightly full recompute of every company's metrics and every sector's comparables."""
+    filings = await load_filing_arrays(transaction)
+    rows = await recompute_metrics(transaction, filings)
+    await rebuild_comparables(transaction)
+    clear_company_details_on_commit(transaction)
+    return len(rows)
@@ -0,0 +1,228 @@
+"""Typeahead search for the company search box.
+
+Short queries (up to ``TRIE_MAX_PREFIX`` characters) are answered from an
+in-process prefix trie over tickers and name words, kept in sync with
+``businesses`` by an incremental ``updated_at`` watermark that re-reads a
+``WATERMARK_OVERLAP`` window so late-committing writes are not missed, plus a
+periodic full rebuild. Longer queries go to Postgres, where the pg_trgm GIN
+index on ``lower(name)`` backs fuzzy matching.
+
+Ranking is the same on both paths: exact ticker, then ticker prefix, then name.
+"""
+
+import asyncio
+import heapq
+import re
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.company.models import Company
+from app.company.queries import prefix_pattern
+from app.company.schemas import CompanyTypeaheadResultSchema
+
+TRIE_MAX_PREFIX = 3
+DEFAULT_TYPEAHEAD_LIMIT = 10
+MAX_TYPEAHEAD_LIMIT = 50
+
+_WORD_SPLIT = re.compile(r"[^0-9a-z]+")
+
+
+class _TrieNode:
+    __slots__ = ("children", "ids")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.ids: set[int] = set()
+
+
+class PrefixTrie:
+    """Depth-capped trie mapping every key prefix to the ids whose keys start with it.
+
+    Each node holds the full id set for its prefix, so a lookup is a walk of at
+    most ``max_depth`` nodes with no subtree traversal.
+    """
+
+    def __init__(self, max_depth: int = TRIE_MAX_PREFIX) -> None:
+        self.max_depth = max_depth
+        self._root = _TrieNode()
+
+    def insert(self, key: str, item_id: int) -> None:
+        node = self._root
+        for char in key[: self.max_depth]:
+            node = node.children.setdefault(char, _TrieNode())
+            node.ids.add(item_id)
+
+    def remove(self, key: str, item_id: int) -> None:
+        path: list[tuple[_TrieNode, str]] = []
+        node = self._root
+        for char in key[: self.max_depth]:
+            child = node.children.get(char)
+            if child is None:
+                return
+            path.append((node, char))
+            node = child
+            node.ids.discard(item_id)
+        # Prune nodes left empty, deepest first
+        for parent, char in reversed(path):
+            if parent.children[char].ids:
+                break
+            del parent.children[char]
+
+    def lookup(self, prefix: str) -> set[int]:
+        node = self._root
+        for char in prefix[: self.max_depth]:
+            child = node.children.get(char)
+            if child is None:
+                return set()
+            node = child
+        return node.ids
+
+
+def _index_keys(ticker: str, name: str) -> set[str]:
+    keys = {ticker.lower()}
+    keys.update(word for word in _WORD_SPLIT.split(name.lower()) if word)
+    return keys
+
+
+def _rank(entry: CompanyTypeaheadResultSchema, query: str) -> tuple[int, int, str]:
+    ticker = entry.ticker.lower()
+    if ticker == query:
+        rank = 0
+    elif ticker.startswith(query):
+        rank = 1
+    elif entry.name.lower().startswith(query):
+        rank = 2
+    else:
+        rank = 3
+    return rank, len(ticker), ticker
+
+
+class TypeaheadIndex:
+    """Process-local trie over live companies with incremental refresh."""
+
+    # updated_at is the writer's transaction start, so a row can commit long after rows with a newer
+    # updated_at have moved the watermark past it. Re-reading this window (changes are applied
+    # idempotently) catches writers that commit within it; the periodic rebuild catches the rest.
+    WATERMARK_OVERLAP = timedelta(minutes=10)
+
+    def __init__(self, refresh_interval_s: float = 30.0, rebuild_interval_s: float = 900.0) -> None:
+        self.refresh_interval_s = refresh_interval_s
+        self.rebuild_interval_s = rebuild_interval_s
+        self._trie = PrefixTrie()
+        self._entries: dict[int, CompanyTypeaheadResultSchema] = {}
+        self._watermark: datetime | None = None
+        self._refreshed_at = 0.0
+        self._rebuilt_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def ensure_fresh(self, session: AsyncSession) -> None:
+        if time.monotonic() - self._refreshed_at < self.refresh_interval_s:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            if now - self._refreshed_at < self.refresh_interval_s:
+                return
+            if now - self._rebuilt_at >= self.rebuild_interval_s:
+                await self._rebuild(session)
+                self._rebuilt_at = now
+            else:
+                await self._apply_changes(session)
+            self._refreshed_at = now
+
+    def invalidate(self) -> None:
+        """Force the next lookup to pick up changes (e.g. after a write in this process)."""
+        self._refreshed_at = 0.0
+
+    def search(self, query: str, limit: int) -> list[CompanyTypeaheadResultSchema]:
+        query = query.lower()
+        candidates = (self._entries[item_id] for item_id in self._trie.lookup(query))
+        return heapq.nsmallest(limit, candidates, key=lambda entry: _rank(entry, query))
+
+    async def _rebuild(self, session: AsyncSession) -> None:
+        self._trie = PrefixTrie()
+        self._entries = {}
+        self._watermark = None
+        await self._apply_changes(session)
+
+    async def _apply_changes(self, session: AsyncSession) -> None:
+        stmt = select(
+            Company.id,
+            Company.name,
+            Company.ticker,
+            Company.sector,
+            Company.deleted_at,
+            Company.updated_at,
+        )
+        if self._watermark is not None:
+            stmt = stmt.where(Company.updated_at > self._watermark - self.WATERMARK_OVERLAP)
+        else:
+            stmt = stmt.where(Company.deleted_at.is_(None))
+
+        for row in await session.execute(stmt):
+            self._discard(row.id)
+            if row.deleted_at is None:
+                self._add(
+                    CompanyTypeaheadResultSchema(id=str(row.id), name=row.name, ticker=row.ticker, industry=row.sector)
+                )
+            if self._watermark is None or row.updated_at > self._watermark:
+                self._watermark = row.updated_at
+
+    def _add(self, entry: CompanyTypeaheadResultSchema) -> None:
+        item_id = int(entry.id)
+        self._entries[item_id] = entry
+        for key in _index_keys(entry.ticker, entry.name):
+            self._trie.insert(key, item_id)
+
+    def _discard(self, item_id: int) -> None:
+        entry = self._entries.pop(item_id, None)
+        if entry is None:
+            return
+        for key in _index_keys(entry.ticker, entry.name):
+            self._trie.remove(key, item_id)
+
+
+typeahead_index = TypeaheadIndex()
+
+
+async def search_typeahead(query: str, limit: int, session: AsyncSession) -> list[CompanyTypeaheadResultSchema]:
+    query = query.strip()
+    if not query:
+        return []
+    limit = min(max(limit, 1), MAX_TYPEAHEAD_LIMIT)
+
+    if len(query) <= TRIE_MAX_PREFIX:
+        await typeahead_index.ensure_fresh(session)
+        return typeahead_index.search(query, limit)
+
+    return await _search_database(query, limit, session)
+
+
+async def _search_database(query: str, limit: int, session: AsyncSession) -> list[CompanyTypeaheadResultSchema]:
+    ticker_query = query.upper()
+    name_query = query.lower()
+    name = func.lower(Company.name)
+    rank = case(
+        (Company.ticker == ticker_query, 0),
+        (Company.ticker.like(prefix_pattern(ticker_query), escape="\\"), 1),
+        else_=2,
+    )
+    stmt = (
+        select(Company.id, Company.name, Company.ticker, Company.sector)
+        .where(
+            Company.deleted_at.is_(None),
+            Company.ticker.like(prefix_pattern(ticker_query), escape="\\")
+            # `name %> q` is word_similarity(q, name) >= threshold and can use the GIN trgm index
+            | name.op("%>")(name_query)
+            | name.like(f"%{prefix_pattern(name_query)}", escape="\\"),
+        )
+        .order_by(rank, func.word_similarity(literal(name_query), name).desc(), Company.ticker)
+        .limit(limit)
+    )
+    result = await session.execute(stmt)
+    return [
+        CompanyTypeaheadResultSchema(id=str(row.id), name=row.name, ticker=row.ticker, industry=row.sector)
+        for row in result
+    ]
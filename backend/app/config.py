@@ -18,9 +18,56 @@ class Config:
     # ─── Redis ────────────────────────────────────────────────────────────────
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")
 
+    # ─── Queue workers ────────────────────────────────────────────────────────
+    WORKER_CONCURRENCY: int = int(os.getenv("WORKER_CONCURRENCY", "10"))
+    INTERACTIVE_QUEUE_CONCURRENCY: int = int(os.getenv("INTERACTIVE_QUEUE_CONCURRENCY", "10"))
+    INGESTION_QUEUE_CONCURRENCY: int = int(os.getenv("INGESTION_QUEUE_CONCURRENCY", "4"))
+    # Persistent connections per worker; 0 means one per concurrent job plus the status recorder.
+    WORKER_DB_POOL_SIZE: int = int(os.getenv("WORKER_DB_POOL_SIZE", "0"))
+    WORKER_DB_MAX_OVERFLOW: int = int(os.getenv("WORKER_DB_MAX_OVERFLOW", "5"))
+    WORKER_DB_POOL_TIMEOUT_S: float = float(os.getenv("WORKER_DB_POOL_TIMEOUT_S", "30"))
+    # Maximum connection age (replaced at its next checkout); idle core connections are kept open.
+    WORKER_DB_POOL_RECYCLE_S: int = int(os.getenv("WORKER_DB_POOL_RECYCLE_S", "1800"))
+    # Connections opened at worker startup; defaults to the full pool.
+    WORKER_DB_POOL_WARM: int = int(os.getenv("WORKER_DB_POOL_WARM", "-1"))
+    # Seconds between reloads of DB-defined task schedules in each worker.
+    TASK_SCHEDULE_RELOAD_S: float = float(os.getenv("TASK_SCHEDULE_RELOAD_S", "30"))
+
+    # ─── Task history ─────────────────────────────────────────────────────────
+    # Days of `tasks` rows kept; older daily partitions are dropped, or detached when archiving.
+    TASK_HISTORY_RETENTION_DAYS: int = int(os.getenv("TASK_HISTORY_RETENTION_DAYS", "30"))
+    TASK_HISTORY_PREMAKE_DAYS: int = int(os.getenv("TASK_HISTORY_PREMAKE_DAYS", "7"))
+    TASK_HISTORY_ARCHIVE: bool = os.getenv("TASK_HISTORY_ARCHIVE", "false").lower() == "true"
+
+    # ─── Task outbox ──────────────────────────────────────────────────────────
+    OUTBOX_BATCH_SIZE: int = int(os.getenv("OUTBOX_BATCH_SIZE", "500"))
+    # Fallback poll for rows written by other processes; local commits wake the relay immediately.
+    OUTBOX_POLL_INTERVAL_S: float = float(os.getenv("OUTBOX_POLL_INTERVAL_S", "1.0"))
+    OUTBOX_RETENTION_S: int = int(os.getenv("OUTBOX_RETENTION_S", "86400"))
+    # Failed enqueues back off exponentially from OUTBOX_BACKOFF_S up to OUTBOX_MAX_BACKOFF_S,
+    # and the row is dead-lettered after OUTBOX_MAX_ATTEMPTS.
+    OUTBOX_MAX_ATTEMPTS: int = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10"))
+    OUTBOX_BACKOFF_S: float = float(os.getenv("OUTBOX_BACKOFF_S", "1.0"))
+    OUTBOX_MAX_BACKOFF_S: float = float(os.getenv("OUTBOX_MAX_BACKOFF_S", "300.0"))
+
+    # ─── Compression ──────────────────────────────────────────────────────────
+    # Responses smaller than this are sent uncompressed.
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    # Bodies at least this large are compressed in a worker thread instead of on the event loop.
+    COMPRESSION_OFFLOAD_SIZE: int = int(os.getenv("COMPRESSION_OFFLOAD_SIZE", "262144"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "5"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+    COMPRESSION_ZSTD_LEVEL: int = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+
     # ─── Static files ─────────────────────────────────────────────────────────
     STATIC_DIR: str = os.getenv("STATIC_DIR", "frontend/dist")
 
+    # ─── EDGAR ────────────────────────────────────────────────────────────────
+    # Local mirror of the SEC bulk companyfacts archive: a zip, a JSON file or a directory of either.
+    EDGAR_COMPANYFACTS_PATH: str = os.getenv("EDGAR_COMPANYFACTS_PATH", "data/edgar/companyfacts.zip")
+    # Companies per child job of a batch ingest.
+    INGEST_CHUNK_SIZE: int = int(os.getenv("INGEST_CHUNK_SIZE", "100"))
+
     # ─── Computed properties ───────────────────────────────────────────────────
 
     @property
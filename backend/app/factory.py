@@ -1,18 +1,23 @@
 from pathlib import Path
 
-from litestar import Litestar, Router, get
+from litestar import Litestar, Request, Router, get
 from litestar.config.cors import CORSConfig
-from litestar.enums import MediaType
+from litestar.exceptions import NotFoundException
 from litestar.plugins.sqlalchemy import SQLAlchemyPlugin
 from litestar.response import Response
-from litestar.static_files import StaticFilesConfig
 from litestar_saq import SAQConfig, SAQPlugin
 
+from app.company.cache import company_detail_cache
+from app.company.queries import NEXT_CURSOR_HEADER
 from app.company.routes import companies_router
 from app.config import config
 from app.queue.config import queue_config
+from app.queue.metrics import task_metrics
+from app.queue.outbox import task_outbox
+from app.utils.compression import CompressionMiddleware, CompressionSettings
 from app.utils.db import db_config
 from app.utils.deps import get_dependencies
+from app.utils.static import IMMUTABLE, REVALIDATE, load_static_dir, load_static_file, static_response
 
 
 @get("/health", include_in_schema=False)
@@ -20,47 +25,67 @@ async def health_check() -> str:
     return "OK"
 
 
+@get("/metrics", include_in_schema=False)
+async def metrics() -> Response[str]:
+    return Response(await task_metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 def create_app() -> Litestar:
     cors_config = CORSConfig(
         allow_origins=[config.FRONTEND_ORIGIN],
         allow_credentials=True,
         allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
         allow_headers=["Content-Type", "Authorization"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
     saq_config = SAQConfig(queue_configs=queue_config)
     saq_plugin = SAQPlugin(config=saq_config)
 
     api_router = Router(path="/api", route_handlers=[companies_router])
-    route_handlers: list = [health_check, api_router]
-    static_configs: list[StaticFilesConfig] = []
+    route_handlers: list = [health_check, metrics, api_router]
 
     if not config.IS_DEV:
         static_dir = Path(config.STATIC_DIR)
         assets_dir = static_dir / "assets"
         if assets_dir.exists():
-            static_configs.append(
-                StaticFilesConfig(
-                    path="/assets",
-                    directories=[str(assets_dir)],
-                )
-            )
+            assets = load_static_dir(assets_dir)
+
+            @get("/assets/{path:path}", include_in_schema=False)
+            async def assets_handler(request: Request, path: str) -> Response[bytes]:
+                file = assets.get(path.lstrip("/"))
+                if file is None:
+                    raise NotFoundException()
+                return static_response(request, file, cache_control=IMMUTABLE)
+
+            route_handlers.append(assets_handler)
 
         index_path = static_dir / "index.html"
+        if index_path.exists():
+            index = load_static_file(index_path)
 
-        @get(["/", "/{path:path}"], include_in_schema=False)
-        async def spa_handler(path: str = "") -> Response:
-            return Response(
-                content=index_path.read_text(),
-                media_type=MediaType.HTML,
-            )
+            @get(["/", "/{path:path}"], include_in_schema=False)
+            async def spa_handler(request: Request, path: str = "") -> Response[bytes]:
+                return static_response(request, index, cache_control=REVALIDATE)
 
-        route_handlers.append(spa_handler)
+            route_handlers.append(spa_handler)
 
     return Litestar(
         route_handlers=route_handlers,
         dependencies=get_dependencies(),
         plugins=[SQLAlchemyPlugin(db_config), saq_plugin],
         cors_config=cors_config,
-        static_files_config=static_configs,
+        middleware=[
+            CompressionMiddleware(
+                CompressionSettings(
+                    min_size=config.COMPRESSION_MIN_SIZE,
+                    offload_size=config.COMPRESSION_OFFLOAD_SIZE,
+                    gzip_level=config.COMPRESSION_GZIP_LEVEL,
+                    brotli_quality=config.COMPRESSION_BROTLI_QUALITY,
+                    zstd_level=config.COMPRESSION_ZSTD_LEVEL,
+                )
+            )
+        ],
+        on_startup=[company_detail_cache.start, task_outbox.start],
+        on_shutdown=[task_outbox.stop, company_detail_cache.stop, task_metrics.stop],
     )
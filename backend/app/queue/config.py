@@ -1,25 +1,29 @@
 """SAQ queue configuration.
 
-Wires up the queue startup hook, auto-discovers task modules, and builds the
+Wires up the queue startup hook, loads the task registry, and builds the
 QueueConfig list consumed by SAQPlugin in factory.py.
 """
 
 import logging
+import time
 from datetime import UTC, datetime
 from typing import cast
 
 from litestar_saq import QueueConfig
 from saq.job import Status
 from saq.types import Context, ReceivesContext
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from saq.utils import now
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
+from app.config import config
 from app.queue.enums import TaskStatus
-from app.queue.models import Task
+from app.queue.metrics import task_metrics
+from app.queue.queues import QUEUE_SPECS
 from app.queue.registry import get_registry
+from app.queue.schedules import ScheduleSync
+from app.queue.status import TaskStatusRecorder, job_enqueued_at
 from app.queue.types import AppContext
-from app.config import config
-from app.utils.discovery import discover_and_import
+from app.utils.db import create_pooled_engine, pool_stats, warm_pool
 
 logger = logging.getLogger(__name__)
 
@@ -31,103 +35,135 @@ _SAQ_STATUS_MAP: dict[Status, TaskStatus] = {
 }
 
 
+def _observe_pool_checkout(wait_s: float | None) -> None:
+    if wait_s is None:
+        task_metrics.inc("saq_db_pool_checkout_timeouts_total")
+    else:
+        task_metrics.observe("saq_db_pool_checkout_wait_seconds", wait_s)
+
+
 async def queue_startup(ctx: AppContext) -> None:  # type: ignore[override]
     """SAQ startup hook — inject shared resources into the task context."""
-    engine = create_async_engine(
+    pool_size = config.WORKER_DB_POOL_SIZE or ctx["worker"].concurrency + 1
+    engine = create_pooled_engine(
         config.DATABASE_URL,
-        pool_size=0,  # no persistent connections — tasks are short-lived
-        max_overflow=5,
+        pool_size=pool_size,
+        max_overflow=config.WORKER_DB_MAX_OVERFLOW,
+        pool_timeout_s=config.WORKER_DB_POOL_TIMEOUT_S,
+        pool_recycle_s=config.WORKER_DB_POOL_RECYCLE_S,
+        observer=_observe_pool_checkout,
     )
+    warm = pool_size if config.WORKER_DB_POOL_WARM < 0 else min(config.WORKER_DB_POOL_WARM, pool_size)
+    try:
+        await warm_pool(engine, warm)
+    except Exception:
+        logger.warning("Could not warm the worker DB pool; connections will open on demand", exc_info=True)
     ctx["db_engine"] = engine
     ctx["db_sessionmaker"] = async_sessionmaker(engine, expire_on_commit=False)
     ctx["config"] = config
     ctx["queue"] = ctx["worker"].queue
+    ctx["task_status"] = TaskStatusRecorder(ctx["db_sessionmaker"])
+    ctx["task_status"].start()
+    task_metrics.start()
+    ctx["schedules"] = ScheduleSync(
+        ctx["db_sessionmaker"], ctx["queue"], reload_interval_s=config.TASK_SCHEDULE_RELOAD_S, tz=UTC
+    )
+    ctx["schedules"].start()
     logger.info("Queue worker started — DB sessionmaker injected into context")
 
 
 async def queue_shutdown(ctx: AppContext) -> None:  # type: ignore[override]
-    """SAQ shutdown hook — dispose DB engine."""
+    """SAQ shutdown hook — stop DB schedules, flush buffered task statuses, then dispose DB engine."""
+    schedules = ctx.get("schedules")
+    if schedules is not None:
+        await schedules.stop()
+    recorder = ctx.get("task_status")
+    if recorder is not None:
+        await recorder.stop()
+    await task_metrics.stop()
     engine = ctx.get("db_engine")
     if engine is not None:
+        if stats := pool_stats(engine):
+            logger.info(
+                "Worker DB pool: %d checkouts, mean wait %.1f ms, max wait %.1f ms, %d timeouts",
+                stats.checkouts,
+                stats.mean_wait_s * 1000,
+                stats.max_wait_s * 1000,
+                stats.timeouts,
+            )
         await engine.dispose()
     logger.info("Queue worker stopped — DB engine disposed")
 
 
 async def before_process(ctx: Context) -> None:
-    """Upsert a Task row with status=ACTIVE when a job starts."""
+    """Record status=ACTIVE and the queue wait when a job starts (buffered; see TaskStatusRecorder)."""
     job = ctx.get("job")
     if job is None:
         return
-    sessionmaker: async_sessionmaker = ctx["db_sessionmaker"]  # type: ignore[assignment]
-    now = datetime.now(UTC)
-    async with sessionmaker() as session:
-        result = await session.execute(select(Task).where(Task.job_key == job.key))
-        task = result.scalar_one_or_none()
-        if task is None:
-            task = Task(
-                job_key=job.key,
-                queue=job.queue.name if job.queue else "default",
-                task_name=job.function,
-                status=TaskStatus.ACTIVE,
-                started_at=now,
-            )
-            session.add(task)
-        else:
-            task.status = TaskStatus.ACTIVE
-            task.started_at = now
-        await session.commit()
+    started = time.perf_counter()
+    recorder: TaskStatusRecorder = ctx["task_status"]  # type: ignore[typeddict-item]
+    recorder.record(
+        job.key,
+        enqueued_at=job_enqueued_at(job),
+        queue=job.queue.name if job.queue else "default",
+        task_name=job.function,
+        status=TaskStatus.ACTIVE,
+        started_at=datetime.now(UTC),
+    )
+    # queued/started are epoch ms; scheduled is epoch seconds.
+    ready_ms = max(job.queued, job.scheduled * 1000)
+    task_metrics.observe("saq_task_queue_wait_seconds", (job.started - ready_ms) / 1000, task=job.function)
+    task_metrics.observe("saq_task_hook_seconds", time.perf_counter() - started, hook="before_process")
 
 
 async def after_process(ctx: Context) -> None:
-    """Update the Task row with final status and completed_at after a job finishes."""
+    """Record the final status, completed_at, error and run time after a job finishes (buffered)."""
     job = ctx.get("job")
     if job is None:
         return
-    sessionmaker: async_sessionmaker = ctx["db_sessionmaker"]  # type: ignore[assignment]
-    now = datetime.now(UTC)
-    final_status = _SAQ_STATUS_MAP.get(job.status, TaskStatus.COMPLETE)
-    error_text = job.error if job.error else None
-    async with sessionmaker() as session:
-        result = await session.execute(select(Task).where(Task.job_key == job.key))
-        task = result.scalar_one_or_none()
-        if task is None:
-            task = Task(
-                job_key=job.key,
-                queue=job.queue.name if job.queue else "default",
-                task_name=job.function,
-                status=final_status,
-                completed_at=now,
-                error=error_text,
-            )
-            session.add(task)
-        else:
-            task.status = final_status
-            task.completed_at = now
-            task.error = error_text
-        await session.commit()
-
+    started = time.perf_counter()
+    recorder: TaskStatusRecorder = ctx["task_status"]  # type: ignore[typeddict-item]
+    recorder.record(
+        job.key,
+        enqueued_at=job_enqueued_at(job),
+        queue=job.queue.name if job.queue else "default",
+        task_name=job.function,
+        status=_SAQ_STATUS_MAP.get(job.status, TaskStatus.COMPLETE),
+        completed_at=datetime.now(UTC),
+        error=job.error if job.error else None,
+    )
+    if job.started:
+        task_metrics.observe("saq_task_run_seconds", ((job.completed or now()) - job.started) / 1000, task=job.function)
+    if final_status := _SAQ_STATUS_MAP.get(job.status):
+        task_metrics.inc("saq_tasks_total", task=job.function, status=final_status.value)
+    else:
+        # A job that will be retried is already back in QUEUED when this hook runs.
+        task_metrics.inc("saq_task_retries_total", task=job.function)
+    task_metrics.observe("saq_task_hook_seconds", time.perf_counter() - started, hook="after_process")
 
-# Trigger @task decorator registration across all tasks.py files
-discover_and_import(["tasks.py"], base_path="app")
 
+# Imports every tasks.py so their @task decorators have registered.
 registry = get_registry()
 
 
 def get_queue_config() -> list[QueueConfig]:
+    """One QueueConfig (and so one worker) per lane that has tasks, sized from QUEUE_SPECS."""
     return [
         QueueConfig(
-            name="default",
+            name=name,
             dsn=config.REDIS_URL,
-            tasks=registry.get_all_tasks(),
-            scheduled_tasks=registry.get_all_scheduled_tasks(),  # type: ignore[reportArgumentType]
+            tasks=registry.get_all_tasks(name),
+            scheduled_tasks=registry.get_all_scheduled_tasks(name),  # type: ignore[reportArgumentType]
             cron_tz=UTC,
             startup=cast(ReceivesContext, queue_startup),
             shutdown=cast(ReceivesContext, queue_shutdown),
             before_process=cast(ReceivesContext, before_process),
             after_process=cast(ReceivesContext, after_process),
-            concurrency=10,
-            shutdown_grace_period_s=30,
+            concurrency=spec.concurrency,
+            shutdown_grace_period_s=spec.shutdown_grace_period_s,
         )
+        for name, spec in QUEUE_SPECS.items()
+        if name in registry.get_queue_names()
     ]
 
 
@@ -0,0 +1,45 @@
+from typing import Any
+
+from saq import Job, Queue
+
+from app.queue.enums import TaskName
+from app.queue.registry import get_registry
+from app.queue.throttle import ThrottledError, admit, dedupe_key
+
+
+async def enqueue_task(
+    queue: Queue,
+    task_name: TaskName,
+    *,
+    idempotency_key: str | None = None,
+    raise_throttled: bool = False,
+    **kwargs: Any,
+) -> Job | None:
+    """Enqueue with the task's declared priority, timeout and throttling; explicit job kwargs win.
+
+    ``idempotency_key`` becomes the job key when the task has no key of its
+    own, so replaying the same dispatch is a no-op in SAQ. It does not take
+    part in coalescing or rate limiting.
+
+    Returns ``None`` when the dispatch was deduplicated, coalesced or rate
+    limited; with ``raise_throttled``, coalescing and rate limiting raise
+    ``ThrottledError`` instead, so the caller can retry later.
+    """
+    spec = get_registry().get_task_spec(task_name)
+    defaults: dict[str, Any] = {"priority": spec.priority, "timeout": spec.job_timeout}
+    if spec.dedupe and "key" not in kwargs:
+        task_kwargs = {k: v for k, v in kwargs.items() if k not in Job.__dataclass_fields__}
+        defaults["key"] = dedupe_key(spec.name, task_kwargs)
+
+    redis = getattr(queue, "redis", None)
+    if redis is not None and (spec.coalesce_s or spec.rate_limit):
+        key = kwargs.get("key") or defaults.get("key") or spec.name
+        try:
+            await admit(redis, spec.name, key, coalesce_s=spec.coalesce_s, rate_limit=spec.rate_limit)
+        except ThrottledError:
+            if raise_throttled:
+                raise
+            return None
+    if idempotency_key is not None:
+        defaults.setdefault("key", idempotency_key)
+    return await queue.enqueue(str(task_name), **{**defaults, **kwargs})
@@ -3,6 +3,17 @@ from enum import StrEnum, auto
 
 class TaskName(StrEnum):
     INGEST_COMPANY_DATA = auto()
+    INGEST_COMPANY_BATCH = auto()
+    INGEST_COMPANY_CHUNK = auto()
+    REFRESH_COMPANY_METRICS = auto()
+    RECOMPUTE_COMPANY_METRICS = auto()
+    MAINTAIN_TASK_PARTITIONS = auto()
+
+
+class QueueName(StrEnum):
+    DEFAULT = auto()
+    INTERACTIVE = auto()  # short, user-facing jobs
+    INGESTION = auto()  # long-running bulk work
 
 
 class TaskStatus(StrEnum):
@@ -0,0 +1,181 @@
+"""Per-task timing and throughput metrics in Prometheus text format.
+
+The queue hooks observe, per ``task_name``:
+
+- ``saq_task_queue_wait_seconds``: enqueue (or scheduled time) → start.
+- ``saq_task_run_seconds``: start → finish.
+- ``saq_task_hook_seconds``: time spent in the before/after process hooks.
+- ``saq_task_status_flush_seconds``: the status recorder's batched DB write.
+- ``saq_task_status_dropped_total``: status rows shed while the database was unreachable.
+- ``saq_tasks_total``: finished jobs by final status (complete, failed, aborted).
+- ``saq_task_retries_total``: failed attempts that were requeued for a retry.
+
+and, per worker process rather than per task, its DB connection pool:
+
+- ``saq_db_pool_checkout_wait_seconds``: queueing for a connection, connecting and pre-ping.
+- ``saq_db_pool_checkout_timeouts_total``: checkouts that gave up after the pool timeout.
+
+Every series is a monotonically increasing number keyed by its exposition
+line (``name{labels}``); histograms are stored as cumulative buckets. Workers
+usually run in their own processes, so each one adds its deltas into a shared
+Redis hash every ``flush_interval_s`` and ``GET /metrics`` on any web process
+renders the totals, plus whatever this process has not flushed yet.
+"""
+
+import asyncio
+import contextlib
+import logging
+import math
+import re
+from collections import defaultdict
+from collections.abc import Awaitable, Iterable, Mapping
+from typing import cast
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+BUCKETS_S = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 1800.0, math.inf)
+
+# name → (type, help)
+FAMILIES: dict[str, tuple[str, str]] = {
+    "saq_task_queue_wait_seconds": ("histogram", "Time from enqueue (or scheduled time) to start."),
+    "saq_task_run_seconds": ("histogram", "Time from start to finish."),
+    "saq_task_hook_seconds": ("histogram", "Time spent in queue before/after process hooks."),
+    "saq_task_status_flush_seconds": ("histogram", "Duration of batched task status writes."),
+    "saq_task_status_dropped_total": ("counter", "Task status rows dropped because the buffer was full."),
+    "saq_tasks_total": ("counter", "Finished jobs by final status."),
+    "saq_task_retries_total": ("counter", "Failed attempts requeued for a retry."),
+    "saq_db_pool_checkout_wait_seconds": ("histogram", "Time to check a connection out of a worker's DB pool."),
+    "saq_db_pool_checkout_timeouts_total": ("counter", "Worker DB pool checkouts that timed out."),
+}
+
+_REDIS_KEY = "queue:metrics"
+_SERIES = re.compile(r"^(\w+?)(_bucket|_sum|_count)?\{(.*)\}$")
+_LE = re.compile(r',?le="([^"]+)"')
+
+
+def _series(name: str, labels: Mapping[str, str]) -> str:
+    rendered = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    return f"{name}{{{rendered}}}"
+
+
+def _le(bound: float) -> str:
+    return "+Inf" if bound == math.inf else repr(bound)
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class TaskMetrics:
+    def __init__(self, *, redis_url: str, flush_interval_s: float = 5.0) -> None:
+        self.redis_url = redis_url
+        self.flush_interval_s = flush_interval_s
+        self._pending: defaultdict[str, float] = defaultdict(float)
+        self._redis: Redis | None = None
+        self._flusher: asyncio.Task[None] | None = None
+        self._stopped = asyncio.Event()
+
+    @property
+    def redis(self) -> Redis:
+        if self._redis is None:
+            self._redis = Redis.from_url(self.redis_url)
+        return self._redis
+
+    # ─── Recording ────────────────────────────────────────────────────────────
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        """Add one observation to histogram ``name``."""
+        seconds = max(seconds, 0.0)
+        for bound in BUCKETS_S:
+            if seconds <= bound:
+                self._pending[_series(f"{name}_bucket", {**labels, "le": _le(bound)})] += 1
+        self._pending[_series(f"{name}_sum", labels)] += seconds
+        self._pending[_series(f"{name}_count", labels)] += 1
+
+    def inc(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        self._pending[_series(name, labels)] += amount
+
+    # ─── Export ───────────────────────────────────────────────────────────────
+
+    async def flush(self) -> None:
+        """Add the pending deltas into the shared Redis totals."""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, defaultdict(float)
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for series, delta in batch.items():
+                    pipe.hincrbyfloat(_REDIS_KEY, series, delta)
+                await pipe.execute()
+        except RedisError:
+            logger.warning("Could not flush %d task metric series; retrying on next flush", len(batch), exc_info=True)
+            for series, delta in batch.items():
+                self._pending[series] += delta
+
+    async def render(self) -> str:
+        """Prometheus text exposition of the shared totals plus this process's unflushed deltas."""
+        totals: defaultdict[str, float] = defaultdict(float)
+        try:
+            stored = await cast(Awaitable[dict[bytes, bytes]], self.redis.hgetall(_REDIS_KEY))
+            for series, value in stored.items():
+                totals[series.decode()] += float(value)
+        except RedisError:
+            logger.warning("Could not read task metrics from Redis; rendering local values only", exc_info=True)
+        for series, delta in self._pending.items():
+            totals[series] += delta
+        return render_exposition(totals.items())
+
+    # ─── Lifecycle ────────────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        if self._flusher is None:
+            self._stopped.clear()
+            self._flusher = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the periodic flush, write out what is left and close the Redis connection."""
+        if self._flusher is not None:
+            self._stopped.set()
+            await self._flusher
+            self._flusher = None
+        await self.flush()
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def _run(self) -> None:
+        while not self._stopped.is_set():
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._stopped.wait(), timeout=self.flush_interval_s)
+            await self.flush()
+
+
+def render_exposition(series: Iterable[tuple[str, float]]) -> str:
+    """Group ``name{labels} value`` pairs into families with HELP/TYPE headers."""
+    families: defaultdict[str, list[tuple[str, float, str, float]]] = defaultdict(list)
+    for line, value in series:
+        match = _SERIES.match(line)
+        if match is None or match.group(1) not in FAMILIES:
+            continue
+        name, labels = match.group(1), match.group(3)
+        le = _LE.search(labels)
+        # Keep each label set's buckets together and in ascending order.
+        bound = float(le.group(1).replace("+Inf", "inf")) if le else math.inf
+        families[name].append((_LE.sub("", labels), bound, line, value))
+
+    lines: list[str] = []
+    for name in sorted(families):
+        kind, help_text = FAMILIES[name]
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for _, _, line, value in sorted(families[name], key=lambda entry: (entry[0], entry[1], entry[2])):
+            lines.append(f"{line} {_format(value)}")
+    return "\n".join(lines) + "\n"
+
+
+task_metrics = TaskMetrics(redis_url=config.REDIS_URL)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Any
 
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.base.mixins import TimestampMixin
@@ -11,18 +13,66 @@ from app.queue.enums import TaskStatus
 
 
 class TaskSchedule(TimestampMixin, BaseDBModel):
+    """A cron schedule for a registered task, picked up by running workers without a deploy.
+
+    See ``app.queue.schedules``. An ``H`` minute field is staggered per schedule.
+    """
+
     __tablename__ = "task_schedules"
 
+    task_name: Mapped[str] = mapped_column(sa.Text)
     cron: Mapped[str] = mapped_column(sa.Text)
+    kwargs: Mapped[dict[str, Any]] = mapped_column(JSONB, server_default=sa.text("'{}'::jsonb"))
+    enabled: Mapped[bool] = mapped_column(sa.Boolean, server_default=sa.true())
 
 
 class Task(TimestampMixin, BaseDBModel):
+    """Status history, one row per enqueued job.
+
+    Range-partitioned by day on ``created_at``, which is set to the job's
+    enqueue time so every write for a job lands on the same row; see
+    ``app.queue.partitions``.
+    """
+
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Unique constraints on a partitioned table must include the partition key.
+        sa.UniqueConstraint("job_key", "created_at", name="uq_tasks_job_key_created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    job_key: Mapped[str] = mapped_column(sa.Text, index=True, unique=True)
+    created_at: Mapped[datetime] = mapped_column(
+        sa.DateTime(timezone=True), primary_key=True, server_default=sa.func.now()
+    )
+    job_key: Mapped[str] = mapped_column(sa.Text, index=True)
     queue: Mapped[str] = mapped_column(sa.Text)
     task_name: Mapped[str] = mapped_column(sa.Text, index=True)
     status: Mapped[TaskStatus] = mapped_column(sa.Text)
     started_at: Mapped[datetime | None] = mapped_column(sa.DateTime(timezone=True))
     completed_at: Mapped[datetime | None] = mapped_column(sa.DateTime(timezone=True))
     error: Mapped[str | None] = mapped_column(sa.Text)
+
+    # Aggregate progress of fan-out jobs, advanced by their child jobs.
+    total_items: Mapped[int | None] = mapped_column(sa.Integer)
+    completed_items: Mapped[int] = mapped_column(sa.Integer, server_default="0")
+    failed_items: Mapped[int] = mapped_column(sa.Integer, server_default="0")
+
+
+class TaskOutbox(TimestampMixin, BaseDBModel):
+    """A dispatch recorded in the caller's transaction and enqueued by ``OutboxRelay`` once committed."""
+
+    __tablename__ = "task_outbox"
+    __table_args__ = (
+        sa.Index("ix_task_outbox_pending", "id", postgresql_where=sa.text("sent_at IS NULL AND dead_at IS NULL")),
+    )
+
+    task_name: Mapped[str] = mapped_column(sa.Text)
+    queue: Mapped[str] = mapped_column(sa.Text)
+    kwargs: Mapped[dict[str, Any]] = mapped_column(JSONB, server_default=sa.text("'{}'::jsonb"))
+    sent_at: Mapped[datetime | None] = mapped_column(sa.DateTime(timezone=True), index=True)
+    attempts: Mapped[int] = mapped_column(sa.Integer, server_default="0")
+    last_error: Mapped[str | None] = mapped_column(sa.Text)
+    # Not relayed before this time (backoff after a failure, or a throttled dispatch).
+    next_attempt_at: Mapped[datetime | None] = mapped_column(sa.DateTime(timezone=True))
+    # Set once attempts are exhausted; the row is kept for inspection and no longer relayed.
+    dead_at: Mapped[datetime | None] = mapped_column(sa.DateTime(timezone=True))
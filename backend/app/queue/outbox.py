@@ -0,0 +1,205 @@
+"""Relay from the ``task_outbox`` table to the SAQ queues.
+
+``dispatch_task`` only inserts an outbox row in the caller's transaction, so a
+job is dispatched only if the writes it belongs to were committed, and at
+least once when they were. The relay runs in every web process and drains
+due rows in batches:
+
+1. ``SELECT ... FOR UPDATE SKIP LOCKED`` claims up to ``batch_size`` rows, so
+   several relays share the backlog without handing out the same row twice.
+2. The batch is enqueued concurrently over each queue's Redis connection pool.
+   Every row is enqueued under the job key ``outbox:<id>`` (or the task's own
+   dedupe key). If the relay dies after enqueueing but before committing, the
+   replay is dropped by SAQ while the first job is still queued or running;
+   once that job has finished and expired, the replay runs it again. Delivery
+   is therefore at-least-once with best-effort dedupe, and tasks must tolerate
+   the occasional repeat.
+3. Enqueued rows get ``sent_at`` in the same transaction that claimed them.
+   Coalesced dispatches are settled the same way, since an identical job was
+   accepted moments ago; rate-limited ones are deferred until the bucket would
+   admit them, without using up an attempt. Failed rows record the error and
+   back off exponentially; after ``max_attempts`` they are dead-lettered
+   (``dead_at``) so a poison row stops taking batch slots. Dead rows are kept
+   for inspection; clearing ``dead_at`` and ``attempts`` requeues one.
+
+A commit that wrote outbox rows wakes the local relay immediately; rows
+written elsewhere (e.g. by queue workers) are picked up by the poll. Sent rows
+are deleted after ``retention_s``.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Callable
+from datetime import timedelta
+from typing import Any
+
+from saq import Queue
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import config
+from app.queue.enqueue import enqueue_task
+from app.queue.enums import TaskName
+from app.queue.models import TaskOutbox
+from app.queue.throttle import ThrottledError
+from app.utils.db import db_config
+
+logger = logging.getLogger(__name__)
+
+_PURGE_INTERVAL_S = 60.0
+
+
+class OutboxRelay:
+    def __init__(
+        self,
+        *,
+        redis_url: str,
+        batch_size: int = 500,
+        poll_interval_s: float = 1.0,
+        retention_s: int = 86400,
+        max_attempts: int = 10,
+        backoff_s: float = 1.0,
+        max_backoff_s: float = 300.0,
+    ) -> None:
+        self.redis_url = redis_url
+        self.batch_size = batch_size
+        self.poll_interval_s = poll_interval_s
+        self.retention_s = retention_s
+        self.max_attempts = max_attempts
+        self.backoff_s = backoff_s
+        self.max_backoff_s = max_backoff_s
+        self._sessionmaker: Callable[[], AsyncSession] | None = None
+        self._queues: dict[str, Queue] = {}
+        self._wake = asyncio.Event()
+        self._runner: asyncio.Task[None] | None = None
+        self._stopping = False
+        self._purged_at = 0.0
+
+    def wake(self) -> None:
+        """Drain now instead of at the next poll (called after a commit that wrote outbox rows)."""
+        self._wake.set()
+
+    def _queue(self, name: str) -> Queue:
+        queue = self._queues.get(name)
+        if queue is None:
+            queue = self._queues[name] = Queue.from_url(self.redis_url, name=name)
+        return queue
+
+    async def relay_batch(self, session: AsyncSession) -> int:
+        """Enqueue one batch of due rows within ``session``'s transaction. Returns the rows claimed."""
+        result = await session.execute(
+            select(TaskOutbox.id, TaskOutbox.task_name, TaskOutbox.queue, TaskOutbox.kwargs, TaskOutbox.attempts)
+            .where(
+                TaskOutbox.sent_at.is_(None),
+                TaskOutbox.dead_at.is_(None),
+                or_(TaskOutbox.next_attempt_at.is_(None), TaskOutbox.next_attempt_at <= func.now()),
+            )
+            .order_by(TaskOutbox.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        rows = result.all()
+        if not rows:
+            return 0
+
+        outcomes = await asyncio.gather(*(self._enqueue(*row[:4]) for row in rows), return_exceptions=True)
+
+        sent: list[int] = []
+        for (id_, task_name, _, _, attempts), outcome in zip(rows, outcomes, strict=True):
+            if not isinstance(outcome, BaseException) or (isinstance(outcome, ThrottledError) and outcome.coalesced):
+                sent.append(id_)
+                continue
+            values: dict[str, Any]
+            if isinstance(outcome, ThrottledError):
+                values = {"next_attempt_at": func.now() + timedelta(seconds=outcome.retry_after_s)}
+            elif attempts + 1 >= self.max_attempts:
+                logger.error(
+                    "Outbox row %d (%s) dead-lettered after %d attempts: %r", id_, task_name, attempts + 1, outcome
+                )
+                values = {"attempts": attempts + 1, "last_error": repr(outcome), "dead_at": func.now()}
+            else:
+                logger.warning("Outbox row %d (%s) could not be enqueued: %r", id_, task_name, outcome)
+                backoff_s = min(self.backoff_s * 2**attempts, self.max_backoff_s)
+                values = {
+                    "attempts": attempts + 1,
+                    "last_error": repr(outcome),
+                    "next_attempt_at": func.now() + timedelta(seconds=backoff_s),
+                }
+            await session.execute(
+                update(TaskOutbox).where(TaskOutbox.id == id_).values(**values, updated_at=func.now())
+            )
+        if sent:
+            await session.execute(
+                update(TaskOutbox)
+                .where(TaskOutbox.id.in_(sent))
+                .values(sent_at=func.now(), attempts=TaskOutbox.attempts + 1, updated_at=func.now())
+            )
+        return len(rows)
+
+    async def _enqueue(self, id_: int, task_name: str, queue: str, kwargs: dict[str, Any]) -> None:
+        await enqueue_task(
+            self._queue(queue), TaskName(task_name), idempotency_key=f"outbox:{id_}", raise_throttled=True, **kwargs
+        )
+
+    async def _purge(self, session: AsyncSession) -> None:
+        cutoff = func.now() - timedelta(seconds=self.retention_s)
+        await session.execute(delete(TaskOutbox).where(TaskOutbox.sent_at < cutoff))
+
+    async def drain(self) -> None:
+        """Relay batches until fewer than a full batch of rows is due."""
+        assert self._sessionmaker is not None
+        while True:
+            async with self._sessionmaker() as session, session.begin():
+                claimed = await self.relay_batch(session)
+                if time.monotonic() - self._purged_at >= _PURGE_INTERVAL_S:
+                    await self._purge(session)
+                    self._purged_at = time.monotonic()
+            if claimed < self.batch_size:
+                return
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval_s)
+            self._wake.clear()
+            try:
+                await self.drain()
+            except Exception:
+                logger.exception("Outbox relay cycle failed; retrying on next poll")
+
+    # ─── Lifecycle ────────────────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        """Start relaying (app startup hook)."""
+        if self._runner is None:
+            if self._sessionmaker is None:
+                self._sessionmaker = db_config.create_session_maker()
+            self._stopping = False
+            self._runner = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Finish the current cycle and close the queue connections (app shutdown hook).
+
+        Rows still pending stay in the table for the next process to relay.
+        """
+        if self._runner is not None:
+            self._stopping = True
+            self._wake.set()
+            await self._runner
+            self._runner = None
+        for queue in self._queues.values():
+            await queue.disconnect()
+        self._queues.clear()
+
+
+task_outbox = OutboxRelay(
+    redis_url=config.REDIS_URL,
+    batch_size=config.OUTBOX_BATCH_SIZE,
+    poll_interval_s=config.OUTBOX_POLL_INTERVAL_S,
+    retention_s=config.OUTBOX_RETENTION_S,
+    max_attempts=config.OUTBOX_MAX_ATTEMPTS,
+    backoff_s=config.OUTBOX_BACKOFF_S,
+    max_backoff_s=config.OUTBOX_MAX_BACKOFF_S,
+)
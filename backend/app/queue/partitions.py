@@ -0,0 +1,120 @@
+"""Daily partitions of the ``tasks`` history table.
+
+``tasks`` is range-partitioned on ``created_at`` into one ``tasks_pYYYYMMDD``
+table per UTC day, plus ``tasks_default`` for rows no daily partition covers.
+Keeping the current day in its own small partition keeps the status upserts
+and their indexes fast, and retention becomes a metadata-only ``DROP TABLE``
+instead of a bulk ``DELETE``.
+
+``maintain_partitions`` (run daily by the ``maintain_task_partitions`` task)
+creates partitions ``premake_days`` ahead and expires those older than the
+retention window. Expired partitions are dropped, or detached and renamed to
+``tasks_archive_pYYYYMMDD`` for export when archiving is enabled.
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, time, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PARTITION = "tasks_default"
+_PARTITION = re.compile(r"^tasks_p(\d{8})$")
+
+
+@dataclass(slots=True)
+class PartitionChanges:
+    created: list[str] = field(default_factory=list)
+    expired: list[str] = field(default_factory=list)
+
+
+def partition_name(day: date) -> str:
+    return f"tasks_p{day:%Y%m%d}"
+
+
+def _bounds(day: date) -> tuple[datetime, datetime]:
+    lower = datetime.combine(day, time.min, tzinfo=UTC)
+    return lower, lower + timedelta(days=1)
+
+
+async def list_partitions(session: AsyncSession) -> dict[str, date]:
+    """Attached daily partitions by name → day."""
+    result = await session.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'tasks'::regclass"
+        )
+    )
+    partitions: dict[str, date] = {}
+    for (name,) in result:
+        if match := _PARTITION.match(name):
+            partitions[name] = datetime.strptime(match.group(1), "%Y%m%d").date()
+    return partitions
+
+
+async def create_partition(session: AsyncSession, day: date) -> str:
+    """Create and attach the partition for ``day``.
+
+    Rows for that day that already fell into the default partition are moved
+    over first, since attaching fails while the default holds rows in range.
+    """
+    name = partition_name(day)
+    lower, upper = _bounds(day)
+    await session.execute(text(f"CREATE TABLE {name} (LIKE tasks INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    await session.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            "WHERE created_at >= :lower AND created_at < :upper RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ),
+        {"lower": lower, "upper": upper},
+    )
+    # Partition bounds must be literals; they are derived from a date, never from input.
+    await session.execute(
+        text(
+            f"ALTER TABLE tasks ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+    )
+    return name
+
+
+async def expire_partition(session: AsyncSession, name: str, *, archive: bool) -> None:
+    if archive:
+        await session.execute(text(f"ALTER TABLE tasks DETACH PARTITION {name}"))
+        await session.execute(text(f"ALTER TABLE {name} RENAME TO {name.replace('tasks_p', 'tasks_archive_p', 1)}"))
+    else:
+        await session.execute(text(f"DROP TABLE {name}"))
+
+
+async def maintain_partitions(
+    session: AsyncSession,
+    *,
+    retention_days: int,
+    premake_days: int,
+    archive: bool = False,
+    today: date | None = None,
+) -> PartitionChanges:
+    """Roll partitions forward to ``today + premake_days`` and expire those past ``retention_days``."""
+    today = today or datetime.now(UTC).date()
+    cutoff = today - timedelta(days=retention_days)
+    existing = await list_partitions(session)
+    changes = PartitionChanges()
+
+    wanted = {today + timedelta(days=offset) for offset in range(premake_days + 1)}
+    for day in sorted(wanted - set(existing.values())):
+        changes.created.append(await create_partition(session, day))
+
+    for name, day in sorted(existing.items(), key=lambda item: item[1]):
+        if day < cutoff:
+            await expire_partition(session, name, archive=archive)
+            changes.expired.append(name)
+
+    if not archive:
+        # Expired stragglers that landed in the default partition (e.g. from days maintenance missed).
+        await session.execute(
+            text(f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at < :cutoff"),
+            {"cutoff": _bounds(cutoff)[0]},
+        )
+    return changes
@@ -0,0 +1,52 @@
+"""Aggregate progress for fan-out jobs.
+
+A parent job splits its work into child jobs and records the item count on
+its own ``tasks`` row. Each child passes the parent's job key along and
+advances the parent's counters with a single atomic ``UPDATE``, so progress
+is exact no matter how many children finish at once.
+"""
+
+from saq.job import Job
+from sqlalchemy import func, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.queue.enums import TaskStatus
+from app.queue.models import Task
+from app.queue.status import job_enqueued_at
+
+
+async def set_task_total(session: AsyncSession, job: Job, total: int) -> None:
+    """Start counting ``total`` items for ``job``.
+
+    An upsert, because the job's own status row may still be buffered in the
+    TaskStatusRecorder; the recorder's later write leaves these columns alone.
+    """
+    progress = {"total_items": total, "completed_items": 0, "failed_items": 0}
+    stmt = insert(Task).values(
+        job_key=job.key,
+        created_at=job_enqueued_at(job),
+        queue=job.queue.name if job.queue else "default",
+        task_name=job.function,
+        status=TaskStatus.ACTIVE,
+        **progress,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Task.job_key, Task.created_at], set_={**progress, "updated_at": func.now()}
+    )
+    await session.execute(stmt)
+
+
+async def advance_task_progress(session: AsyncSession, job_key: str, *, completed: int = 0, failed: int = 0) -> None:
+    await session.execute(
+        update(Task)
+        .where(Task.job_key == job_key)
+        .values(completed_items=Task.completed_items + completed, failed_items=Task.failed_items + failed)
+    )
+
+
+async def record_task_failure(sessionmaker: async_sessionmaker[AsyncSession], job_key: str, failed: int) -> None:
+    """Count failed items in their own transaction, since the child's transaction is being rolled back."""
+    async with sessionmaker() as session:
+        await advance_task_progress(session, job_key, failed=failed)
+        await session.commit()
@@ -0,0 +1,37 @@
+"""Queue topology: one SAQ queue (and worker) per lane.
+
+Each lane has its own concurrency, so long ingestion jobs can only ever
+occupy the ingestion workers and never delay interactive ones. Tasks pick
+their lane with ``@task(..., queue=...)``.
+"""
+
+from dataclasses import dataclass
+
+from app.config import config
+from app.queue.enums import QueueName
+
+
+@dataclass(frozen=True, slots=True)
+class QueueSpec:
+    concurrency: int
+    job_timeout_s: int  # default for tasks that don't set their own
+    shutdown_grace_period_s: int
+
+
+QUEUE_SPECS: dict[str, QueueSpec] = {
+    QueueName.DEFAULT: QueueSpec(
+        concurrency=config.WORKER_CONCURRENCY,
+        job_timeout_s=60,
+        shutdown_grace_period_s=30,
+    ),
+    QueueName.INTERACTIVE: QueueSpec(
+        concurrency=config.INTERACTIVE_QUEUE_CONCURRENCY,
+        job_timeout_s=30,
+        shutdown_grace_period_s=15,
+    ),
+    QueueName.INGESTION: QueueSpec(
+        concurrency=config.INGESTION_QUEUE_CONCURRENCY,
+        job_timeout_s=1800,
+        shutdown_grace_period_s=120,
+    ),
+}
@@ -1,3 +1,4 @@
+import hashlib
 import inspect
 from collections.abc import Callable
 from dataclasses import dataclass, field
@@ -7,53 +8,168 @@ from typing import Any
 from saq import CronJob
 from saq.types import Function
 
+from app.queue.enums import QueueName
+from app.queue.queues import QUEUE_SPECS
+from app.queue.throttle import RateLimit
+from app.queue.types import AppContext
+from app.utils.discovery import discover_and_import
+
+_CONTEXT_KEYS = AppContext.__required_keys__ | AppContext.__optional_keys__
+
+
+@dataclass(frozen=True, slots=True)
+class TaskSpec:
+    """Where and how a task's jobs are enqueued.
+
+    ``priority`` follows SAQ: lower runs first. Only the Postgres broker orders
+    by it; on Redis, lanes come from the queue assignment alone. ``timeout``
+    of ``None`` means the queue's default job timeout. ``dedupe``,
+    ``coalesce_s`` and ``rate_limit`` are described in ``app.queue.throttle``.
+    """
+
+    name: str
+    queue: str = QueueName.DEFAULT
+    priority: int = 0
+    timeout: int | None = None
+    dedupe: bool = False
+    coalesce_s: int | None = None
+    rate_limit: RateLimit | None = None
+
+    @property
+    def job_timeout(self) -> int:
+        return self.timeout if self.timeout is not None else QUEUE_SPECS[self.queue].job_timeout_s
+
 
 @dataclass
 class TaskRegistry:
-    _tasks: list[Function] = field(default_factory=list)
+    _tasks: dict[str, Function] = field(default_factory=dict)
     _scheduled_tasks: list[CronJob] = field(default_factory=list)
+    _specs: dict[str, TaskSpec] = field(default_factory=dict)
 
-    def get_all_tasks(self) -> list[Function]:
-        return list(self._tasks)
+    def get_all_tasks(self, queue: str | None = None) -> list[Function]:
+        return [t for name, t in self._tasks.items() if queue is None or self._specs[name].queue == queue]
 
-    def get_all_scheduled_tasks(self) -> list[CronJob]:
-        return list(self._scheduled_tasks)
+    def get_all_scheduled_tasks(self, queue: str | None = None) -> list[CronJob]:
+        return [
+            job
+            for job in self._scheduled_tasks
+            if queue is None or self.get_task_spec(job.function.__qualname__).queue == queue
+        ]
 
     def get_task_by_name(self, name: str) -> Callable[..., Any] | None:
-        return next((t for t in self._tasks if t.__name__ == str(name)), None)
+        return self._tasks.get(str(name))
+
+    def get_task_spec(self, name: str) -> TaskSpec:
+        """Spec of a registered task; unknown names get the default queue."""
+        return self._specs.get(str(name)) or TaskSpec(str(name))
+
+    def get_queue_names(self) -> set[str]:
+        return {spec.queue for spec in self._specs.values()}
 
 
 _registry = TaskRegistry()
+_discovered = False
 
 
 def get_registry() -> TaskRegistry:
+    """The task registry, importing every ``tasks.py`` on first use so their ``@task`` decorators have run.
+
+    Task modules pull in the services they call, so processes that never
+    enqueue or run a task (migrations, scripts) do not pay for importing them.
+    """
+    global _discovered
+    if not _discovered:
+        _discovered = True
+        discover_and_import(["tasks.py"], base_path="app")
     return _registry
 
 
-def task(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+def _injection_plan(fn: Callable[..., Any]) -> tuple[str, ...]:
+    """Context keys the task accepts as keyword arguments, resolved once at decoration time.
+
+    The leading ``ctx`` parameter, ``*args``/``**kwargs`` and parameters that
+    are not context keys (job kwargs, ``transaction``) are left out.
+    """
+    # Unwrap decorator stack to inspect the real signature.
+    params = list(inspect.signature(inspect.unwrap(fn)).parameters.values())[1:]
+    return tuple(
+        param.name
+        for param in params
+        if param.kind in (param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY) and param.name in _CONTEXT_KEYS
+    )
+
+
+def task(
+    name: str,
+    *,
+    queue: str = QueueName.DEFAULT,
+    priority: int = 0,
+    timeout: int | None = None,
+    dedupe: bool = False,
+    coalesce_s: int | None = None,
+    rate_limit: RateLimit | None = None,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
     def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
-        # Unwrap decorator stack to inspect the real signature.
-        original = inspect.unwrap(fn)
-        injectable = set(inspect.signature(original).parameters)
+        if str(name) in _registry._tasks:
+            raise ValueError(f"Task {name!r} is already registered")
+        if str(queue) not in QUEUE_SPECS:
+            raise ValueError(f"Task {name!r} assigned to undeclared queue {queue!r}")
+        inject = _injection_plan(fn)
 
         @wraps(fn)
         async def wrapper(ctx: Any, **kwargs: Any) -> Any:
-            for key in injectable:
+            for key in inject:
                 if key not in kwargs and key in ctx:
                     kwargs[key] = ctx[key]
             return await fn(ctx, **kwargs)
 
         wrapper.__name__ = str(name)  # SAQ looks up tasks by __qualname__
         wrapper.__qualname__ = str(name)
-        _registry._tasks.append(wrapper)
+        _registry._tasks[str(name)] = wrapper
+        _registry._specs[str(name)] = TaskSpec(
+            str(name),
+            str(queue),
+            priority,
+            timeout,
+            # A coalescing window implies identical dispatches are redundant.
+            dedupe=dedupe or coalesce_s is not None,
+            coalesce_s=coalesce_s,
+            rate_limit=rate_limit,
+        )
         return wrapper
 
     return decorator
 
 
+def stagger_cron(cron: str, seed: str) -> str:
+    """Resolve an ``H`` minute field to a stable per-``seed`` minute.
+
+    ``H 4 * * *`` runs once between 04:00 and 04:59 and ``H/15 * * * *`` every
+    15 minutes from a per-seed offset, so heavy schedules written the same way
+    spread across the hour instead of all firing at :00.
+    """
+    minute, *rest = cron.split()
+    if minute != "H" and not minute.startswith("H/"):
+        return cron
+    offset = int.from_bytes(hashlib.blake2s(seed.encode(), digest_size=4).digest()) % 60
+    if minute == "H":
+        minute = str(offset)
+    else:
+        step = int(minute.removeprefix("H/"))
+        minute = f"{offset % step}-59/{step}"
+    return " ".join((minute, *rest))
+
+
 def scheduled_task(cron: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Run a task on a cron schedule. Apply above ``@task`` so the job inherits its queue and timeout.
+
+    An ``H`` minute field is staggered by task name; see ``stagger_cron``.
+    """
+
     def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
-        _registry._scheduled_tasks.append(CronJob(function=fn, cron=cron))
+        spec = _registry.get_task_spec(fn.__qualname__)
+        cron_job = CronJob(function=fn, cron=stagger_cron(cron, spec.name), timeout=spec.job_timeout)
+        _registry._scheduled_tasks.append(cron_job)
         return fn
 
     return decorator
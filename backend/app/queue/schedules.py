@@ -0,0 +1,150 @@
+"""DB-defined cron schedules (``task_schedules`` rows), hot-reloaded by each worker.
+
+``@scheduled_task`` schedules are fixed at deploy time. Rows in
+``task_schedules`` name a registered task, a cron expression and the task's
+kwargs; every worker runs a ``ScheduleSync`` for the rows whose task belongs
+to its lane. It works like SAQ's own cron loop: the next occurrence of each
+schedule is enqueued ahead of time under a fixed job key, so repeated ticks
+and other replicas of the same worker are no-ops while it is pending.
+
+Rows are re-read every ``reload_interval_s``. The job key embeds a digest of
+the schedule, so an edited schedule gets a fresh key, and the run queued under
+the old definition is aborted. Disabled or deleted rows are aborted the same
+way. The first reload after a worker starts has no previous definitions to
+compare against, so it instead scans the queue and aborts every pending
+``schedule:*`` job whose key is not among the loaded schedules, i.e. runs left
+behind by rows edited or removed while no worker was syncing.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import logging
+from dataclasses import dataclass
+from datetime import UTC, datetime, tzinfo
+from typing import Any
+
+import msgspec
+from croniter import croniter
+from saq import Queue
+from saq.job import Status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.queue.models import TaskSchedule
+from app.queue.registry import get_registry, stagger_cron
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class _Schedule:
+    key: str
+    task_name: str
+    cron: str
+    kwargs: dict[str, Any]
+
+
+class ScheduleSync:
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        queue: Queue,
+        *,
+        reload_interval_s: float = 30.0,
+        tick_s: float = 1.0,
+        tz: tzinfo = UTC,
+    ) -> None:
+        self.sessionmaker = sessionmaker
+        self.queue = queue
+        self.reload_interval_s = reload_interval_s
+        self.tick_s = tick_s
+        self.tz = tz
+        self._schedules: dict[int, _Schedule] = {}
+        self._loaded = False
+        self._runner: asyncio.Task[None] | None = None
+
+    async def reload(self) -> None:
+        """Re-read ``task_schedules`` and abort pending runs of schedules that changed or went away."""
+        async with self.sessionmaker() as session:
+            result = await session.execute(
+                select(TaskSchedule).where(TaskSchedule.enabled.is_(True), TaskSchedule.deleted_at.is_(None))
+            )
+            rows = result.scalars().all()
+
+        registry = get_registry()
+        schedules: dict[int, _Schedule] = {}
+        for row in rows:
+            if registry.get_task_by_name(row.task_name) is None:
+                logger.warning("Task schedule %d names unknown task %r; skipping", row.id, row.task_name)
+                continue
+            if registry.get_task_spec(row.task_name).queue != self.queue.name:
+                continue
+            cron = stagger_cron(row.cron, f"schedule:{row.id}")
+            if not croniter.is_valid(cron):
+                logger.warning("Task schedule %d has invalid cron %r; skipping", row.id, row.cron)
+                continue
+            digest = hashlib.blake2s(
+                msgspec.json.encode([row.task_name, cron, row.kwargs], order="sorted"), digest_size=6
+            ).hexdigest()
+            schedules[row.id] = _Schedule(f"schedule:{row.id}:{digest}", row.task_name, cron, row.kwargs)
+
+        if not self._loaded:
+            await self._abort_orphans({schedule.key for schedule in schedules.values()})
+            self._loaded = True
+        stale = [schedule for id_, schedule in self._schedules.items() if schedules.get(id_) != schedule]
+        for schedule in stale:
+            await self._abort(schedule)
+        if stale or schedules.keys() != self._schedules.keys():
+            logger.info("Loaded %d task schedules for queue %s", len(schedules), self.queue.name)
+        self._schedules = schedules
+
+    async def _abort(self, schedule: _Schedule) -> None:
+        job = await self.queue.job(schedule.key)
+        if job is not None and job.status in (Status.NEW, Status.QUEUED):
+            await self.queue.abort(job, "schedule changed")
+
+    async def _abort_orphans(self, keys: set[str]) -> None:
+        """Abort pending ``schedule:*`` jobs on this queue whose key is not in ``keys``."""
+        async for job in self.queue.iter_jobs([Status.NEW, Status.QUEUED]):
+            if job.key.startswith("schedule:") and job.key not in keys:
+                await self.queue.abort(job, "schedule changed")
+
+    async def schedule(self) -> None:
+        """Enqueue the next occurrence of every schedule that has none pending."""
+        registry = get_registry()
+        now = datetime.now(self.tz)
+        for schedule in self._schedules.values():
+            spec = registry.get_task_spec(schedule.task_name)
+            await self.queue.enqueue(
+                schedule.task_name,
+                key=schedule.key,
+                scheduled=int(croniter(schedule.cron, now).get_next()),
+                priority=spec.priority,
+                timeout=spec.job_timeout,
+                kwargs=schedule.kwargs,
+            )
+
+    async def _run(self) -> None:
+        reloaded_at = float("-inf")
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                if loop.time() - reloaded_at >= self.reload_interval_s:
+                    reloaded_at = loop.time()
+                    await self.reload()
+                await self.schedule()
+            except Exception:
+                logger.exception("Task schedule sync failed; retrying")
+            await asyncio.sleep(self.tick_s)
+
+    def start(self) -> None:
+        if self._runner is None:
+            self._runner = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            self._runner.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._runner
+            self._runner = None
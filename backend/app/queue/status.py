@@ -0,0 +1,177 @@
+"""Buffered writer for ``tasks`` status rows.
+
+The SAQ hooks call ``record()``, which only updates an in-memory buffer keyed
+by job key. Successive transitions of the same job merge into one pending
+row, e.g. a short job's ACTIVE and COMPLETE usually land in the same flush.
+The buffer is written as a single multi-row ``INSERT ... ON CONFLICT (job_key,
+created_at) DO UPDATE`` every ``flush_interval_s``, or as soon as ``max_pending`` jobs are
+waiting, so the per-job cost is a dict update instead of a database round-trip.
+
+Each flush is written in chunks that stay under asyncpg's bind-parameter
+limit, each committed on its own, so a failure requeues only the rows that
+were not written. While the database is unreachable the buffer is capped at
+``max_buffered`` jobs; beyond that the oldest rows are shed (and counted in
+``saq_task_status_dropped_total``) rather than growing without bound. A shed
+row only loses the job's status history; the job itself is unaffected.
+
+``stop()`` flushes whatever is left, so it must run in the queue shutdown
+hook before the engine is disposed.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from itertools import batched, islice
+
+from saq.job import Job
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.queue.enums import TaskStatus
+from app.queue.metrics import task_metrics
+from app.queue.models import Task
+
+logger = logging.getLogger(__name__)
+
+# asyncpg caps a statement at 32767 bind parameters.
+_MAX_BIND_PARAMS = 32767
+
+
+@dataclass(slots=True)
+class _PendingStatus:
+    job_key: str
+    created_at: datetime
+    queue: str
+    task_name: str
+    status: TaskStatus
+    started_at: datetime | None = None
+    completed_at: datetime | None = None
+    error: str | None = None
+
+    def merge(self, newer: "_PendingStatus") -> None:
+        self.status = newer.status
+        self.started_at = newer.started_at or self.started_at
+        self.completed_at = newer.completed_at
+        self.error = newer.error
+
+
+def job_enqueued_at(job: Job) -> datetime:
+    """The job's ``tasks.created_at``: its enqueue time, which is fixed for the job's lifetime (SAQ stores ms)."""
+    return datetime.fromtimestamp(job.queued / 1000, UTC) if job.queued else datetime.now(UTC)
+
+
+class TaskStatusRecorder:
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        *,
+        flush_interval_s: float = 0.25,
+        max_pending: int = 500,
+        max_buffered: int = 50_000,
+    ) -> None:
+        self.sessionmaker = sessionmaker
+        self.flush_interval_s = flush_interval_s
+        self.max_pending = max_pending
+        self.max_buffered = max_buffered
+        self._pending: dict[str, _PendingStatus] = {}
+        self._flush_now = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._flusher: asyncio.Task[None] | None = None
+        self._stopping = False
+
+    def record(
+        self,
+        job_key: str,
+        *,
+        enqueued_at: datetime,
+        queue: str,
+        task_name: str,
+        status: TaskStatus,
+        started_at: datetime | None = None,
+        completed_at: datetime | None = None,
+        error: str | None = None,
+    ) -> None:
+        update = _PendingStatus(job_key, enqueued_at, queue, task_name, status, started_at, completed_at, error)
+        pending = self._pending.get(job_key)
+        if pending is None:
+            self._pending[job_key] = update
+        else:
+            pending.merge(update)
+        if len(self._pending) >= self.max_pending:
+            self._flush_now.set()
+
+    async def flush(self) -> None:
+        async with self._lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+            rows = [asdict(pending) for pending in batch.values()]
+            written = 0
+            try:
+                for chunk in batched(rows, _MAX_BIND_PARAMS // len(rows[0])):
+                    await self._write(chunk)
+                    written += len(chunk)
+            except Exception:
+                logger.exception(
+                    "Failed to write %d of %d task status rows; retrying on next flush", len(rows) - written, len(rows)
+                )
+                self._requeue(dict(islice(batch.items(), written, None)))
+
+    def _requeue(self, unwritten: dict[str, _PendingStatus]) -> None:
+        """Put ``unwritten`` back ahead of newer transitions, shedding the oldest jobs beyond ``max_buffered``."""
+        for job_key, newer in self._pending.items():
+            if job_key in unwritten:
+                unwritten[job_key].merge(newer)
+            else:
+                unwritten[job_key] = newer
+        if (excess := len(unwritten) - self.max_buffered) > 0:
+            logger.warning("Task status buffer full; dropping the %d oldest job statuses", excess)
+            task_metrics.inc("saq_task_status_dropped_total", excess)
+            unwritten = dict(islice(unwritten.items(), excess, None))
+        self._pending = unwritten
+
+    async def _write(self, rows: tuple[dict[str, object], ...]) -> None:
+        stmt = insert(Task).values(list(rows))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Task.job_key, Task.created_at],
+            set_={
+                "status": stmt.excluded.status,
+                "started_at": func.coalesce(stmt.excluded.started_at, Task.started_at),
+                "completed_at": stmt.excluded.completed_at,
+                "error": stmt.excluded.error,
+                "updated_at": func.now(),
+            },
+        )
+        started = time.perf_counter()
+        async with self.sessionmaker() as session:
+            await session.execute(stmt)
+            await session.commit()
+        task_metrics.observe("saq_task_status_flush_seconds", time.perf_counter() - started)
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._flush_now.wait(), timeout=self.flush_interval_s)
+            self._flush_now.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        if self._flusher is None:
+            self._stopping = False
+            self._flusher = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the periodic flush and write out everything still buffered.
+
+        The flusher is signalled rather than cancelled so an in-flight write is never cut off.
+        """
+        if self._flusher is not None:
+            self._stopping = True
+            self._flush_now.set()
+            await self._flusher
+            self._flusher = None
+        await self.flush()
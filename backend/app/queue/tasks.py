@@ -0,0 +1,27 @@
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import config
+from app.queue.enums import QueueName, TaskName
+from app.queue.partitions import maintain_partitions
+from app.queue.registry import scheduled_task, task
+from app.queue.transactions import with_transaction
+from app.queue.types import AppContext
+
+logger = logging.getLogger(__name__)
+
+
+@scheduled_task("5 0 * * *")
+@task(TaskName.MAINTAIN_TASK_PARTITIONS, queue=QueueName.INGESTION)
+@with_transaction
+async def maintain_task_partitions(ctx: AppContext, *, transaction: AsyncSession) -> int:
+    """Create upcoming daily ``tasks`` partitions and expire old ones. Returns the partitions changed."""
+    changes = await maintain_partitions(
+        transaction,
+        retention_days=config.TASK_HISTORY_RETENTION_DAYS,
+        premake_days=config.TASK_HISTORY_PREMAKE_DAYS,
+        archive=config.TASK_HISTORY_ARCHIVE,
+    )
+    logger.info("Task history partitions: created %s, expired %s", changes.created, changes.expired)
+    return len(changes.created) + len(changes.expired)
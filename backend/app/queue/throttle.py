@@ -0,0 +1,105 @@
+"""Dispatch-side deduplication and rate limiting.
+
+Three layers, each opt-in per task through ``@task(...)``, drop redundant
+work before it reaches a worker:
+
+1. ``dedupe``: the job key is derived from the task name and its kwargs, so
+   SAQ refuses a second identical job while the first is still queued or
+   running.
+2. ``coalesce_s``: an identical dispatch within this many seconds of the last
+   accepted one is dropped, even if that job already finished.
+3. ``rate_limit``: a Redis token bucket per task caps the enqueue rate across
+   every web process and worker.
+
+State lives on the queue's own Redis connection. Brokers without one
+(Postgres) get the job-key dedupe only.
+"""
+
+import hashlib
+import logging
+from collections.abc import Awaitable, Mapping
+from dataclasses import dataclass
+from typing import Any, cast
+
+import msgspec
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] bucket; ARGV[1] tokens per second, ARGV[2] burst. Returns 1 if a token was taken.
+_TOKEN_BUCKET = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return allowed
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimit:
+    per_second: float
+    burst: int = 1
+
+
+def dedupe_key(task_name: str, kwargs: Mapping[str, Any]) -> str:
+    """Deterministic job key: the same task with the same kwargs always maps to the same key."""
+    digest = hashlib.blake2s(msgspec.json.encode(kwargs, order="sorted"), digest_size=12).hexdigest()
+    return f"{task_name}:{digest}"
+
+
+class ThrottledError(Exception):
+    """A dispatch refused by coalescing or rate limiting; it would be admitted again after ``retry_after_s``."""
+
+    def __init__(self, key: str, reason: str, retry_after_s: float) -> None:
+        super().__init__(f"{reason} dispatch of {key}; retry after {retry_after_s:g}s")
+        self.key = key
+        self.reason = reason
+        self.retry_after_s = retry_after_s
+
+    @property
+    def coalesced(self) -> bool:
+        """Refused as redundant with a recent identical dispatch, rather than by the rate limit."""
+        return self.reason == "Coalesced"
+
+
+async def admit(
+    redis: Redis,
+    task_name: str,
+    key: str,
+    *,
+    coalesce_s: int | None,
+    rate_limit: RateLimit | None,
+) -> None:
+    """Raise ``ThrottledError`` if a dispatch should not be enqueued. Fails open if Redis is unavailable."""
+    coalesce_key = f"throttle:coalesce:{key}"
+    try:
+        if coalesce_s and not await redis.set(coalesce_key, 1, nx=True, ex=coalesce_s):
+            logger.debug("Coalesced dispatch of %s", key)
+            ttl = await redis.ttl(coalesce_key)
+            raise ThrottledError(key, "Coalesced", ttl if ttl > 0 else coalesce_s)
+        if rate_limit is not None:
+            allowed = await cast(
+                Awaitable[int],
+                redis.eval(_TOKEN_BUCKET, 1, f"throttle:bucket:{task_name}", rate_limit.per_second, rate_limit.burst),
+            )
+            if not allowed:
+                # Nothing was enqueued, so don't let the window swallow the next attempt.
+                if coalesce_s:
+                    await redis.delete(coalesce_key)
+                logger.info("Rate limited dispatch of %s", key)
+                raise ThrottledError(key, "Rate limited", 1 / rate_limit.per_second)
+    except RedisError:
+        logger.warning("Dispatch throttle unavailable; enqueueing %s unthrottled", key, exc_info=True)
@@ -1,15 +1,19 @@
-import asyncio
 from collections.abc import AsyncGenerator, Callable
 from contextlib import asynccontextmanager
 from functools import wraps
 from typing import Any
 
-from litestar import Request
+from saq import Job, Queue
 from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.queue.exceptions import CommittableTaskError
+from app.queue.enqueue import enqueue_task
 from app.queue.enums import TaskName
+from app.queue.exceptions import CommittableTaskError
+from app.queue.models import TaskOutbox
+from app.queue.outbox import task_outbox
+from app.queue.registry import get_registry
+from app.queue.types import AppContext
 
 
 @asynccontextmanager
@@ -49,15 +53,44 @@ def with_transaction(fn: Callable[..., Any]) -> Callable[..., Any]:
 
 async def dispatch_task(
     transaction: AsyncSession,
-    request: Request,
     task_name: TaskName,
     *,
-    queue: str = "default",
+    queue: str | None = None,
     **kwargs: Any,
 ) -> None:
-    """Enqueue a task after the current session commits."""
+    """Record a task in the outbox as part of ``transaction``; it is enqueued once the transaction commits.
+
+    The row commits or rolls back with the caller's writes, and ``OutboxRelay``
+    enqueues it afterwards, so a crash or deploy between commit and enqueue
+    delays the job instead of losing it. ``kwargs`` must be JSON-serializable.
+    """
+    transaction.add(
+        TaskOutbox(
+            task_name=str(task_name),
+            queue=queue or get_registry().get_task_spec(task_name).queue,
+            kwargs=kwargs,
+        )
+    )
 
     def _listener(_session: Any) -> None:
-        asyncio.ensure_future(request.app.state.task_queues.get(queue).enqueue(task_name, **kwargs))
+        task_outbox.wake()
 
     event.listen(transaction.sync_session, "after_commit", _listener, once=True)
+
+
+_worker_queues: dict[str, Queue] = {}
+
+
+async def enqueue_from_worker(ctx: AppContext, task_name: TaskName, **kwargs: Any) -> Job | None:
+    """Enqueue from inside a job, routed like ``dispatch_task``.
+
+    A worker only holds its own queue, so handles to the other lanes are
+    opened on first use and kept for the life of the process.
+    """
+    name = get_registry().get_task_spec(task_name).queue
+    queue = ctx["queue"]
+    if queue.name != name:
+        queue = _worker_queues.get(name)
+        if queue is None:
+            queue = _worker_queues[name] = Queue.from_url(ctx["config"].REDIS_URL, name=name)
+    return await enqueue_task(queue, task_name, **kwargs)
@@ -1,12 +1,17 @@
 """Typed AppContext for SAQ tasks."""
 
-from typing import Required
+from typing import TYPE_CHECKING, Required
 
 from saq.queue import Queue
 from saq.types import Context
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
 from app.config import Config
+from app.queue.status import TaskStatusRecorder
+
+if TYPE_CHECKING:
+    # schedules → registry → types; only needed for the annotation.
+    from app.queue.schedules import ScheduleSync
 
 
 class AppContext(Context):
@@ -14,3 +19,5 @@ class AppContext(Context):
     db_sessionmaker: Required[async_sessionmaker[AsyncSession]]
     config: Required[Config]
     queue: Required[Queue]
+    task_status: Required[TaskStatusRecorder]
+    schedules: Required["ScheduleSync"]
@@ -0,0 +1,267 @@
+"""Two-tier byte cache: an in-process LRU with TTL in front of Redis.
+
+Values are opaque bytes (typically pre-encoded JSON), so a warm hit is a dict
+lookup with no database access and no serialization. Misses fall through to
+Redis, which is shared by every web process, and then to the caller's loader.
+
+Invalidation deletes the Redis entries and publishes the keys on a pub/sub
+channel; every process running ``start()`` evicts them from its local tier.
+It also bumps a per-key version in Redis (``clear()`` bumps a namespace-wide
+generation). A loader reads both alongside the entry and writes its result
+only if neither changed while it was loading, so a load that read the
+database before another process's invalidation can never repopulate Redis
+with the stale value.
+Redis errors are logged and treated as misses, so an outage degrades to the
+uncached path instead of failing requests.
+
+Example:
+    cache = TwoTierCache("company-detail", redis_url=config.REDIS_URL)
+    body = await cache.get_or_load(ticker, load_and_encode)
+    ...
+    await cache.invalidate([ticker])
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from typing import cast
+
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+_CLEAR_ALL = "*"
+
+# KEYS[1] entry, KEYS[2] key version, KEYS[3] namespace generation;
+# ARGV[1] value, ARGV[2] TTL, ARGV[3] and ARGV[4] the version and generation read before loading.
+_SET_IF_CURRENT = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[3] or (redis.call('GET', KEYS[3]) or '0') ~= ARGV[4] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return 1
+"""
+
+
+class LRUCache:
+    """Bounded least-recently-used map whose entries expire after ``ttl_s``."""
+
+    def __init__(self, max_entries: int, ttl_s: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_s, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class TwoTierCache:
+    def __init__(
+        self,
+        namespace: str,
+        *,
+        redis_url: str,
+        local_ttl_s: float = 60.0,
+        redis_ttl_s: int = 3600,
+        max_entries: int = 4096,
+    ) -> None:
+        self.namespace = namespace
+        self.redis_url = redis_url
+        self.redis_ttl_s = redis_ttl_s
+        self._local = LRUCache(max_entries, local_ttl_s)
+        self._redis: Redis | None = None
+        self._set_if_current: AsyncScript | None = None
+        self._loading: dict[str, asyncio.Future[bytes]] = {}
+        self._listener: asyncio.Task[None] | None = None
+        # Bumped on every invalidation; a load that straddles one is not cached.
+        self._epoch = 0
+
+    @property
+    def channel(self) -> str:
+        return f"{self.namespace}:invalidate"
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _version_key(self, key: str) -> str:
+        # Outside the entry prefix, so clear()'s scan leaves versions alone.
+        return f"cache-version:{self.namespace}:{key}"
+
+    @property
+    def _generation_key(self) -> str:
+        return f"cache-generation:{self.namespace}"
+
+    @property
+    def redis(self) -> Redis:
+        if self._redis is None:
+            self._redis = Redis.from_url(self.redis_url)
+            self._set_if_current = self._redis.register_script(_SET_IF_CURRENT)
+        return self._redis
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[bytes]]) -> bytes:
+        """Return the cached bytes for ``key``, calling ``loader`` at most once per process on a miss."""
+        value = self._local.get(key)
+        if value is not None:
+            return value
+
+        loading = self._loading.get(key)
+        if loading is not None:
+            return await asyncio.shield(loading)
+
+        future: asyncio.Future[bytes] = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            value = await self._load(key, loader)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Waiters re-raise it; don't warn about an unretrieved exception when there are none.
+            future.exception()
+            raise
+        finally:
+            del self._loading[key]
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[bytes]]) -> bytes:
+        epoch = self._epoch
+        cached: bytes | None = None
+        versions: list[bytes | None] | None = None
+        try:
+            cached, *versions = await cast(
+                Awaitable[list[bytes | None]],
+                self.redis.mget(self._redis_key(key), self._version_key(key), self._generation_key),
+            )
+        except RedisError:
+            logger.warning("Cache read failed for %s:%s", self.namespace, key, exc_info=True)
+
+        if cached is not None:
+            value = cached
+        else:
+            value = await loader()
+            if epoch != self._epoch:
+                return value
+            # Without the versions read before loading, the write could not be checked; skip it.
+            if versions is not None:
+                await self._store(key, value, versions)
+
+        if epoch == self._epoch:
+            self._local.set(key, value)
+        return value
+
+    async def _store(self, key: str, value: bytes, versions: list[bytes | None]) -> None:
+        """Write ``value`` to Redis unless ``key`` was invalidated since ``versions`` were read."""
+        assert self._set_if_current is not None
+        version, generation = (seen or b"0" for seen in versions)
+        try:
+            stored = await self._set_if_current(
+                keys=[self._redis_key(key), self._version_key(key), self._generation_key],
+                args=[value, self.redis_ttl_s, version, generation],
+            )
+        except RedisError:
+            logger.warning("Cache write failed for %s:%s", self.namespace, key, exc_info=True)
+            return
+        if not stored:
+            logger.debug("Skipped caching %s:%s; invalidated while loading", self.namespace, key)
+
+    async def invalidate(self, keys: Iterable[str]) -> None:
+        """Drop ``keys`` from Redis and from the local tier of every listening process."""
+        keys = list(keys)
+        if not keys:
+            return
+        self._evict(keys)
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.delete(*(self._redis_key(key) for key in keys))
+                for key in keys:
+                    # Versions only need to outlive a load in flight; entries expire after redis_ttl_s anyway.
+                    pipe.incr(self._version_key(key))
+                    pipe.expire(self._version_key(key), self.redis_ttl_s)
+                pipe.publish(self.channel, "\n".join(keys))
+                await pipe.execute()
+        except RedisError:
+            logger.warning("Cache invalidation failed for %s", self.namespace, exc_info=True)
+
+    async def clear(self) -> None:
+        """Drop every entry in the namespace, everywhere."""
+        self._evict([_CLEAR_ALL])
+        try:
+            await self.redis.incr(self._generation_key)
+            batch: list[bytes] = []
+            async for redis_key in self.redis.scan_iter(match=self._redis_key("*"), count=1000):
+                batch.append(redis_key)
+                if len(batch) >= 1000:
+                    await self.redis.delete(*batch)
+                    batch.clear()
+            if batch:
+                await self.redis.delete(*batch)
+            await self.redis.publish(self.channel, _CLEAR_ALL)
+        except RedisError:
+            logger.warning("Cache clear failed for %s", self.namespace, exc_info=True)
+
+    def _evict(self, keys: Iterable[str]) -> None:
+        self._epoch += 1
+        for key in keys:
+            if key == _CLEAR_ALL:
+                self._local.clear()
+                return
+            self._local.discard(key)
+
+    # ─── Invalidation listener ────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        """Subscribe to invalidations published by other processes (app startup hook)."""
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop listening and close the Redis connection (app shutdown hook)."""
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+            self._set_if_current = None
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self.redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    # Anything published while we were disconnected was missed.
+                    self._evict([_CLEAR_ALL])
+                    async for message in pubsub.listen():
+                        self._evict(message["data"].decode().split("\n"))
+            except RedisError:
+                logger.warning("Cache invalidation listener lost its connection; retrying", exc_info=True)
+                await asyncio.sleep(1.0)
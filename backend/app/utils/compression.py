@@ -0,0 +1,171 @@
+"""Content-negotiated response compression (zstd, brotli, gzip).
+
+``CompressionMiddleware`` picks the encoding the client ranks highest in
+``Accept-Encoding`` (honouring ``q`` values, including ``q=0`` refusals),
+breaking ties by server preference: zstd, then brotli, then gzip. Levels
+default to fast settings because API bodies are compressed per request, not
+once at build time.
+
+Only text-like bodies of at least ``min_size`` bytes are compressed.
+Responses that already carry a ``Content-Encoding`` (precompressed static
+files) pass through untouched. Bodies of ``offload_size`` bytes or more are
+compressed in a worker thread so a large search page does not stall the
+event loop; all three codecs release the GIL while compressing. Streaming
+responses are compressed chunk by chunk, each chunk flushed so the client can
+decode it as it arrives.
+"""
+
+import asyncio
+import zlib
+from dataclasses import dataclass
+from typing import Any
+
+import brotli
+import zstandard
+from litestar.datastructures import Headers, MutableScopeHeaders
+from litestar.enums import ScopeType
+from litestar.middleware import ASGIMiddleware
+from litestar.types import ASGIApp, HTTPResponseStartEvent, Message, Receive, Scope, Send
+from litestar.utils.scope.state import ScopeState
+
+_COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/manifest+json",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+# Server preference among encodings the client accepts; identity is the fallback.
+ENCODINGS = ("zstd", "br", "gzip")
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    """``Accept-Encoding`` as ``{coding: q}``; malformed ``q`` values count as refusals."""
+    accepted: dict[str, float] = {}
+    for part in header.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding := coding.strip():
+            accepted[coding] = quality
+    return accepted
+
+
+def choose_encoding(header: str, offered: tuple[str, ...]) -> str | None:
+    """The ``offered`` encoding the client ranks highest (ties go to the earlier one), or ``None`` for identity."""
+    accepted = parse_accept_encoding(header)
+    best: tuple[float, int, str] | None = None
+    for rank, encoding in enumerate(offered):
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > 0 and (best is None or (quality, -rank) > best[:2]):
+            best = (quality, -rank, encoding)
+    return best[2] if best else None
+
+
+def is_compressible(media_type: str) -> bool:
+    return media_type.startswith(_COMPRESSIBLE_TYPES)
+
+
+@dataclass(frozen=True, slots=True)
+class CompressionSettings:
+    min_size: int = 1024
+    offload_size: int = 256 * 1024
+    gzip_level: int = 5
+    brotli_quality: int = 4
+    zstd_level: int = 3
+
+
+class _Encoder:
+    """Streaming compressor for one response body."""
+
+    def __init__(self, encoding: str, settings: CompressionSettings) -> None:
+        self._compressor: Any
+        if encoding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=settings.zstd_level).compressobj()
+        elif encoding == "br":
+            self._compressor = brotli.Compressor(quality=settings.brotli_quality, mode=brotli.MODE_TEXT)
+        else:
+            self._compressor = zlib.compressobj(settings.gzip_level, zlib.DEFLATED, 31)  # 31: gzip container
+        self.encoding = encoding
+
+    def chunk(self, data: bytes) -> bytes:
+        """Compress ``data`` and flush, so everything sent so far can be decoded."""
+        if self.encoding == "zstd":
+            return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        """Compress the final ``data`` and end the stream."""
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.finish()
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class CompressionMiddleware(ASGIMiddleware):
+    scopes = (ScopeType.HTTP,)
+
+    def __init__(self, settings: CompressionSettings | None = None) -> None:
+        self.settings = settings or CompressionSettings()
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send, next_app: ASGIApp) -> None:
+        accept_encoding = Headers.from_scope(scope).get("accept-encoding", "")
+        encoding = choose_encoding(accept_encoding, ENCODINGS) if accept_encoding else None
+        if encoding is None:
+            await next_app(scope, receive, send)
+            return
+        await next_app(scope, receive, self._send_wrapper(scope, send, encoding))
+
+    async def _run(self, fn: Any, data: bytes) -> bytes:
+        if len(data) >= self.settings.offload_size:
+            return await asyncio.to_thread(fn, data)
+        return fn(data)
+
+    def _send_wrapper(self, scope: Scope, send: Send, encoding: str) -> Send:
+        start: HTTPResponseStartEvent | None = None
+        encoder: _Encoder | None = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, encoder
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                # The first body message decides whether the whole response is compressed.
+                initial, start = start, None
+                headers = MutableScopeHeaders(initial)
+                if (
+                    "content-encoding" not in headers
+                    and is_compressible(headers.get("content-type", ""))
+                    and (more_body or len(body) >= self.settings.min_size)
+                ):
+                    encoder = _Encoder(encoding, self.settings)
+                    headers["Content-Encoding"] = encoding
+                    headers.extend_header_value("vary", "Accept-Encoding")
+                    ScopeState.from_scope(scope).response_compressed = True
+                    if more_body:
+                        del headers["Content-Length"]
+                        body = await self._run(encoder.chunk, body)
+                    else:
+                        body = await self._run(encoder.finish, body)
+                        headers["Content-Length"] = str(len(body))
+                await send(initial)
+            elif encoder is not None:
+                body = await self._run(encoder.chunk if more_body else encoder.finish, body)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        return send_wrapper
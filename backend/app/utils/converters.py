@@ -0,0 +1,119 @@
+"""Generated converters from ORM instances and result rows to msgspec structs.
+
+``model_converter(Model, Schema)`` and ``row_converter(keys, Schema)`` compile
+(once per argument set, then cached) a function whose body is a single
+``Schema(field=src.attr, ...)`` call, or for rows ``Schema(field=row[i], ...)``
+with column positions resolved up front. There is no intermediate dict, no
+per-row field lookup and, for ``.many``, no per-row function call: the batch
+variant is one list comprehension over the whole result.
+
+Schema fields are read from the model attribute or result column of the same
+name unless ``rename`` maps them to another; ``convert`` wraps a value in a
+callable (e.g. ``str`` for ids). Fields with no source keep their schema
+default, and a required field with no source is an error when the converter is
+built, not on the first row.
+
+Example:
+    to_filing = row_converter(result.keys(), FilingSchema, convert={"id": str, "company_id": str})
+    filings = to_filing.many(result)
+"""
+
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from functools import cache
+from typing import Any
+
+import msgspec
+from sqlalchemy import inspect
+
+from app.base.models import BaseDBModel
+
+
+@dataclass(frozen=True, slots=True)
+class Converter[S: msgspec.Struct]:
+    one: Callable[[Any], S]
+    many: Callable[[Iterable[Any]], list[S]]
+
+    def __call__(self, source: Any) -> S:
+        return self.one(source)
+
+
+def _compile[S: msgspec.Struct](
+    schema: type[S],
+    sources: Mapping[str, str],
+    convert: Mapping[str, Callable[[Any], Any]],
+    kind: str,
+) -> Converter[S]:
+    """Build a converter from ``{schema field: source expression on `src`}``."""
+    required = {field.name for field in msgspec.structs.fields(schema) if field.required}
+    if missing := required - sources.keys():
+        raise ValueError(f"No {kind} source for required {schema.__name__} fields: {', '.join(sorted(missing))}")
+
+    namespace: dict[str, Any] = {"_schema": schema}
+    args = []
+    for field, source in sources.items():
+        if field in convert:
+            namespace[f"_convert_{field}"] = convert[field]
+            source = f"_convert_{field}({source})"
+        args.append(f"{field}={source}")
+    call = f"_schema({', '.join(args)})"
+    code = f"def one(src):\n    return {call}\n\ndef many(sources):\n    return [{call} for src in sources]\n"
+    exec(compile(code, f"<converter {kind} -> {schema.__name__}>", "exec"), namespace)
+    return Converter(namespace["one"], namespace["many"])
+
+
+@cache
+def _model_converter(
+    model: type[BaseDBModel],
+    schema: type[msgspec.Struct],
+    rename: tuple[tuple[str, str], ...],
+    convert: tuple[tuple[str, Callable[[Any], Any]], ...],
+) -> Converter[Any]:
+    attributes = set(inspect(model).attrs.keys())
+    renamed = dict(rename)
+    sources = {
+        field: f"src.{renamed.get(field, field)}"
+        for field in schema.__struct_fields__
+        if renamed.get(field, field) in attributes
+    }
+    return _compile(schema, sources, dict(convert), model.__name__)
+
+
+@cache
+def _row_converter(
+    keys: tuple[str, ...],
+    schema: type[msgspec.Struct],
+    rename: tuple[tuple[str, str], ...],
+    convert: tuple[tuple[str, Callable[[Any], Any]], ...],
+) -> Converter[Any]:
+    # First occurrence wins when a key repeats, as with Row attribute access.
+    positions = {key: index for index, key in reversed(list(enumerate(keys)))}
+    renamed = dict(rename)
+    sources = {
+        field: f"src[{positions[renamed.get(field, field)]}]"
+        for field in schema.__struct_fields__
+        if renamed.get(field, field) in positions
+    }
+    return _compile(schema, sources, dict(convert), "Row")
+
+
+def model_converter[S: msgspec.Struct](
+    model: type[BaseDBModel],
+    schema: type[S],
+    *,
+    rename: Mapping[str, str] | None = None,
+    convert: Mapping[str, Callable[[Any], Any]] | None = None,
+) -> Converter[S]:
+    """Converter from ``model`` instances to ``schema``; ``rename`` maps schema fields to model attributes."""
+    return _model_converter(model, schema, tuple((rename or {}).items()), tuple((convert or {}).items()))
+
+
+def row_converter[S: msgspec.Struct](
+    keys: Iterable[str],
+    schema: type[S],
+    *,
+    rename: Mapping[str, str] | None = None,
+    convert: Mapping[str, Callable[[Any], Any]] | None = None,
+) -> Converter[S]:
+    """Converter from result rows with columns ``keys`` (e.g. ``result.keys()``) to ``schema``, by position."""
+    return _row_converter(tuple(keys), schema, tuple((rename or {}).items()), tuple((convert or {}).items()))
@@ -1,8 +1,18 @@
 """Database utility helpers."""
 
+import asyncio
+import time
+from collections.abc import Callable, Sequence
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from functools import cache
+from typing import Any, cast
+
 from litestar.plugins.sqlalchemy import SQLAlchemyAsyncConfig
 from msgspec import structs
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Table, Update, bindparam, exc, inspect, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
 
 from app.base.models import BaseDBModel
 from app.base.schemas import BaseSchema
@@ -53,3 +63,145 @@ async def update_model[T: BaseDBModel](
 
     await session.flush()
     return model_instance
+
+
+@cache
+def _bulk_update_plan(model: type[BaseDBModel], schema: type[BaseSchema]) -> tuple[Update, tuple[str, ...]]:
+    """The executemany UPDATE for ``schema`` onto ``model`` and the schema fields it binds, built once per pair.
+
+    Fields are the schema's that name a mapped column other than the primary
+    key; relationships and unknown fields are left out, as in ``update_model``.
+    """
+    mapper = inspect(model)
+    columns = {attr.key: attr.columns[0] for attr in mapper.column_attrs}
+    fields = tuple(field for field in schema.__struct_fields__ if field in columns and not columns[field].primary_key)
+    table = cast(Table, model.__table__)
+    # Bind names must not clash with column names, which UPDATE reserves for its SET clause.
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("_pk"))
+        .values({columns[field].name: bindparam(f"_{field}") for field in fields})
+    )
+    return stmt, fields
+
+
+async def bulk_update_models[T: BaseDBModel](
+    session: AsyncSession,
+    model: type[T],
+    updates: Sequence[tuple[int, BaseSchema]],
+) -> None:
+    """Apply schema structs to many rows of ``model`` by id, in one executemany round-trip per schema type.
+
+    The batch counterpart of ``update_model``: every mapped column field of
+    each schema is written (``onupdate`` columns such as ``updated_at`` are
+    bumped too), while nested relationship fields are skipped, so use
+    ``update_model`` for those. Instances of ``model`` already loaded in the
+    session are not refreshed; expire them if they are read afterwards.
+    """
+    by_schema: dict[type[BaseSchema], list[tuple[int, BaseSchema]]] = {}
+    for pk, values in updates:
+        by_schema.setdefault(type(values), []).append((pk, values))
+
+    for schema, rows in by_schema.items():
+        stmt, fields = _bulk_update_plan(model, schema)
+        if not fields:
+            continue
+        params = [{"_pk": pk, **{f"_{field}": getattr(values, field) for field in fields}} for pk, values in rows]
+        await session.execute(stmt, params)
+
+
+# ─── Pooled engines ───────────────────────────────────────────────────────────
+
+
+@dataclass
+class PoolStats:
+    """Connection checkout timings. Wait covers queueing for a free slot, connecting and pre-ping.
+
+    ``observer``, when set, is also called with each checkout's wait, or ``None`` for a timeout.
+    """
+
+    checkouts: int = 0
+    timeouts: int = 0
+    total_wait_s: float = 0.0
+    max_wait_s: float = 0.0
+    observer: Callable[[float | None], None] | None = None
+
+    @property
+    def mean_wait_s(self) -> float:
+        return self.total_wait_s / self.checkouts if self.checkouts else 0.0
+
+    def record(self, wait_s: float) -> None:
+        self.checkouts += 1
+        self.total_wait_s += wait_s
+        self.max_wait_s = max(self.max_wait_s, wait_s)
+        if self.observer is not None:
+            self.observer(wait_s)
+
+    def record_timeout(self) -> None:
+        self.timeouts += 1
+        if self.observer is not None:
+            self.observer(None)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waits."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.record_timeout()
+            raise
+        self.stats.record(time.perf_counter() - start)
+        return connection
+
+
+def create_pooled_engine(
+    url: str,
+    *,
+    pool_size: int,
+    max_overflow: int,
+    pool_timeout_s: float = 30.0,
+    pool_recycle_s: int = 1800,
+    observer: Callable[[float | None], None] | None = None,
+) -> AsyncEngine:
+    """Engine that keeps ``pool_size`` connections open and pings them on checkout.
+
+    ``pool_recycle_s`` is a maximum connection age, not an idle timeout: a
+    connection older than that is replaced when it is next checked out. The
+    pool is LIFO, so under light load the same few connections are reused and
+    the rest of the ``pool_size`` core stays open and idle indefinitely (that
+    is the warm pool); only overflow connections are closed, as soon as they
+    are returned to a full pool. A core connection the server has closed while
+    idle is caught by the pre-ping and reopened. ``observer`` receives every
+    checkout wait (see ``PoolStats``).
+    """
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout_s,
+        pool_recycle=pool_recycle_s,
+        pool_pre_ping=True,
+        pool_use_lifo=True,
+    )
+    if (stats := pool_stats(engine)) is not None:
+        stats.observer = observer
+    return engine
+
+
+async def warm_pool(engine: AsyncEngine, connections: int) -> None:
+    """Open ``connections`` connections up front so the first jobs skip the TCP + auth handshake."""
+    async with AsyncExitStack() as stack:
+        await asyncio.gather(*(stack.enter_async_context(engine.connect()) for _ in range(connections)))
+
+
+def pool_stats(engine: AsyncEngine) -> PoolStats | None:
+    pool = engine.pool
+    return pool.stats if isinstance(pool, InstrumentedAsyncQueuePool) else None
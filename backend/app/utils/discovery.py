@@ -8,14 +8,94 @@ Example:
 
     discover_and_import(["models.py", "models/**/*.py"])
     discover_and_import(["tasks.py"])
+
+Scanning is cached in a manifest (``<base_path>/__pycache__/discovery.json``)
+listing every ``.py`` file in the tree together with the mtime of every
+directory. Adding, removing or renaming a file changes its directory's mtime,
+so a boot only has to ``stat`` those directories to trust the manifest; any
+mismatch falls back to a fresh scan and rewrites it. Like bytecode caching,
+nothing is written when ``sys.dont_write_bytecode`` is set or the tree is
+read-only. Build it ahead of time (after ``compileall``, whose ``__pycache__``
+directories would otherwise bump the mtimes once) with:
+
+    python -m app.utils.discovery
 """
 
+import json
 import logging
+import os
+import sys
 from importlib import import_module
-from pathlib import Path
+from pathlib import Path, PurePath
+from typing import Any
 
 logger = logging.getLogger(__name__)
 
+BACKEND_DIR = Path(__file__).parent.parent.parent
+MANIFEST_NAME = "discovery.json"
+_MANIFEST_VERSION = 1
+
+
+def _scan(search_dir: Path) -> dict[str, Any]:
+    """Walk ``search_dir`` once, recording each directory's mtime and the ``.py`` files in it."""
+    dirs: dict[str, int] = {}
+    files: list[str] = []
+    for root, dirnames, filenames in os.walk(search_dir):
+        dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+        relative = Path(root).relative_to(search_dir).as_posix()
+        dirs[relative] = os.stat(root).st_mtime_ns
+        files.extend(f"{relative}/{name}".removeprefix("./") for name in sorted(filenames) if name.endswith(".py"))
+    return {"version": _MANIFEST_VERSION, "dirs": dirs, "files": files}
+
+
+def _load_manifest(search_dir: Path) -> dict[str, Any] | None:
+    """The cached scan of ``search_dir``, or ``None`` if it is missing or any directory changed since."""
+    try:
+        manifest = json.loads((search_dir / "__pycache__" / MANIFEST_NAME).read_bytes())
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != _MANIFEST_VERSION:
+        return None
+    for relative, mtime_ns in manifest["dirs"].items():
+        try:
+            if os.stat(search_dir / relative).st_mtime_ns != mtime_ns:
+                return None
+        except OSError:
+            return None
+    return manifest
+
+
+def _write_manifest(search_dir: Path, manifest: dict[str, Any]) -> None:
+    path = search_dir / "__pycache__" / MANIFEST_NAME
+    tmp = path.with_name(f"{MANIFEST_NAME}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(json.dumps(manifest))
+        os.replace(tmp, path)
+    except OSError:
+        logger.debug("Could not write discovery manifest %s", path, exc_info=True)
+
+
+def build_manifest(base_path: str = "app") -> dict[str, Any]:
+    """Scan ``base_path`` and write its manifest, ignoring any cached one."""
+    search_dir = BACKEND_DIR / base_path
+    # Create __pycache__ before scanning so creating it does not invalidate the mtimes just recorded.
+    (search_dir / "__pycache__").mkdir(exist_ok=True)
+    manifest = _scan(search_dir)
+    _write_manifest(search_dir, manifest)
+    return manifest
+
+
+def _source_files(search_dir: Path) -> list[str]:
+    manifest = _load_manifest(search_dir)
+    if manifest is not None:
+        return manifest["files"]
+    if sys.dont_write_bytecode:
+        return _scan(search_dir)["files"]
+    try:
+        return build_manifest(search_dir.relative_to(BACKEND_DIR).as_posix())["files"]
+    except OSError:
+        return _scan(search_dir)["files"]
+
 
 def discover_and_import(
     patterns: list[str],
@@ -35,37 +115,42 @@ def discover_and_import(
     if exclude_paths is None:
         exclude_paths = ["__pycache__", "test", "tests", "alembic"]
 
-    backend_dir = Path(__file__).parent.parent.parent
-    search_dir = backend_dir / base_path
+    search_dir = BACKEND_DIR / base_path
 
     if not search_dir.exists():
         logger.warning("Search directory does not exist: %s", search_dir)
         return []
 
+    files = [PurePath(file) for file in _source_files(search_dir)]
     imported: list[str] = []
     seen: set[str] = set()
 
     for pattern in patterns:
-        for file_path in search_dir.rglob(pattern):
+        # Same matches as search_dir.rglob(pattern).
+        for file_path in (file for file in files if file.full_match(f"**/{pattern}")):
             if any(excluded in file_path.parts for excluded in exclude_paths):
                 continue
             if file_path.name == "__init__.py":
                 continue
 
-            try:
-                relative = file_path.relative_to(backend_dir)
-                module_name = ".".join((*relative.parts[:-1], relative.stem))
-
-                if module_name in seen:
-                    continue
+            module_name = ".".join((*PurePath(base_path).parts, *file_path.parts[:-1], file_path.stem))
+            if module_name in seen:
+                continue
 
+            try:
                 import_module(module_name)
                 imported.append(module_name)
                 seen.add(module_name)
                 logger.debug("Discovered: %s", module_name)
 
             except Exception:
-                logger.exception("Failed to import discovered module: %s", file_path)
+                logger.exception("Failed to import discovered module: %s", search_dir / file_path)
 
     logger.info("Auto-discovery imported %d modules for patterns %s", len(imported), patterns)
     return imported
+
+
+if __name__ == "__main__":
+    for base in sys.argv[1:] or ["app"]:
+        written = build_manifest(base)
+        print(f"Wrote {BACKEND_DIR / base / '__pycache__' / MANIFEST_NAME} ({len(written['files'])} files)")
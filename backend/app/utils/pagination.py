@@ -0,0 +1,106 @@
+"""Keyset (cursor) pagination helpers.
+
+A cursor is an opaque, URL-safe token holding the sort-key values and id of the
+last row of a page. Seeking past it with a WHERE predicate costs the same on
+page 1 and page 1000, unlike OFFSET which scans and discards every prior row.
+
+Sort keys are ordered NULLS LAST in both directions, so the predicate treats
+NULL as the greatest value on ascending keys and the smallest on descending.
+
+Example:
+    keys = [SortKey(Company.name, "asc"), SortKey(Company.id, "asc")]
+    stmt = stmt.where(keyset_predicate(keys, decode_cursor(token, keys)))
+    ...
+    next_token = encode_cursor(keys, [row.name, row.id])
+"""
+
+import base64
+import hashlib
+from datetime import datetime
+from typing import Any, Literal, NamedTuple
+
+import msgspec
+from litestar.exceptions import ValidationException
+from sqlalchemy import DateTime, and_, false, or_, tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+
+class SortKey(NamedTuple):
+    column: Any
+    direction: Literal["asc", "desc"]
+
+    @property
+    def nullable(self) -> bool:
+        return getattr(self.column.expression, "nullable", True)
+
+    def order_by(self) -> ColumnElement:
+        ordered = self.column.desc() if self.direction == "desc" else self.column.asc()
+        return ordered.nulls_last() if self.nullable else ordered
+
+
+def _fingerprint(keys: list[SortKey]) -> str:
+    spec = ",".join(f"{key.column.expression}:{key.direction}" for key in keys)
+    return hashlib.blake2s(spec.encode(), digest_size=6).hexdigest()
+
+
+def encode_cursor(keys: list[SortKey], values: list[Any]) -> str:
+    payload = msgspec.json.encode([_fingerprint(keys), values])
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_cursor(token: str, keys: list[SortKey]) -> list[Any]:
+    """Decode a cursor, rejecting tokens that were issued for a different sort order."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        fingerprint, values = msgspec.json.decode(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError, msgspec.DecodeError) as exc:
+        raise ValidationException("Malformed pagination cursor") from exc
+
+    if not isinstance(values, list):
+        raise ValidationException("Malformed pagination cursor")
+    if fingerprint != _fingerprint(keys) or len(values) != len(keys):
+        raise ValidationException("Pagination cursor does not match the requested sorting")
+
+    try:
+        return [
+            datetime.fromisoformat(value) if value is not None and isinstance(key.column.type, DateTime) else value
+            for key, value in zip(keys, values, strict=True)
+        ]
+    except (ValueError, TypeError) as exc:
+        raise ValidationException("Malformed pagination cursor") from exc
+
+
+def keyset_predicate(keys: list[SortKey], values: list[Any]) -> ColumnElement[bool]:
+    """Build the WHERE clause selecting rows strictly after ``values`` in ``keys`` order.
+
+    Uniform-direction, non-nullable keys compile to a row comparison
+    ``(a, b, id) > (:a, :b, :id)``, which Postgres answers with a single range
+    scan on a matching composite index. Anything else expands to the
+    equivalent OR-of-ANDs form.
+    """
+    directions = {key.direction for key in keys}
+    if len(directions) == 1 and not any(key.nullable for key in keys):
+        row = tuple_(*(key.column for key in keys))
+        bound = tuple_(*values)
+        return row < bound if directions == {"desc"} else row > bound
+
+    clauses: list[ColumnElement[bool]] = []
+    for i, (key, value) in enumerate(zip(keys, values, strict=True)):
+        after = _after(key, value)
+        if after is None:
+            continue
+        ties = [_equal(prev_key, prev_value) for prev_key, prev_value in zip(keys[:i], values[:i], strict=True)]
+        clauses.append(and_(*ties, after))
+    return or_(*clauses) if clauses else false()
+
+
+def _equal(key: SortKey, value: Any) -> ColumnElement[bool]:
+    return key.column.is_(None) if value is None else key.column == value
+
+
+def _after(key: SortKey, value: Any) -> ColumnElement[bool] | None:
+    if value is None:
+        # NULLs sort last, so nothing follows a NULL on this key
+        return None
+    after = key.column < value if key.direction == "desc" else key.column > value
+    return or_(after, key.column.is_(None)) if key.nullable else after
@@ -0,0 +1,127 @@
+"""In-memory static files with precompressed variants, strong ETags and 304s.
+
+Files are read once at startup and kept as bytes alongside their brotli and
+gzip encodings, so serving one is a dict lookup and content negotiation with
+no disk I/O.
+Precompressed siblings (``app.js.gz``, ``app.js.br``) are used when present;
+otherwise text-like files are compressed at load time. Write the siblings at
+build time so boots only read them:
+
+    python -m app.utils.static frontend/dist
+
+Example:
+    assets = load_static_dir(Path("frontend/dist/assets"))
+    return static_response(request, assets[path], cache_control=IMMUTABLE)
+"""
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import brotli
+from litestar import Request, Response
+
+from app.utils.compression import choose_encoding, is_compressible
+
+logger = logging.getLogger(__name__)
+
+# Content-hashed build output (Vite's assets/) never changes under the same URL.
+IMMUTABLE = "public, max-age=31536000, immutable"
+# Unhashed entry points (index.html) are revalidated on every use, which is a 304 while unchanged.
+REVALIDATE = "no-cache"
+
+# Server preference among encodings the client accepts; identity is the fallback.
+_ENCODINGS = ("br", "gzip")
+_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+# Below this, compression saves less than the header overhead.
+_MIN_COMPRESS_SIZE = 256
+
+
+@dataclass(frozen=True, slots=True)
+class StaticFile:
+    media_type: str
+    # Encoding ("identity", "gzip", "br") -> (body, ETag). Strong ETags differ per encoding.
+    variants: dict[str, tuple[bytes, str]]
+
+    def matches(self, if_none_match: str) -> bool:
+        """Whether an ``If-None-Match`` header names any variant of this file (weak comparison)."""
+        if if_none_match.strip() == "*":
+            return True
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return any(etag in tags for _, etag in self.variants.values())
+
+
+def _compress(encoding: str, body: bytes) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=11)
+    return gzip.compress(body, compresslevel=9, mtime=0)
+
+
+def load_static_file(path: Path) -> StaticFile:
+    """Read ``path`` and its precompressed siblings, compressing it in memory where no sibling exists."""
+    body = path.read_bytes()
+    media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    digest = hashlib.blake2b(body, digest_size=12).hexdigest()
+    variants = {"identity": (body, f'"{digest}"')}
+    if not is_compressible(media_type) or len(body) < _MIN_COMPRESS_SIZE:
+        return StaticFile(media_type, variants)
+    for encoding in _ENCODINGS:
+        sibling = path.with_name(path.name + _SUFFIXES[encoding])
+        encoded = sibling.read_bytes() if sibling.is_file() else _compress(encoding, body)
+        if len(encoded) < len(body):
+            variants[encoding] = (encoded, f'"{digest}-{encoding}"')
+    return StaticFile(media_type, variants)
+
+
+def load_static_dir(directory: Path) -> dict[str, StaticFile]:
+    """Every file under ``directory`` keyed by its POSIX path relative to it; siblings are folded into variants."""
+    files: dict[str, StaticFile] = {}
+    suffixes = tuple(_SUFFIXES.values())
+    for path in sorted(directory.rglob("*")):
+        if not path.is_file():
+            continue
+        if path.name.endswith(suffixes) and path.with_name(path.name.rsplit(".", 1)[0]).is_file():
+            continue
+        files[path.relative_to(directory).as_posix()] = load_static_file(path)
+    logger.info("Loaded %d static files from %s", len(files), directory)
+    return files
+
+
+def static_response(request: Request, file: StaticFile, *, cache_control: str) -> Response[bytes]:
+    """The best encoding the client accepts, or ``304 Not Modified`` when its cached copy is current."""
+    offered = tuple(encoding for encoding in _ENCODINGS if encoding in file.variants)
+    encoding = choose_encoding(request.headers.get("accept-encoding", ""), offered) or "identity"
+    body, etag = file.variants[encoding]
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    if file.matches(request.headers.get("if-none-match", "")):
+        return Response(b"", status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type=file.media_type, headers=headers)
+
+
+def write_precompressed(directory: Path) -> int:
+    """Write ``.br`` and ``.gz`` siblings for every compressible file; returns the count."""
+    written = 0
+    for path in sorted(directory.rglob("*")):
+        if not path.is_file() or path.name.endswith(tuple(_SUFFIXES.values())):
+            continue
+        media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        body = path.read_bytes()
+        if not is_compressible(media_type) or len(body) < _MIN_COMPRESS_SIZE:
+            continue
+        for encoding in _ENCODINGS:
+            encoded = _compress(encoding, body)
+            if len(encoded) < len(body):
+                path.with_name(path.name + _SUFFIXES[encoding]).write_bytes(encoded)
+                written += 1
+    return written
+
+
+if __name__ == "__main__":
+    for target in sys.argv[1:]:
+        print(f"Wrote {write_precompressed(Path(target))} precompressed files under {target}")
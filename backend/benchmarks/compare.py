@@ -0,0 +1,72 @@
+"""Compare two benchmark reports written by ``benchmarks.run``.
+
+Prints throughput, p95 latency and peak allocation per scenario and
+concurrency level as baseline → candidate with the relative change, and exits
+non-zero when any p95 regressed by more than ``--threshold`` percent or either
+run had failed requests.
+
+    uv run python -m benchmarks.compare baseline.json candidate.json --threshold 10
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+
+def _change(old: float, new: float) -> float:
+    return (new - old) / old * 100 if old else 0.0
+
+
+def compare(baseline: dict[str, Any], candidate: dict[str, Any], threshold: float) -> list[str]:
+    """Print the comparison table and return the regressions beyond ``threshold``."""
+    regressions: list[str] = [
+        f"{label} report has {report['errors']} failed requests"
+        for label, report in (("baseline", baseline), ("candidate", candidate))
+        if report.get("errors")
+    ]
+    print(f"baseline  {baseline.get('commit')}  ({baseline.get('created_at')})")
+    print(f"candidate {candidate.get('commit')}  ({candidate.get('created_at')})")
+    print(f"{'scenario':<24} {'c':>4} {'rps':>22} {'p95 ms':>24} {'peak KiB/req':>26}")
+
+    for name, old in baseline["scenarios"].items():
+        new = candidate["scenarios"].get(name)
+        if new is None:
+            continue
+        old_alloc = old["allocations"]["peak_bytes_per_request"] / 1024
+        new_alloc = new["allocations"]["peak_bytes_per_request"] / 1024
+        for level, old_stats in old["concurrency"].items():
+            new_stats = new["concurrency"].get(level)
+            if new_stats is None:
+                continue
+            old_rps, new_rps = old_stats["throughput_rps"], new_stats["throughput_rps"]
+            old_p95, new_p95 = old_stats["latency_ms"]["p95"], new_stats["latency_ms"]["p95"]
+            print(
+                f"{name:<24} {level:>4} "
+                f"{old_rps:>8.0f} → {new_rps:>6.0f} {_change(old_rps, new_rps):>+5.0f}% "
+                f"{old_p95:>8.2f} → {new_p95:>7.2f} {_change(old_p95, new_p95):>+5.0f}% "
+                f"{old_alloc:>9.1f} → {new_alloc:>8.1f} {_change(old_alloc, new_alloc):>+5.0f}%"
+            )
+            if _change(old_p95, new_p95) > threshold:
+                regressions.append(f"{name} c={level}: p95 {old_p95:.2f} → {new_p95:.2f} ms")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports written by benchmarks.run.")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed p95 regression in percent")
+    args = parser.parse_args()
+
+    regressions = compare(json.loads(args.baseline.read_text()), json.loads(args.candidate.read_text()), args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} failures or p95 regressions over {args.threshold:g}%:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Request shapes driven by the benchmark runner.
+
+Each scenario builds its next request from a counter, cycling deterministically
+through the seeded tickers and sectors so every run issues the same sequence.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from benchmarks.seed import Dataset
+
+
+@dataclass(frozen=True, slots=True)
+class Request:
+    method: str
+    path: str
+    json: Any = None
+
+
+@dataclass(frozen=True, slots=True)
+class Scenario:
+    name: str
+    build: Callable[[int], Request]
+
+
+def _search(body: Callable[[int], dict[str, Any]]) -> Callable[[int], Request]:
+    return lambda i: Request("POST", "/api/company/search", body(i))
+
+
+def build_scenarios(dataset: Dataset) -> list[Scenario]:
+    tickers, sectors = dataset.tickers, dataset.sectors
+    # A small hot set (cache hits after warm-up) and the full universe (mostly misses).
+    hot = tickers[:100]
+
+    return [
+        Scenario("health", lambda i: Request("GET", "/health")),
+        Scenario("company_detail_hot", lambda i: Request("GET", f"/api/company/{hot[i % len(hot)]}")),
+        Scenario(
+            "company_detail_spread",
+            # Stride through the universe so consecutive requests rarely repeat a ticker.
+            lambda i: Request("GET", f"/api/company/{tickers[(i * 7919) % len(tickers)]}"),
+        ),
+        Scenario("search_first_page", _search(lambda i: {"pagination": {"limit": 50}})),
+        Scenario(
+            "search_sector_filter",
+            _search(lambda i: {"filters": {"industries": [sectors[i % len(sectors)]]}, "pagination": {"limit": 50}}),
+        ),
+        Scenario(
+            "search_range_sorted",
+            _search(
+                lambda i: {
+                    "filters": {"numericRanges": {"equity_value": {"min": 1e8}, "multiple_ev_to_revenue": {"max": 20}}},
+                    "sorting": [{"field": "equity_value", "direction": "desc"}],
+                    "pagination": {"limit": 50},
+                }
+            ),
+        ),
+        Scenario(
+            "search_name_prefix",
+            _search(lambda i: {"search": ("Acme", "Titan", "North", "Vector")[i % 4], "pagination": {"limit": 25}}),
+        ),
+        Scenario(
+            "search_deep_offset",
+            _search(
+                lambda i: {
+                    "sorting": [{"field": "ltm_revenue", "direction": "desc"}],
+                    "pagination": {"offset": 2000 + (i % 10) * 100, "limit": 100},
+                }
+            ),
+        ),
+    ]
@@ -0,0 +1,169 @@
+"""Deterministic synthetic dataset for the API benchmarks.
+
+Generates ``companies`` registrants with ``filings_per_company`` quarterly
+filings each (every fourth one a 10-K), a share price per company, and then
+derives ``company_metrics`` and ``sector_comparables`` through the same
+service code the queue tasks use. The same ``seed`` always produces the same
+rows, so results are comparable between commits.
+"""
+
+import random
+import string
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from itertools import batched
+from typing import Any
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.company.comparables import rebuild_comparables
+from app.company.models import Company
+from app.company.queries import load_filing_arrays
+from app.company.services import recompute_company_metrics, upsert_company_metrics, upsert_filings
+
+SECTORS: dict[str, tuple[str, ...]] = {
+    "Information Technology": ("Software", "Semiconductors", "IT Services", "Hardware"),
+    "Health Care": ("Biotechnology", "Pharmaceuticals", "Health Care Equipment"),
+    "Financials": ("Banks", "Insurance", "Capital Markets"),
+    "Industrials": ("Aerospace & Defense", "Machinery", "Airlines"),
+    "Consumer Discretionary": ("Retail", "Automobiles", "Hotels & Leisure"),
+    "Energy": ("Oil & Gas", "Energy Equipment"),
+    "Utilities": ("Electric Utilities", "Water Utilities"),
+    "Materials": ("Chemicals", "Metals & Mining"),
+}
+_WORDS = tuple(
+    "Acme Apex Atlas Blue Bright Cedar Summit Delta Echo Frontier Global Harbor Iron Keystone Liberty Meridian "
+    "North Orion Pioneer Quantum River Silver Titan United Vector West".split()
+)
+_SUFFIXES = ("Corp", "Inc", "Holdings", "Group", "Systems", "Industries", "Technologies")
+_COMPANY_BATCH_SIZE = 5000
+_FILING_BATCH_COMPANIES = 1000
+
+
+@dataclass(frozen=True, slots=True)
+class Dataset:
+    companies: int
+    filings: int
+    tickers: list[str]
+    sectors: list[str]
+
+
+def _ticker(i: int) -> str:
+    letters = string.ascii_uppercase
+    ticker = ""
+    i += 26 * 26  # at least three letters
+    while i:
+        i, r = divmod(i, 26)
+        ticker = letters[r] + ticker
+    return ticker
+
+
+def _quarter_ends(count: int, last: date) -> list[date]:
+    ends = []
+    year, month = last.year, last.month
+    for _ in range(count):
+        ends.append((date(year, month, 1) + timedelta(days=32)).replace(day=1) - timedelta(days=1))
+        month -= 3
+        if month <= 0:
+            month += 12
+            year -= 1
+    return ends[::-1]
+
+
+def _company_rows(companies: int, rng: random.Random) -> list[dict[str, Any]]:
+    sectors = list(SECTORS)
+    rows = []
+    for i in range(companies):
+        sector = rng.choice(sectors)
+        rows.append(
+            {
+                "name": f"{rng.choice(_WORDS)} {rng.choice(_WORDS)} {rng.choice(_SUFFIXES)} {i}",
+                "ticker": _ticker(i),
+                "description": None,
+                "sector": sector,
+                "sub_industry": rng.choice(SECTORS[sector]),
+                "exchange": rng.choice(("NYSE", "NASDAQ")),
+                "cik": f"{i + 1:010d}",
+            }
+        )
+    return rows
+
+
+def _filing_rows(company_id: int, cik: str, quarters: list[date], rng: random.Random) -> list[dict[str, Any]]:
+    revenue = rng.lognormvariate(18, 1.5)
+    margin = rng.uniform(-0.1, 0.3)
+    shares = rng.lognormvariate(18, 1)
+    rows = []
+    for n, period_end in enumerate(quarters):
+        revenue *= rng.uniform(0.97, 1.06)
+        form = "10-K" if n % 4 == 3 else "10-Q"
+        scale = 4 if form == "10-K" else 1
+        period = datetime.combine(period_end, datetime.min.time(), tzinfo=UTC)
+        rows.append(
+            {
+                "cik": cik,
+                "company_id": company_id,
+                "type": form,
+                "period_end": period,
+                "filing_date": period + timedelta(days=rng.randint(25, 60)),
+                "revenue": revenue * scale,
+                "net_income": revenue * scale * margin,
+                "ebitda": revenue * scale * (margin + 0.08),
+                "shares_outstanding": shares,
+                "cash": revenue * rng.uniform(0.1, 2),
+                "debt": revenue * rng.uniform(0, 3),
+                "document_url": None,
+                "source": "Other",
+            }
+        )
+    return rows
+
+
+async def seed(
+    session: AsyncSession, *, companies: int = 10_000, filings_per_company: int = 40, seed: int = 0
+) -> Dataset:
+    """Replace all company data with a synthetic dataset. Runs inside the caller's transaction.
+
+    Destructive: every company, filing and metrics row in the target database is truncated.
+    """
+    rng = random.Random(seed)
+    await session.execute(
+        text("TRUNCATE businesses, filings, company_metrics, sector_comparables RESTART IDENTITY CASCADE")
+    )
+
+    company_rows = _company_rows(companies, rng)
+    for batch in batched(company_rows, _COMPANY_BATCH_SIZE):
+        await session.execute(insert(Company), list(batch))
+    ids = dict((await session.execute(select(Company.ticker, Company.id))).tuples().all())
+
+    quarters = _quarter_ends(filings_per_company, date(2026, 6, 30))
+    filings = 0
+    metrics_rows = []
+    for batch in batched(company_rows, _FILING_BATCH_COMPANIES):
+        filing_rows = []
+        for row in batch:
+            company_id = ids[row["ticker"]]
+            filing_rows.extend(_filing_rows(company_id, row["cik"], quarters, rng))
+            metrics_rows.append({"company_id": company_id, "share_price": round(rng.lognormvariate(3.5, 1), 2)})
+        await upsert_filings(session, filing_rows)
+        filings += len(filing_rows)
+    await upsert_company_metrics(session, metrics_rows)
+
+    await recompute_company_metrics(session, await load_filing_arrays(session))
+    await rebuild_comparables(session)
+    await session.execute(text("ANALYZE businesses, filings, company_metrics, sector_comparables"))
+    return Dataset(
+        companies=companies,
+        filings=filings,
+        tickers=[row["ticker"] for row in company_rows],
+        sectors=list(SECTORS),
+    )
+
+
+async def load_dataset(session: AsyncSession) -> Dataset:
+    """Describe an already seeded database without reseeding it."""
+    tickers = list((await session.execute(select(Company.ticker).order_by(Company.id))).scalars())
+    filings = (await session.execute(text("SELECT count(*) FROM filings"))).scalar_one()
+    sectors = list((await session.execute(select(Company.sector).distinct().order_by(Company.sector))).scalars())
+    return Dataset(companies=len(tickers), filings=filings, tickers=tickers, sectors=[s for s in sectors if s])
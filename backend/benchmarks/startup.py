@@ -0,0 +1,125 @@
+"""Cold-start import time of the API / worker entry point.
+
+Imports ``--module`` (default ``app.index``, which builds the app and the
+queue configs exactly as ``uvicorn`` and ``litestar workers run`` do) in fresh
+interpreters under ``python -X importtime``, and reports the median wall time
+and the modules with the largest cumulative and self import time from the
+median run. Exits non-zero when the median exceeds ``--budget-ms``, so cold
+start for autoscaled containers can be held to a budget in CI.
+
+    uv run python -m benchmarks.startup --runs 5 --budget-ms 2500
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+
+@dataclass(frozen=True, slots=True)
+class ImportTime:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def _parse_importtime(stderr: str) -> list[ImportTime]:
+    """Parse ``-X importtime`` lines: ``import time: <self us> | <cumulative us> | <indented module>``."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        entries.append(ImportTime(name.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def _run_once(module: str) -> tuple[float, list[ImportTime]]:
+    # Production images ship compiled bytecode, so let the warm-up run write it.
+    env = {key: value for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+    env["PYTHONPATH"] = str(BACKEND_DIR)
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"importing {module} failed")
+    return elapsed, _parse_importtime(result.stderr)
+
+
+def measure(module: str, runs: int) -> dict[str, Any]:
+    """Import ``module`` in ``runs`` fresh interpreters (after one unmeasured run to warm bytecode and OS caches)."""
+    _run_once(module)
+    samples = sorted((_run_once(module) for _ in range(runs)), key=lambda sample: sample[0])
+    wall, entries = samples[len(samples) // 2]
+    top_level = {entry.module.split(".")[0] for entry in entries}
+    return {
+        "module": module,
+        "runs": runs,
+        "wall_ms": {
+            "median": wall * 1000,
+            "min": samples[0][0] * 1000,
+            "max": samples[-1][0] * 1000,
+            "stdev": statistics.stdev(sample[0] * 1000 for sample in samples) if runs > 1 else 0.0,
+        },
+        "import_ms": sum(entry.self_us for entry in entries) / 1000,
+        "modules_imported": len(entries),
+        "packages_imported": len(top_level),
+        "by_cumulative": [
+            {"module": e.module, "cumulative_ms": e.cumulative_us / 1000, "self_ms": e.self_us / 1000}
+            for e in sorted(entries, key=lambda e: e.cumulative_us, reverse=True)
+        ],
+        "by_self": [
+            {"module": e.module, "self_ms": e.self_us / 1000}
+            for e in sorted(entries, key=lambda e: e.self_us, reverse=True)
+        ],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cold-start import time of the API / worker entry point.")
+    parser.add_argument("--module", default="app.index", help="module whose import is timed")
+    parser.add_argument("--runs", type=int, default=5, help="measured cold imports; the median is reported")
+    parser.add_argument("--top", type=int, default=20, help="modules to list by cumulative and self time")
+    parser.add_argument("--budget-ms", type=float, help="fail when the median wall time exceeds this")
+    parser.add_argument("--output", type=Path, help="write the full report as JSON")
+    args = parser.parse_args()
+
+    report = measure(args.module, args.runs)
+    wall = report["wall_ms"]
+    print(
+        f"import {args.module}: median {wall['median']:.0f} ms (min {wall['min']:.0f}, max {wall['max']:.0f}) "
+        f"over {args.runs} runs; {report['modules_imported']} modules from {report['packages_imported']} packages"
+    )
+    print(f"\n{'cumulative ms':>14} {'self ms':>8}  module")
+    for entry in report["by_cumulative"][: args.top]:
+        print(f"{entry['cumulative_ms']:>14.1f} {entry['self_ms']:>8.1f}  {entry['module']}")
+    print(f"\n{'self ms':>14}  module")
+    for entry in report["by_self"][: args.top]:
+        print(f"{entry['self_ms']:>14.1f}  {entry['module']}")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nWrote {args.output}")
+    if args.budget_ms is not None and wall["median"] > args.budget_ms:
+        print(f"\nMedian startup {wall['median']:.0f} ms exceeds the {args.budget_ms:g} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
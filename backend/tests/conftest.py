@@ -0,0 +1,43 @@
+from collections.abc import AsyncIterator, Awaitable
+from typing import cast
+
+import pytest
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.config import config
+
+
+@pytest.fixture
+async def redis() -> AsyncIterator[Redis]:
+    """The configured Redis (``just db-start``); tests using it are skipped when it is not running."""
+    client = Redis.from_url(config.REDIS_URL)
+    try:
+        await cast(Awaitable[bool], client.ping())
+    except (RedisError, OSError):
+        await client.aclose()
+        pytest.skip(f"Redis not reachable at {config.REDIS_URL}")
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture
+async def db_connection() -> AsyncIterator[AsyncConnection]:
+    """A connection to the configured Postgres inside a transaction that is rolled back afterwards.
+
+    Tests using it are skipped when Postgres is not running (``just db-start``).
+    """
+    engine = create_async_engine(config.DATABASE_URL, poolclass=NullPool)
+    try:
+        connection = await engine.connect()
+    except (SQLAlchemyError, OSError):
+        await engine.dispose()
+        pytest.skip(f"Postgres not reachable at {config.DATABASE_URL}")
+    transaction = await connection.begin()
+    yield connection
+    await transaction.rollback()
+    await connection.close()
+    await engine.dispose()
@@ -0,0 +1,133 @@
+import gzip
+import zlib
+from collections.abc import AsyncIterator
+
+import brotli
+import pytest
+import zstandard
+from litestar import Litestar, Response, get
+from litestar.response import Stream
+from litestar.testing import TestClient
+
+from app.utils.compression import CompressionMiddleware, CompressionSettings, choose_encoding, parse_accept_encoding
+
+BODY = '{"items": [' + ", ".join(f'{{"ticker": "T{i:04d}", "name": "Company {i}"}}' for i in range(200)) + "]}"
+CHUNKS = [f"line {i}: {'x' * 64}\n" for i in range(50)]
+
+DECODERS = {
+    "gzip": gzip.decompress,
+    "br": brotli.decompress,
+    "zstd": lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data),
+}
+
+
+@get("/json")
+async def json_body() -> Response[str]:
+    return Response(BODY, media_type="application/json")
+
+
+@get("/small")
+async def small_body() -> Response[str]:
+    return Response('{"ok": true}', media_type="application/json")
+
+
+@get("/image")
+async def image_body() -> Response[bytes]:
+    return Response(b"\x89PNG" + b"\x00" * 4096, media_type="image/png")
+
+
+@get("/precompressed")
+async def precompressed_body() -> Response[bytes]:
+    return Response(gzip.compress(BODY.encode()), media_type="application/json", headers={"Content-Encoding": "gzip"})
+
+
+@get("/stream")
+async def stream_body() -> Stream:
+    async def lines() -> AsyncIterator[str]:
+        for chunk in CHUNKS:
+            yield chunk
+
+    return Stream(lines(), media_type="text/plain")
+
+
+@pytest.fixture
+def client() -> TestClient[Litestar]:
+    app = Litestar(
+        route_handlers=[json_body, small_body, image_body, precompressed_body, stream_body],
+        middleware=[CompressionMiddleware(CompressionSettings(min_size=256))],
+    )
+    return TestClient(app)
+
+
+def _raw(client: TestClient[Litestar], path: str, accept_encoding: str) -> tuple[dict[str, str], bytes]:
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        assert response.status_code == 200
+        return dict(response.headers), b"".join(response.iter_raw())
+
+
+def test_parse_accept_encoding() -> None:
+    assert parse_accept_encoding("gzip, br;q=0.8, zstd;q=bad, *;q=0") == {"gzip": 1.0, "br": 0.8, "zstd": 0.0, "*": 0.0}
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("gzip, br, zstd", "zstd"),  # ties go to server preference
+        ("gzip;q=1, br;q=0.5", "gzip"),
+        ("br, zstd;q=0", "br"),
+        ("*", "zstd"),
+        ("*, zstd;q=0, br;q=0", "gzip"),
+        ("identity", None),
+        ("gzip;q=0", None),
+    ],
+)
+def test_choose_encoding(header: str, expected: str | None) -> None:
+    assert choose_encoding(header, ("zstd", "br", "gzip")) == expected
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br", "zstd"])
+def test_negotiated_encoding_round_trips(client: TestClient[Litestar], encoding: str) -> None:
+    headers, body = _raw(client, "/json", encoding)
+    assert headers["content-encoding"] == encoding
+    assert "Accept-Encoding" in headers["vary"]
+    assert int(headers["content-length"]) == len(body) < len(BODY)
+    assert DECODERS[encoding](body).decode() == BODY
+
+
+def test_client_preference_wins(client: TestClient[Litestar]) -> None:
+    headers, _ = _raw(client, "/json", "zstd;q=0.1, gzip")
+    assert headers["content-encoding"] == "gzip"
+
+
+@pytest.mark.parametrize(
+    ("path", "accept_encoding"),
+    [("/json", ""), ("/json", "identity"), ("/small", "gzip"), ("/image", "gzip")],
+)
+def test_identity(client: TestClient[Litestar], path: str, accept_encoding: str) -> None:
+    headers, _ = _raw(client, path, accept_encoding)
+    assert "content-encoding" not in headers
+
+
+def test_precompressed_passes_through(client: TestClient[Litestar]) -> None:
+    headers, body = _raw(client, "/precompressed", "br")
+    assert headers["content-encoding"] == "gzip"
+    assert gzip.decompress(body).decode() == BODY
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br", "zstd"])
+def test_streaming_response_is_compressed_per_chunk(client: TestClient[Litestar], encoding: str) -> None:
+    headers, body = _raw(client, "/stream", encoding)
+    assert headers["content-encoding"] == encoding
+    assert "content-length" not in headers
+    assert DECODERS[encoding](body).decode() == "".join(CHUNKS)
+
+
+def test_streamed_chunks_decode_as_they_arrive(client: TestClient[Litestar]) -> None:
+    decoder = zlib.decompressobj(31)
+    decoded = b""
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        for chunk in response.iter_raw():
+            decoded += decoder.decompress(chunk)
+            # Every flushed chunk decodes to whole lines.
+            assert decoded.endswith(b"\n") or not decoded
+    assert decoded.decode() == "".join(CHUNKS)
@@ -0,0 +1,76 @@
+from datetime import datetime
+
+import msgspec
+import pytest
+
+from app.company.models import Company
+from app.company.schemas import CompanyTypeaheadResultSchema
+from app.utils.converters import model_converter, row_converter
+
+
+class Listing(msgspec.Struct, kw_only=True):
+    ticker: str
+    name: str
+    industry: str | None = None
+    created_at: datetime | None = None
+
+
+def _company(id_: int, ticker: str, sector: str | None = "Technology") -> Company:
+    return Company(id=id_, name=f"{ticker} Inc.", ticker=ticker, sector=sector)
+
+
+def test_model_converter_renames_and_converts_fields() -> None:
+    to_result = model_converter(
+        Company, CompanyTypeaheadResultSchema, rename={"industry": "sector"}, convert={"id": str}
+    )
+
+    assert to_result(_company(7, "AAPL")) == CompanyTypeaheadResultSchema(
+        id="7", name="AAPL Inc.", ticker="AAPL", industry="Technology"
+    )
+
+
+def test_model_converter_many_matches_one() -> None:
+    to_result = model_converter(
+        Company, CompanyTypeaheadResultSchema, rename={"industry": "sector"}, convert={"id": str}
+    )
+    companies = [_company(1, "AAPL"), _company(2, "MSFT", sector=None), _company(3, "NVDA")]
+
+    assert to_result.many(companies) == [to_result.one(company) for company in companies]
+    assert to_result.many([]) == []
+
+
+def test_fields_without_a_source_keep_their_default() -> None:
+    # No rename, so `industry` has no model attribute of that name.
+    listing = model_converter(Company, Listing)(_company(1, "AAPL"))
+
+    assert listing == Listing(ticker="AAPL", name="AAPL Inc.", industry=None, created_at=None)
+
+
+def test_converters_are_built_once_per_argument_set() -> None:
+    rename = {"industry": "sector"}
+    assert model_converter(Company, Listing, rename=rename) is model_converter(Company, Listing, rename=dict(rename))
+    assert model_converter(Company, Listing, rename=rename) is not model_converter(Company, Listing)
+    assert row_converter(["ticker", "name"], Listing) is row_converter(("ticker", "name"), Listing)
+
+
+def test_row_converter_reads_by_position() -> None:
+    to_listing = row_converter(["name", "sector", "ticker", "id"], Listing, rename={"industry": "sector"})
+    rows = [("Apple Inc.", "Technology", "AAPL", 1), ("Exxon Mobil", "Energy", "XOM", 2)]
+
+    assert to_listing.many(rows) == [
+        Listing(ticker="AAPL", name="Apple Inc.", industry="Technology"),
+        Listing(ticker="XOM", name="Exxon Mobil", industry="Energy"),
+    ]
+
+
+def test_row_converter_uses_the_first_of_repeated_keys() -> None:
+    to_listing = row_converter(["ticker", "name", "ticker"], Listing)
+
+    assert to_listing(("AAPL", "Apple Inc.", "IGNORED")).ticker == "AAPL"
+
+
+def test_missing_required_field_fails_when_the_converter_is_built() -> None:
+    with pytest.raises(ValueError, match="No Row source for required Listing fields: name, ticker"):
+        row_converter(["industry"], Listing)
+    with pytest.raises(ValueError, match="No Company source for required CompanyTypeaheadResultSchema fields: id"):
+        model_converter(Company, CompanyTypeaheadResultSchema, rename={"id": "cik_id"})
@@ -0,0 +1,57 @@
+from datetime import UTC, datetime
+from typing import cast
+
+from sqlalchemy import Table, event, insert, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.base.mixins import TimestampMixin
+from app.base.models import BaseDBModel
+from app.base.schemas import BaseSchema
+from app.utils.db import bulk_update_models
+
+STALE = datetime(2000, 1, 1, tzinfo=UTC)
+
+
+class Widget(TimestampMixin, BaseDBModel):
+    __tablename__ = "test_bulk_update_widgets"
+
+    name: Mapped[str]
+    size: Mapped[int | None] = mapped_column(nullable=True)
+
+
+class WidgetUpdate(BaseSchema, kw_only=True):
+    name: str
+    size: int | None = None
+    # Not a Widget column, so it is left out of the UPDATE.
+    note: str = ""
+
+
+async def test_bulk_update_models_is_one_executemany_and_bumps_updated_at(db_connection: AsyncConnection) -> None:
+    # DDL is transactional in Postgres, so the table goes away with the fixture's rollback.
+    await db_connection.run_sync(lambda conn: cast(Table, Widget.__table__).create(conn))
+    await db_connection.execute(
+        insert(Widget), [{"id": i, "name": f"w{i}", "size": i, "updated_at": STALE} for i in (1, 2, 3)]
+    )
+
+    executions: list[bool] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany: bool) -> None:
+        executions.append(executemany)
+
+    event.listen(db_connection.sync_engine, "before_cursor_execute", record)
+    try:
+        session = AsyncSession(bind=db_connection)
+        await bulk_update_models(
+            session, Widget, [(1, WidgetUpdate(name="a", size=10)), (2, WidgetUpdate(name="b", note="x"))]
+        )
+    finally:
+        event.remove(db_connection.sync_engine, "before_cursor_execute", record)
+
+    assert executions == [True]
+    rows = (await db_connection.execute(select(Widget.id, Widget.name, Widget.size, Widget.updated_at))).all()
+    by_id = {row.id: row for row in rows}
+    assert [(row.name, row.size) for _, row in sorted(by_id.items())] == [("a", 10), ("b", None), ("w3", 3)]
+    assert by_id[1].updated_at > STALE
+    assert by_id[2].updated_at > STALE
+    assert by_id[3].updated_at == STALE
@@ -0,0 +1,95 @@
+import zipfile
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from app.company.edgar import COVER_SHARES, Concept, iter_companyfacts_sources, load_company_filings, read_companyfacts
+
+FIXTURE = Path(__file__).parent / "fixtures" / "CIK0000320193.json"
+CIK = 320193
+
+
+def _day(value: str) -> datetime:
+    return datetime.fromisoformat(value).replace(tzinfo=UTC)
+
+
+def _url(accn: str) -> str:
+    return f"https://www.sec.gov/Archives/edgar/data/{CIK}/{accn.replace('-', '')}/{accn}-index.htm"
+
+
+EXPECTED = [
+    {
+        "cik": "0000320193",
+        "type": "10-K",
+        "period_end": _day("2023-12-31"),
+        "filing_date": _day("2024-02-01"),
+        "revenue": 400.0,  # the prior-year comparative (300) is not this filing's period
+        "net_income": 80.0,
+        "ebitda": 130.0,  # operating income + D&A
+        "shares_outstanding": 1000.0,  # cover page
+        "cash": 60.0,
+        "debt": 200.0,
+        "document_url": _url("0000320193-24-000010"),
+        "source": "EDGAR",
+    },
+    {
+        "cik": "0000320193",
+        "type": "10-Q",
+        "period_end": _day("2024-03-31"),
+        "filing_date": _day("2024-05-01"),
+        "revenue": 110.0,  # Revenues is preferred over SalesRevenueNet
+        "net_income": 20.0,
+        "ebitda": None,
+        "shares_outstanding": 990.0,
+        "cash": 65.0,
+        "debt": None,
+        "document_url": _url("0000320193-24-000020"),
+        "source": "EDGAR",
+    },
+    {
+        "cik": "0000320193",
+        "type": "10-Q",
+        "period_end": _day("2024-06-30"),
+        "filing_date": _day("2024-08-01"),  # the amendment keeps the original's date and URL
+        "revenue": 120.0,  # the six-month YTD figure is skipped, as is the 8-K
+        "net_income": 24.0,  # corrected by the 10-Q/A
+        "ebitda": None,
+        "shares_outstanding": None,
+        "cash": None,
+        "debt": None,
+        "document_url": _url("0000320193-24-000030"),
+        "source": "EDGAR",
+    },
+]
+
+
+def test_read_companyfacts_keeps_only_mapped_concepts_and_forms() -> None:
+    with FIXTURE.open("rb") as fp:
+        facts = read_companyfacts(fp)
+
+    assert Concept("us-gaap", "AccountsPayableCurrent") not in facts
+    assert {fact["form"] for facts_of in facts.values() for fact in facts_of} == {"10-K", "10-Q", "10-Q/A"}
+    assert [fact["val"] for fact in facts[Concept("us-gaap", "Revenues")]] == [300, 400, 110, 120, 230]
+    assert [fact["val"] for fact in facts[COVER_SHARES]] == [1000, 990]
+
+
+def test_load_company_filings_from_json() -> None:
+    [(cik, opener)] = list(iter_companyfacts_sources(FIXTURE))
+    assert cik == CIK
+    assert sorted(load_company_filings(cik, opener), key=lambda row: row["period_end"]) == EXPECTED
+
+
+@pytest.mark.parametrize(("ciks", "expected"), [(None, [CIK]), ({CIK}, [CIK]), ({1}, [])])
+def test_iter_companyfacts_sources_from_zip(tmp_path: Path, ciks: set[int] | None, expected: list[int]) -> None:
+    archive = tmp_path / "companyfacts.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.write(FIXTURE, FIXTURE.name)
+        zf.writestr("README.txt", "not a companyfacts file")
+
+    # Openers are only valid while the archive iterator is open.
+    seen = []
+    for cik, opener in iter_companyfacts_sources(tmp_path, ciks):
+        seen.append(cik)
+        assert sorted(load_company_filings(cik, opener), key=lambda row: row["period_end"]) == EXPECTED
+    assert seen == expected
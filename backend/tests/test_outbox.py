@@ -0,0 +1,42 @@
+import uuid
+from typing import cast
+
+from redis.asyncio import Redis
+from sqlalchemy import Table, insert, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.config import config
+from app.queue.enums import TaskName
+from app.queue.models import TaskOutbox
+from app.queue.outbox import OutboxRelay
+from app.queue.throttle import dedupe_key
+
+
+async def test_identical_dispatches_in_one_coalesce_window_enqueue_once(
+    db_connection: AsyncConnection, redis: Redis
+) -> None:
+    await db_connection.run_sync(lambda conn: cast(Table, TaskOutbox.__table__).create(conn, checkfirst=True))
+    # A queue of its own keeps the test's job away from real workers.
+    queue_name = f"test-{uuid.uuid4().hex}"
+    kwargs = {"company_ids": [uuid.uuid4().int % 2**31]}
+    row = {"task_name": str(TaskName.REFRESH_COMPANY_METRICS), "queue": queue_name, "kwargs": kwargs}
+    result = await db_connection.execute(insert(TaskOutbox).returning(TaskOutbox.id), [row, row])
+    ids = list(result.scalars())
+
+    relay = OutboxRelay(redis_url=config.REDIS_URL)
+    try:
+        await relay.relay_batch(AsyncSession(bind=db_connection))
+        assert await relay._queue(queue_name).count("queued") == 1
+    finally:
+        await relay.stop()
+        keys = [key async for key in redis.scan_iter(match=f"*{queue_name}*")]
+        await redis.delete(f"throttle:coalesce:{dedupe_key(str(TaskName.REFRESH_COMPANY_METRICS), kwargs)}", *keys)
+
+    # The coalesced row is settled rather than deferred, so it never runs later.
+    rows = (
+        await db_connection.execute(
+            select(TaskOutbox.sent_at, TaskOutbox.next_attempt_at).where(TaskOutbox.id.in_(ids))
+        )
+    ).all()
+    assert len(rows) == 2
+    assert all(row.sent_at is not None and row.next_attempt_at is None for row in rows)
@@ -0,0 +1,118 @@
+import gzip
+from pathlib import Path
+
+import brotli
+import pytest
+from litestar import Litestar, Request, Response, get
+from litestar.testing import TestClient
+
+from app.utils.static import (
+    IMMUTABLE,
+    StaticFile,
+    load_static_dir,
+    load_static_file,
+    static_response,
+    write_precompressed,
+)
+
+SCRIPT = "".join(f"export const value{i} = {i} * 2;\n" for i in range(200)).encode()
+
+
+@pytest.fixture
+def assets(tmp_path: Path) -> Path:
+    (tmp_path / "app.js").write_bytes(SCRIPT)
+    (tmp_path / "tiny.css").write_bytes(b"body{margin:0}")
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG" + b"\x00" * 4096)
+    return tmp_path
+
+
+def _client(file: StaticFile) -> TestClient:
+    @get("/app.js")
+    async def asset(request: Request) -> Response[bytes]:
+        return static_response(request, file, cache_control=IMMUTABLE)
+
+    return TestClient(Litestar([asset]))
+
+
+def test_write_precompressed_writes_siblings_for_compressible_files_only(assets: Path) -> None:
+    assert write_precompressed(assets) == 2
+    assert sorted(path.name for path in assets.iterdir()) == [
+        "app.js",
+        "app.js.br",
+        "app.js.gz",
+        "logo.png",
+        "tiny.css",
+    ]
+    assert brotli.decompress((assets / "app.js.br").read_bytes()) == SCRIPT
+    assert gzip.decompress((assets / "app.js.gz").read_bytes()) == SCRIPT
+
+
+def test_load_static_dir_folds_siblings_into_variants(assets: Path) -> None:
+    write_precompressed(assets)
+    # A distinct sibling shows the file on disk is used rather than recompressed.
+    sibling = gzip.compress(SCRIPT, compresslevel=1, mtime=0)
+    (assets / "app.js.gz").write_bytes(sibling)
+
+    files = load_static_dir(assets)
+
+    assert sorted(files) == ["app.js", "logo.png", "tiny.css"]
+    assert sorted(files["app.js"].variants) == ["br", "gzip", "identity"]
+    assert files["app.js"].variants["gzip"][0] == sibling
+    assert files["app.js"].media_type in ("text/javascript", "application/javascript")
+    assert list(files["logo.png"].variants) == ["identity"]
+    assert list(files["tiny.css"].variants) == ["identity"]
+
+
+def test_files_without_siblings_are_compressed_at_load(assets: Path) -> None:
+    file = load_static_file(assets / "app.js")
+
+    assert brotli.decompress(file.variants["br"][0]) == SCRIPT
+    assert gzip.decompress(file.variants["gzip"][0]) == SCRIPT
+    etags = {etag for _, etag in file.variants.values()}
+    assert len(etags) == 3
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("gzip, deflate, br", "br"),
+        ("gzip", "gzip"),
+        ("br;q=0.5, gzip", "gzip"),
+        # zstd is only applied to dynamic responses; static files fall back to identity.
+        ("zstd", None),
+        ("", None),
+    ],
+)
+def test_static_response_negotiates_encoding(assets: Path, accept_encoding: str, expected: str | None) -> None:
+    file = load_static_file(assets / "app.js")
+    with _client(file) as client:
+        response = client.get("/app.js", headers={"Accept-Encoding": accept_encoding})
+
+    assert response.status_code == 200
+    assert response.headers.get("content-encoding") == expected
+    assert response.headers["etag"] == file.variants[expected or "identity"][1]
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["cache-control"] == IMMUTABLE
+    # The client decodes the body, which must round-trip to the original bytes.
+    assert response.content == SCRIPT
+
+
+@pytest.mark.parametrize("encoding", ["identity", "gzip", "br"])
+def test_if_none_match_on_any_variant_is_not_modified(assets: Path, encoding: str) -> None:
+    file = load_static_file(assets / "app.js")
+    etag = file.variants[encoding][1]
+    with _client(file) as client:
+        response = client.get("/app.js", headers={"Accept-Encoding": "br", "If-None-Match": f"W/{etag}"})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == file.variants["br"][1]
+
+
+def test_stale_if_none_match_gets_the_full_body(assets: Path) -> None:
+    file = load_static_file(assets / "app.js")
+    with _client(file) as client:
+        response = client.get("/app.js", headers={"Accept-Encoding": "gzip", "If-None-Match": '"outdated"'})
+
+    assert response.status_code == 200
+    assert response.content == SCRIPT
@@ -0,0 +1,115 @@
+import math
+from datetime import date
+
+import numpy as np
+
+from app.company.stats import FilingArrays, compute_ltm, compute_valuation, to_float_array, to_rows
+
+
+def _filings(*rows: tuple[int, str, str, float | None]) -> FilingArrays:
+    """``(company_id, type, period_end, revenue)`` rows; the other figures follow revenue at fixed ratios."""
+    return FilingArrays.from_columns(
+        {
+            "company_id": [row[0] for row in rows],
+            "type": [row[1] for row in rows],
+            "period_end": [date.fromisoformat(row[2]) for row in rows],
+            "revenue": [row[3] for row in rows],
+            "net_income": [None if row[3] is None else row[3] / 10 for row in rows],
+            "ebitda": [None if row[3] is None else row[3] / 5 for row in rows],
+            "shares_outstanding": [100.0 for _ in rows],
+            "cash": [None for _ in rows],
+            "debt": [float(i) for i, _ in enumerate(rows)],
+        }
+    )
+
+
+def test_ltm_from_quarters_and_implied_fourth_quarter() -> None:
+    filings = _filings(
+        # FY2023: Q1-Q3 of 5 + 5 + 10, 10-K of 30 → implied Q4 of 10
+        (1, "10-Q", "2023-03-31", 5.0),
+        (1, "10-Q", "2023-06-30", 5.0),
+        (1, "10-Q", "2023-09-30", 10.0),
+        (1, "10-K", "2023-12-31", 30.0),
+        # FY2024: Q1-Q3 of 10 + 15 + 15, 10-K of 60 → implied Q4 of 20
+        (1, "10-Q", "2024-03-31", 10.0),
+        (1, "10-Q", "2024-06-30", 15.0),
+        (1, "10-Q", "2024-09-30", 15.0),
+        (1, "10-K", "2024-12-31", 60.0),
+    )
+    stats = compute_ltm(filings)
+
+    assert stats.company_id.tolist() == [1]
+    assert stats.ltm_revenue.tolist() == [60.0]
+    assert stats.ltm_revenue_growth.tolist() == [100.0]
+    assert stats.ltm_net_income.tolist() == [6.0]
+    assert stats.ltm_ebitda.tolist() == [12.0]
+    # Point-in-time figures come from the latest filing that reports them.
+    assert stats.debt.tolist() == [7.0]
+    assert math.isnan(stats.cash[0])
+
+
+def test_ltm_falls_back_to_annual_filings() -> None:
+    filings = _filings(
+        (2, "10-K", "2023-12-31", 50.0),
+        (2, "10-K", "2024-12-31", 75.0),
+        # An isolated quarter cannot form a four-quarter window.
+        (3, "10-Q", "2024-03-31", 10.0),
+    )
+    stats = compute_ltm(filings)
+
+    assert stats.company_id.tolist() == [2, 3]
+    assert stats.ltm_revenue[0] == 75.0
+    assert stats.ltm_revenue_growth[0] == 50.0
+    assert math.isnan(stats.ltm_revenue[1])
+    assert math.isnan(stats.ltm_revenue_growth[1])
+
+
+def test_ltm_missing_quarter_figure_is_not_summed() -> None:
+    filings = _filings(
+        (1, "10-Q", "2024-03-31", 10.0),
+        (1, "10-Q", "2024-06-30", None),
+        (1, "10-Q", "2024-09-30", 15.0),
+        (1, "10-K", "2024-12-31", 60.0),
+    )
+    # No implied Q4 without all three quarters, so LTM falls back to the 10-K.
+    assert compute_ltm(filings).ltm_revenue.tolist() == [60.0]
+
+
+def test_ltm_of_no_filings() -> None:
+    stats = compute_ltm(_filings())
+
+    assert len(stats.company_id) == 0
+    assert len(stats.ltm_revenue) == 0
+    assert len(stats.ltm_revenue_growth) == 0
+
+
+def test_valuation_and_rows() -> None:
+    valuation = compute_valuation(
+        share_price=to_float_array([10.0, 10.0]),
+        shares_outstanding=to_float_array([100.0, 100.0]),
+        cash=to_float_array([200.0, None]),
+        debt=to_float_array([None, 300.0]),
+        ltm_revenue=to_float_array([400.0, 0.0]),
+        ltm_ebitda=to_float_array([None, 130.0]),
+        ltm_net_income=to_float_array([50.0, -10.0]),
+    )
+    rows = to_rows(np.array([1, 2]), valuation)
+
+    assert rows == [
+        {
+            "company_id": 1,
+            "equity_value": 1000.0,
+            "enterprise_value": 800.0,
+            "multiple_ev_to_revenue": 2.0,
+            "multiple_ev_to_ebitda": None,
+            "price_to_earnings": 20.0,
+        },
+        {
+            "company_id": 2,
+            "equity_value": 1000.0,
+            "enterprise_value": 1300.0,
+            "multiple_ev_to_revenue": None,  # no multiple on a zero base
+            "multiple_ev_to_ebitda": 10.0,
+            "price_to_earnings": None,  # nor on negative earnings
+        },
+    ]
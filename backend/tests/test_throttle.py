@@ -0,0 +1,65 @@
+import uuid
+from collections.abc import AsyncIterator, Awaitable
+from typing import cast
+
+import pytest
+from redis.asyncio import Redis
+
+from app.queue.throttle import RateLimit, ThrottledError, admit, dedupe_key
+
+
+@pytest.fixture
+async def task_name(redis: Redis) -> AsyncIterator[str]:
+    """A task name no other test run shares; its throttle keys are removed afterwards."""
+    name = f"test-{uuid.uuid4().hex}"
+    yield name
+    keys = [key async for key in redis.scan_iter(match=f"throttle:*{name}*")]
+    if keys:
+        await redis.delete(*keys)
+
+
+def test_dedupe_key_ignores_kwarg_order() -> None:
+    assert dedupe_key("task", {"a": 1, "b": [2, 3]}) == dedupe_key("task", {"b": [2, 3], "a": 1})
+    assert dedupe_key("task", {"a": 1}) != dedupe_key("task", {"a": 2})
+
+
+async def test_token_bucket_admits_a_burst_then_limits(redis: Redis, task_name: str) -> None:
+    limit = RateLimit(per_second=0.5, burst=3)
+    for i in range(3):
+        await admit(redis, task_name, f"{task_name}:{i}", coalesce_s=None, rate_limit=limit)
+
+    with pytest.raises(ThrottledError) as raised:
+        await admit(redis, task_name, f"{task_name}:3", coalesce_s=None, rate_limit=limit)
+    assert raised.value.reason == "Rate limited"
+    assert raised.value.retry_after_s == 2.0
+
+
+async def test_token_bucket_refills_over_time(redis: Redis, task_name: str) -> None:
+    limit = RateLimit(per_second=1, burst=1)
+    bucket = f"throttle:bucket:{task_name}"
+    await admit(redis, task_name, task_name, coalesce_s=None, rate_limit=limit)
+    with pytest.raises(ThrottledError):
+        await admit(redis, task_name, task_name, coalesce_s=None, rate_limit=limit)
+
+    # Backdate the last refill by a second instead of sleeping.
+    await cast(Awaitable[float], redis.hincrbyfloat(bucket, "ts", -1.0))
+    await admit(redis, task_name, task_name, coalesce_s=None, rate_limit=limit)
+
+
+async def test_coalescing_refuses_repeats_within_the_window(redis: Redis, task_name: str) -> None:
+    await admit(redis, task_name, task_name, coalesce_s=30, rate_limit=None)
+    with pytest.raises(ThrottledError) as raised:
+        await admit(redis, task_name, task_name, coalesce_s=30, rate_limit=None)
+    assert raised.value.reason == "Coalesced"
+    assert 0 < raised.value.retry_after_s <= 30
+
+    # Other keys of the same task are unaffected.
+    await admit(redis, task_name, f"{task_name}:other", coalesce_s=30, rate_limit=None)
+
+
+async def test_rate_limited_dispatch_does_not_open_a_coalesce_window(redis: Redis, task_name: str) -> None:
+    limit = RateLimit(per_second=0.01, burst=1)
+    await admit(redis, task_name, f"{task_name}:first", coalesce_s=30, rate_limit=limit)
+    with pytest.raises(ThrottledError, match="Rate limited"):
+        await admit(redis, task_name, f"{task_name}:second", coalesce_s=30, rate_limit=limit)
+    assert not await redis.exists(f"throttle:coalesce:{task_name}:second")